@@ -2,6 +2,14 @@
 if "bpy" in locals():
     import importlib
 
+    importlib.reload(camera_search)
+    importlib.reload(camera_registry)
+    importlib.reload(render_cache)
+    importlib.reload(batch_journal)
+    importlib.reload(render_report)
+    importlib.reload(contact_sheet)
+    importlib.reload(render_slots)
+    importlib.reload(view3d_cache)
     importlib.reload(camera_controlls)
     importlib.reload(ui_helpers)
     importlib.reload(dolly_zoom_modal)
@@ -17,6 +25,14 @@ if "bpy" in locals():
 
 
 else:
+    from . import camera_search
+    from . import camera_registry
+    from . import render_cache
+    from . import batch_journal
+    from . import render_report
+    from . import contact_sheet
+    from . import render_slots
+    from . import view3d_cache
     from . import camera_controlls
     from . import ui_helpers
     from . import dolly_zoom_modal
@@ -32,6 +48,9 @@ else:
 
 
 files = [
+    camera_registry,
+    render_slots,
+    view3d_cache,
     camera_controlls,
     ui_helpers,
     dolly_zoom_modal,
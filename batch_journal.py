@@ -0,0 +1,71 @@
+import json
+import os
+import time
+
+JOURNAL_NAME = ".scm_batch_journal.jsonl"
+
+
+class BatchJournal:
+    """Append-only record of a batch render's progress, one JSON object per line.
+
+    A batch starts with a 'batch' line listing its cameras, followed by a
+    'start' and a 'done' line per camera, and ends with an 'end' line once
+    every camera rendered. Every line is flushed to disk before rendering
+    goes on, so after a crash pending() still knows which cameras of the
+    last batch are left. Worker processes of a parallel batch append to the
+    same journal; each line is a single small write, so their lines don't
+    interleave.
+    """
+
+    def __init__(self, directory):
+        self.path = os.path.join(directory, JOURNAL_NAME)
+
+    def _write(self, event, **fields):
+        line = json.dumps({'event': event, 'time': time.time(), **fields}) + "\n"
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'a') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def begin(self, scene_name, camera_names):
+        self._write('batch', scene=scene_name, cameras=list(camera_names))
+
+    def started(self, camera_name):
+        self._write('start', camera=camera_name)
+
+    def finished(self, camera_name, ok):
+        self._write('done', camera=camera_name, ok=ok)
+
+    def end(self):
+        self._write('end')
+
+    def pending(self):
+        """
+        Cameras of the last batch that didn't finish rendering.
+        :return: (scene name, list of camera names), or None if the last batch ended
+            or there is no journal
+        """
+        batch = None
+        done = set()
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A line cut short by the crash.
+                        continue
+                    event = entry.get('event')
+                    if event == 'batch':
+                        batch = entry
+                        done = set()
+                    elif event == 'done' and entry.get('ok'):
+                        done.add(entry.get('camera'))
+                    elif event == 'end':
+                        batch = None
+        except OSError:
+            return None
+        if batch is None:
+            return None
+        return batch.get('scene'), [name for name in batch.get('cameras', []) if name not in done]
@@ -1,123 +1,1941 @@
+import argparse
+import fnmatch
+import functools
+import glob
+import heapq
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
 import bpy
 
-class CAM_MANAGER_BaseOperator:
-    # Class variables to store the state of the operator
-    _cameras = []  # List of cameras to render
-    _original_camera = None  # Original camera to restore after rendering
-    _original_output_path = None  # Original output path to restore after rendering
-    _current_index = 0  # Index of the current camera being rendered
-    _rendering = False  # Flag to indicate if rendering is in progress
-
-    def set_camera_settings(self, context, camera):
-        """Set the active camera to the specified camera."""
-        print(f"Setting camera settings for: {camera.name}")
-        bpy.ops.cam_manager.change_scene_camera(camera_name=camera.name, switch_to_cam=True)
-
-    def cleanup(self, context, aborted=False):
-        """Restore the original camera and output path, and remove handlers."""
-        scene = context.scene
-        print("Cleanup called")
+from bpy.app.handlers import persistent
 
-        # Restore the original camera and output path
-        if self._original_camera:
-            bpy.ops.cam_manager.change_scene_camera(camera_name=self._original_camera.name, switch_to_cam=True)
-        if self._original_output_path:
-            scene.render.filepath = self._original_output_path
+from . import render_report
+from .camera_controlls import switch_camera
+from .camera_gizmos import get_subject_frame_rect
+from .batch_journal import BatchJournal
+from .camera_registry import get_cameras, get_registry
+from .render_slots import assign_distinct_slots, ensure_render_slots, get_render_slots
+from .contact_sheet import CONTACT_SHEET_NAME, build_contact_sheet
+from .render_cache import RenderCache, camera_fingerprint, output_file, output_folder, render_fingerprint
+from .render_report import (FIELDS, REPORT_NAME, RenderHistory, RenderMetrics, cached_history, format_duration,
+                            read_report, save_report, write_report)
 
-        # Remove the render complete handler to avoid memory leaks or crashes
-        if self.render_complete_handler in bpy.app.handlers.render_complete:
-            bpy.app.handlers.render_complete.remove(self.render_complete_handler)
+# How often the queue checks whether Blender's render job has ended after a
+# render finished. The job outlives render_post by the time it takes to
+# write the image and free the render, which is usually a few milliseconds.
+_JOB_POLL_INTERVAL = 0.005
+# How often it checks while a render is still running.
+_WAIT_POLL_INTERVAL = 0.05
 
-        # Report the status of the rendering process
-        if aborted:
-            self.report({'INFO'}, "Rendering aborted")
+# Idle gaps of the last batch, see BatchRenderQueue.
+last_batch_stats = {}
+
+# The running BatchRenderQueue, if any. Render handlers are plain functions
+# that forward to it.
+_queue = None
+
+# WorkerPool of the running parallel batch render, if any.
+_pool = None
+
+# Timer starting the final pass of a two-pass batch after its review time, if any.
+_review_timer = None
+
+
+def batch_running():
+    """True while a batch render, queued or parallel, or any other render runs."""
+    return _queue is not None or _pool is not None or bpy.app.is_job_running('RENDER')
+
+
+def select_cameras(scene, names=None, pattern=None):
+    """
+    Cameras of scene to batch render, in camera list order.
+    :param names: camera object names to render; unknown names are skipped
+    :param pattern: fnmatch-style glob matched against the camera names
+    :return: the named or matching cameras, or the cameras marked for rendering
+        (render_selected) if neither names nor pattern is given
+    """
+    cameras = get_cameras(scene)
+    if names:
+        wanted = set(names)
+        return [obj for obj in cameras if obj.name in wanted]
+    if pattern:
+        return [obj for obj in cameras if fnmatch.fnmatchcase(obj.name, pattern)]
+    return [obj for obj in cameras if getattr(obj.data, "render_selected", False)]
+
+
+def order_cameras(cameras, order='LIST', estimates=None):
+    """
+    Cameras in batch render order.
+    :param order: 'LIST' keeps camera list order, 'SHORTEST' and 'LONGEST' sort by estimated
+        render time, 'SLOT' by render slot
+    :param estimates: camera name -> estimated seconds, see RenderHistory.estimates()
+    :return: new list; cameras that compare equal keep their order
+    """
+    if order == 'SLOT':
+        return sorted(cameras, key=lambda obj: obj.data.slot)
+    if order in {'SHORTEST', 'LONGEST'}:
+        estimates = estimates or {}
+        return sorted(cameras, key=lambda obj: estimates.get(obj.name, 0.0), reverse=order == 'LONGEST')
+    return list(cameras)
+
+
+def estimate_duration(names, estimates, workers=1):
+    """
+    :return: (estimated seconds rendering names one after another, estimated seconds
+        until `workers` parallel workers packed by pack() are done)
+    """
+    total = sum(estimates.get(name, 0.0) for name in names)
+    if workers <= 1:
+        return total, total
+    loads = [sum(estimates.get(name, 0.0) for name in part) for part in pack(names, estimates, workers)]
+    return total, max(loads, default=0.0)
+
+
+def camera_frame_range(scene, camera):
+    """(first, last) frame of camera's animation batch render: its own range if it has one, the scene's otherwise."""
+    if camera.data.use_frame_range:
+        return camera.data.frame_start, max(camera.data.frame_start, camera.data.frame_end)
+    return scene.frame_start, scene.frame_end
+
+
+def animation_output(scene, camera, output_dir=None):
+    """Output path of camera's animation batch render: <output folder>/<camera name>/<frame>."""
+    return os.path.join(output_folder(scene, output_dir), camera.name, "####")
+
+
+def contact_sheet_entries(scene, cameras, output_dir=None, animation=False):
+    """
+    (camera name, output file) of cameras in camera list display order, with
+    the first frame of each camera's animation if animation is set. The display
+    order is recorded when the list is drawn; headless or before that, cameras
+    keep the order given, which is name order for select_cameras().
+    """
+    entries = []
+    for camera in get_registry(scene).in_display_order(cameras):
+        if animation:
+            render = scene.render
+            original = render.filepath
+            try:
+                render.filepath = animation_output(scene, camera, output_dir)
+                path = render.frame_path(frame=camera_frame_range(scene, camera)[0])
+            finally:
+                render.filepath = original
         else:
-            self.report({'INFO'}, f"Rendering completed. {self._current_index} cameras rendered.")
+            path = output_file(scene, camera, output_dir)
+        entries.append((camera.name, path))
+    return entries
 
-    def initialize(self, context):
-        """Initialize the operator by setting up the cameras and original settings."""
-        scene = context.scene
-        self._original_camera = scene.camera
-        self._original_output_path = scene.render.filepath
-        self._cameras = [obj for obj in bpy.data.objects if
-                         obj.type == 'CAMERA' and getattr(obj.data, "render_selected", False)]
 
-        if not self._cameras:
-            self.report({'ERROR'}, "No cameras selected for rendering")
-            return False
+def write_contact_sheet(scene, cameras, output_dir=None, animation=False):
+    """
+    Tile the batch render outputs of cameras into CONTACT_SHEET_NAME in the output folder.
+    :return: (path of the sheet, number of renders found), path None if it couldn't be written
+    """
+    render = scene.render
+    aspect = (render.resolution_y * render.pixel_aspect_y) / (render.resolution_x * render.pixel_aspect_x)
+    path = os.path.join(output_folder(scene, output_dir), CONTACT_SHEET_NAME)
+    entries = contact_sheet_entries(scene, cameras, output_dir, animation)
+    try:
+        tiled = build_contact_sheet(entries, path, aspect=aspect)
+    except OSError as e:
+        print(f"Could not write contact sheet {path}: {e}")
+        return None, 0
+    print(f"Contact sheet of {tiled} renders: {path}")
+    return path, tiled
+
+
+def draft_folder(scene, output_dir=None):
+    """Folder the draft pass of a two-pass batch render writes into."""
+    return os.path.join(output_folder(scene, output_dir), "draft")
+
+
+def _samples_property(scene):
+    """(owner, property) of the render samples of the scene's render engine, None for other engines."""
+    engine = scene.render.engine
+    if engine == 'CYCLES':
+        return scene.cycles, 'samples'
+    if engine in {'BLENDER_EEVEE', 'BLENDER_EEVEE_NEXT'}:
+        return scene.eevee, 'taa_render_samples'
+    return None
+
+
+def apply_draft_settings(scene, camera):
+    """
+    Lower the scene's resolution percentage and render samples to camera's draft settings.
+    :return: (owner, property, value) list that restores the previous values, see restore_settings()
+    """
+    data = camera.data
+    changes = [(scene.render, 'resolution_percentage', data.draft_resolution_percentage)]
+    samples = _samples_property(scene)
+    if samples is not None:
+        changes.append((*samples, data.draft_samples))
+    previous = [(owner, prop, getattr(owner, prop)) for owner, prop, _value in changes]
+    for owner, prop, value in changes:
+        setattr(owner, prop, value)
+    return previous
+
+
+def apply_subject_border(scene, camera):
+    """
+    Limit the render to the rectangle the objects of camera's subject collection
+    cover in its frame, plus its padding in pixels, if the camera asks for it.
+    Call after switch_camera(), which sets the camera's resolution.
+    :return: (owner, property, value) list that restores the previous values, see restore_settings()
+    """
+    data = camera.data
+    collection = data.subject_collection
+    if not data.use_subject_border or collection is None:
+        return []
+    rect = get_subject_frame_rect(scene, camera, collection.all_objects)
+    if rect is None:
+        print(f"Subject {collection.name} not in frame of {camera.name}, rendering the whole frame")
+        return []
+
+    render = scene.render
+    scale = render.resolution_percentage / 100.0
+    pad_x = data.subject_padding / max(1.0, render.resolution_x * scale)
+    pad_y = data.subject_padding / max(1.0, render.resolution_y * scale)
+    x0, y0, x1, y1 = rect
+    changes = [
+        (render, 'border_min_x', max(0.0, x0 - pad_x)),
+        (render, 'border_min_y', max(0.0, y0 - pad_y)),
+        (render, 'border_max_x', min(1.0, x1 + pad_x)),
+        (render, 'border_max_y', min(1.0, y1 + pad_y)),
+        (render, 'use_border', True),
+    ]
+    previous = [(owner, prop, getattr(owner, prop)) for owner, prop, _value in changes]
+    for owner, prop, value in changes:
+        setattr(owner, prop, value)
+    return previous
+
+
+def restore_settings(previous):
+    for owner, prop, value in previous:
+        setattr(owner, prop, value)
+
+
+def final_pass_cameras(scene, names, fingerprints, mode='ALL'):
+    """
+    Cameras of a two-pass batch render's final pass.
+    :param names: camera names of the draft pass
+    :param fingerprints: camera name -> fingerprint when its draft was queued
+    :param mode: 'ALL', 'APPROVED' for the cameras marked approved, 'APPROVED_OR_UNCHANGED'
+        for those and the cameras that weren't changed since their draft
+    :return: cameras still in the scene, in draft order
+    """
+    registry = get_registry(scene)
+    cameras = [camera for camera in map(registry.get, names) if camera is not None]
+    if mode == 'ALL':
+        return cameras
+    return [camera for camera in cameras
+            if camera.data.draft_approved
+            or (mode == 'APPROVED_OR_UNCHANGED'
+                and fingerprints.get(camera.name) == _draft_fingerprint(scene, camera))]
 
-        print(f"Cameras to render: {[cam.name for cam in self._cameras]}")
-        self.report({'INFO'}, f"Cameras to render: {[cam.name for cam in self._cameras]}")
 
+DRAFT_PASS_NAME = "scm_draft_pass.json"
+
+
+def save_draft_pass(scene, names, fingerprints, duplicates=None, output_dir=None):
+    """
+    Record a finished draft pass in the draft folder, so that its final pass can
+    be rendered once the drafts are reviewed, see load_draft_pass().
+    :param names: camera names of the draft pass
+    :param fingerprints: see final_pass_cameras()
+    :param duplicates: see dedupe_cameras()
+    :return: time the draft pass was saved, which tells it from later ones
+    """
+    path = os.path.join(draft_folder(scene, output_dir), DRAFT_PASS_NAME)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    state = {
+        'scene': scene.name,
+        'cameras': names,
+        'fingerprints': fingerprints,
+        'duplicates': {name: [camera.name for camera in cameras] for name, cameras in (duplicates or {}).items()},
+        'saved': time.time(),
+    }
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=1)
+    os.replace(tmp_path, path)
+    return state['saved']
+
+
+def load_draft_pass(scene, mode='ALL', output_dir=None):
+    """
+    The final pass of the draft pass waiting in the draft folder.
+    :param mode: see final_pass_cameras()
+    :return: (cameras of the final pass, their duplicates as in dedupe_cameras(), time the
+        draft pass was saved), None if no draft pass of scene is waiting
+    """
+    path = os.path.join(draft_folder(scene, output_dir), DRAFT_PASS_NAME)
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if state.get('scene') != scene.name:
+        return None
+    registry = get_registry(scene)
+    cameras = final_pass_cameras(scene, state['cameras'], state['fingerprints'], mode)
+    duplicates = {name: [camera for camera in map(registry.get, names) if camera is not None]
+                  for name, names in state['duplicates'].items()}
+    return cameras, duplicates, state['saved']
+
+
+def clear_draft_pass(scene, output_dir=None):
+    """Forget the waiting draft pass once its final pass starts."""
+    try:
+        os.remove(os.path.join(draft_folder(scene, output_dir), DRAFT_PASS_NAME))
+    except OSError:
+        pass
+
+
+def _is_animated(camera):
+    """True if the camera can change over its frame range: it has constraints, or it, a
+    parent or its camera data has an action or drivers."""
+    if camera.constraints:
         return True
+    ids = [camera.data]
+    obj = camera
+    while obj is not None:
+        ids.append(obj)
+        obj = obj.parent
+    return any(id_data.animation_data is not None
+               and (id_data.animation_data.action is not None or len(id_data.animation_data.drivers))
+               for id_data in ids)
+
+
+def dedupe_cameras(scene, cameras, animation=False, draft=False):
+    """
+    Group cameras that render the same image: same placement, lens, sensor,
+    clipping, resolution, exposure and world (render_fingerprint()), and same
+    frame range or draft settings where those apply. In animation batches,
+    animated cameras are never grouped: their state on the current frame says
+    nothing about the others.
+    :return: (first camera of each group in the order of cameras,
+        name of each group's first camera -> the other cameras of its group)
+    """
+    groups = {}
+    for camera in cameras:
+        if animation and _is_animated(camera):
+            groups[camera.name, 'animated'] = [camera]
+            continue
+        key = render_fingerprint(scene, camera)
+        if animation:
+            key += repr(camera_frame_range(scene, camera))
+        if draft:
+            key += repr((camera.data.draft_resolution_percentage, camera.data.draft_samples))
+        groups.setdefault(key, []).append(camera)
+    unique = [group[0] for group in groups.values()]
+    duplicates = {group[0].name: group[1:] for group in groups.values() if len(group) > 1}
+    return unique, duplicates
+
+
+def _link_or_copy(source, target, hardlink=False):
+    """
+    Copy source to target, replacing it.
+    :param hardlink: hardlink target to source instead where the file system allows it.
+        Blender overwrites images in place, so a later render into either path also
+        changes the other
+    """
+    if os.path.abspath(source) == os.path.abspath(target):
+        return
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if os.path.lexists(target):
+        os.remove(target)
+    if hardlink:
+        try:
+            os.link(source, target)
+            return
+        except OSError:
+            pass
+    shutil.copy2(source, target)
+
+
+def copy_duplicates(scene, duplicates, rendered, output_dir=None, animation=False, hardlink=False):
+    """
+    Give the duplicates of each rendered camera a copy of its output under
+    their own names.
+    :param duplicates: see dedupe_cameras()
+    :param rendered: names of the cameras that rendered
+    :param hardlink: hardlink the outputs instead of copying them, see _link_or_copy()
+    :return: report rows of the duplicates, with 'duplicate_of' naming the camera rendered in their place
+    """
+    rendered = set(rendered)
+    rows = []
+    for name, cameras in duplicates.items():
+        source_camera = get_registry(scene).get(name)
+        for camera in cameras:
+            row = {**_failed_row(camera.name), 'duplicate_of': name}
+            rows.append(row)
+            if name not in rendered or source_camera is None:
+                continue
+            try:
+                if animation:
+                    source = os.path.dirname(animation_output(scene, source_camera, output_dir))
+                    target = os.path.dirname(animation_output(scene, camera, output_dir))
+                    for file_name in os.listdir(source):
+                        _link_or_copy(os.path.join(source, file_name), os.path.join(target, file_name), hardlink)
+                else:
+                    target = output_file(scene, camera, output_dir)
+                    _link_or_copy(output_file(scene, source_camera, output_dir), target, hardlink)
+                    row['file_size'] = os.path.getsize(target)
+            except OSError as e:
+                print(f"Could not copy the render of {name} to {camera.name}: {e}")
+                continue
+            row['rendered'] = True
+            row['wall_time'] = 0.0
+    if rows:
+        print(f"Deduplicated {len(rows)} cameras, {sum(row['rendered'] for row in rows)} renders saved")
+    return rows
+
+
+def _draft_fingerprint(scene, camera):
+    # Camera scope: saving the file while reviewing drafts doesn't count as a change.
+    return camera_fingerprint(scene, camera, output_file(scene, camera), 'CAMERA')
+
+
+def render_camera(context, camera, output_dir=None, animation=False, draft=False):
+    """
+    Switch to camera and render a still with write_still, cropped to its subject
+    if it asks for it, or its frame range with animation, synchronously.
+    :param output_dir: write to <output_dir>/<camera name> instead of the scene's output path
+    :param draft: render at the camera's draft resolution percentage and samples
+    :return: True if the render ran
+    """
+    switch_camera(context, camera, select=False)
+    scene = context.scene
+    previous = apply_draft_settings(scene, camera) if draft else []
+    try:
+        if not animation:
+            previous += apply_subject_border(scene, camera)
+            if output_dir:
+                scene.render.filepath = os.path.join(output_dir, camera.name)
+            return 'FINISHED' in bpy.ops.render.render(write_still=True)
+
+        scene.render.filepath = animation_output(scene, camera, output_dir)
+        previous.append((scene, 'frame_start', scene.frame_start))
+        previous.append((scene, 'frame_end', scene.frame_end))
+        scene.frame_start, scene.frame_end = camera_frame_range(scene, camera)
+        return 'FINISHED' in bpy.ops.render.render(animation=True)
+    finally:
+        restore_settings(reversed(previous))
+
+
+def render_cameras(context, cameras, output_dir=None, journal=None, metrics=None, animation=False, draft=False):
+    """
+    Render cameras one after another in this process, without UI, timers or
+    handlers, and restore the scene camera and output path afterwards.
+    :param journal: BatchJournal to record each camera's start and end in
+    :param metrics: RenderMetrics to record each camera's timing and memory in
+    :param animation: render each camera's frame range instead of a still
+    :param draft: render at each camera's draft resolution percentage and samples
+    :return: list of (camera name, True if rendered)
+    """
+    scene = context.scene
+    original_camera = scene.camera
+    original_output_path = scene.render.filepath
+    results = []
+    if metrics is not None:
+        metrics.listen()
+    try:
+        for camera in cameras:
+            print(f"Rendering camera: {camera.name}")
+            if journal is not None:
+                journal.started(camera.name)
+            if metrics is not None:
+                metrics.start(camera.name)
+            ok = render_camera(context, camera, output_dir, animation, draft)
+            if metrics is not None:
+                metrics.finish(ok, None if animation else output_file(scene, camera, output_dir))
+            if journal is not None:
+                journal.finished(camera.name, ok)
+            results.append((camera.name, ok))
+    finally:
+        if metrics is not None:
+            metrics.stop_listening()
+        if original_camera:
+            switch_camera(context, original_camera, select=False)
+        scene.render.filepath = original_output_path
+    return results
+
+
+def shard(items, count):
+    """Split items round-robin into at most `count` non-empty lists."""
+    return [part for part in (items[i::count] for i in range(count)) if part]
+
+
+def pack(items, estimates, count):
+    """
+    Split items into at most `count` non-empty lists of about equal estimated
+    time: the longest item goes to the least loaded list first. Each list keeps
+    the order of items.
+    :param estimates: item -> estimated seconds, items without one count as 0
+    """
+    order = {item: i for i, item in enumerate(items)}
+    # (estimated load, number of items, list index); ties go to the shorter list.
+    loads = [(0.0, 0, i) for i in range(min(count, len(items)))]
+    parts = [[] for _ in loads]
+    for item in sorted(items, key=lambda item: estimates.get(item, 0.0), reverse=True):
+        load, size, i = heapq.heappop(loads)
+        parts[i].append(item)
+        heapq.heappush(loads, (load + estimates.get(item, 0.0), size + 1, i))
+    return [sorted(part, key=order.__getitem__) for part in parts]
+
+
+def worker_threads(workers, threads=0):
+    """Render threads per worker: `threads`, or the CPU cores split evenly between the workers if 0."""
+    if threads:
+        return threads
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def snapshot_blend(directory):
+    """
+    Save a copy of the open file into directory for worker processes to load,
+    with the scenes' output paths made absolute so that the copy, which lives
+    elsewhere, still writes next to the original.
+    :return: path of the copy
+    """
+    path = os.path.join(directory, "snapshot.blend")
+    output_paths = {scene: scene.render.filepath for scene in bpy.data.scenes}
+    try:
+        for scene in output_paths:
+            scene.render.filepath = bpy.path.abspath(scene.render.filepath)
+        bpy.ops.wm.save_as_mainfile(filepath=path, copy=True)
+    finally:
+        for scene, filepath in output_paths.items():
+            scene.render.filepath = filepath
+    return path
+
+
+def main_command(blend_path, script_args, threads=0):
+    """Command line of a background Blender running main() on blend_path with script_args after '--'."""
+    expr = ("import addon_utils, importlib, sys; "
+            f"addon_utils.enable({__package__!r}, default_set=False); "
+            f"sys.exit(importlib.import_module({__name__!r}).main())")
+    command = [bpy.app.binary_path, '--background', blend_path]
+    if threads:
+        command += ['--threads', str(threads)]
+    return command + ['--python-expr', expr, '--', *script_args]
+
+
+def worker_command(blend_path, cameras, report_path, threads=0, scene_name=None, output_dir=None, animation=False):
+    """Command line of a background Blender rendering cameras of blend_path through main()."""
+    command = main_command(blend_path, ['--scm-worker', '--scm-report', report_path], threads)
+    if scene_name:
+        command += ['--scm-scene', scene_name]
+    if output_dir:
+        command += ['--scm-output', os.path.abspath(output_dir)]
+    if animation:
+        command.append('--scm-animation')
+    return command + ['--scm-cameras', *cameras]
+
+
+def frame_worker_command(blend_path, camera_name, output, frame_start, frame_end, frame_step,
+                         threads=0, scene_name=None):
+    """
+    Command line of a background Blender rendering every frame_step-th frame of
+    camera_name's animation with Blender's own --render-anim. The add-on only
+    switches to the camera (prepare_camera()) before the render.
+    """
+    expr = ("import addon_utils, importlib; "
+            f"addon_utils.enable({__package__!r}, default_set=False); "
+            f"importlib.import_module({__name__!r}).prepare_camera({camera_name!r})")
+    command = [bpy.app.binary_path, '--background', blend_path]
+    if scene_name:
+        command += ['--scene', scene_name]
+    if threads:
+        command += ['--threads', str(threads)]
+    # Don't render through the wrong camera if switching failed.
+    command += ['--python-exit-code', '1', '--python-expr', expr]
+    return command + ['--render-output', output,
+                      '--frame-start', str(frame_start), '--frame-end', str(frame_end),
+                      '--frame-jump', str(frame_step), '--render-anim']
+
+
+def prepare_camera(camera_name):
+    """Switch the scene of a frame worker to camera_name, see frame_worker_command()."""
+    camera = get_registry(bpy.context.scene).get(camera_name)
+    if camera is None:
+        raise ValueError(f"Camera not found: {camera_name}")
+    switch_camera(bpy.context, camera, select=False)
+
+
+class WorkerPool:
+    """Background Blender processes rendering cameras, at most `limit` at a time.
+
+    A camera worker runs main() on a snapshot of the file with its cameras
+    given by name and writes its results to a JSON report; a worker that dies
+    before writing its report counts all of its cameras as failed. A frame
+    worker renders a share of one camera's frames and has no report, the
+    camera rendered if all of its frame workers exited cleanly. Every
+    worker's output goes to a log in `directory`.
+    """
+
+    def __init__(self, directory, limit=0):
+        self.directory = directory
+        self.limit = limit
+        self.workers = []
+        self._stopped = False
+        self._completed = set()
+
+    def add(self, command, cameras, report=None):
+        i = len(self.workers)
+        self.workers.append({
+            'cameras': cameras,
+            'report': report,
+            'log': os.path.join(self.directory, f"worker_{i}.log"),
+            'command': command,
+            'process': None,
+            'started': None,
+            'ended': None,
+        })
+
+    def _launch(self):
+        running = 0
+        for worker in self.workers:
+            process = worker['process']
+            if process is None:
+                if self._stopped or (self.limit and running >= self.limit):
+                    continue
+                with open(worker['log'], 'w') as log:
+                    worker['process'] = subprocess.Popen(worker['command'], stdout=log, stderr=subprocess.STDOUT)
+                worker['started'] = time.perf_counter()
+                running += 1
+            elif process.poll() is None:
+                running += 1
+            elif worker['ended'] is None:
+                worker['ended'] = time.perf_counter()
+
+    def start(self):
+        self._launch()
+
+    def running(self):
+        """Number of workers running or waiting to start. Starts waiting workers as others end."""
+        self._launch()
+        return sum((worker['process'] is None and not self._stopped)
+                   or (worker['process'] is not None and worker['process'].poll() is None)
+                   for worker in self.workers)
+
+    def wait(self):
+        while self.running():
+            for worker in self.workers:
+                if worker['process'] is not None:
+                    worker['process'].wait()
+
+    def terminate(self):
+        """Stop the running workers and don't start the waiting ones."""
+        self._stopped = True
+        for worker in self.workers:
+            if worker['process'] is not None and worker['process'].poll() is None:
+                worker['process'].terminate()
+        for worker in self.workers:
+            if worker['process'] is not None:
+                worker['process'].wait()
+
+    def completed(self):
+        """
+        Cameras split into frame workers whose workers have all exited since the last call.
+        Camera workers journal their own cameras, so they aren't included.
+        :return: list of (camera name, True if rendered)
+        """
+        self._launch()
+        frame_workers = {}
+        for worker in self.workers:
+            if worker['report'] is None and worker['cameras'][0] not in self._completed:
+                frame_workers.setdefault(worker['cameras'][0], []).append(worker)
+        completed = []
+        for name, workers in frame_workers.items():
+            if all(worker['ended'] is not None for worker in workers):
+                self._completed.add(name)
+                completed.append((name, all(worker['process'].returncode == 0 for worker in workers)))
+        return completed
+
+    def exit_codes(self):
+        return [worker['process'].returncode if worker['process'] else None for worker in self.workers]
+
+    def rows(self):
+        """
+        :return: report rows of all cameras, in the order they were added. Cameras missing
+            from their worker's report are not rendered
+        """
+        rows = {}
+        frame_workers = {}
+        for worker in self.workers:
+            if worker['report'] is not None:
+                reported = {row['camera']: row for row in read_report(worker['report'])}
+                for name in worker['cameras']:
+                    rows[name] = reported.get(name) or _failed_row(name)
+            else:
+                name = worker['cameras'][0]
+                rows.setdefault(name, _failed_row(name))
+                frame_workers.setdefault(name, []).append(worker)
+
+        # A camera split into frame workers spans from the first one's start to the last one's end.
+        for name, workers in frame_workers.items():
+            row = rows[name]
+            row['rendered'] = all(worker['process'] is not None and worker['process'].returncode == 0
+                                  for worker in workers)
+            if all(worker['ended'] is not None for worker in workers):
+                row['wall_time'] = (max(worker['ended'] for worker in workers)
+                                    - min(worker['started'] for worker in workers))
+        return list(rows.values())
+
+    def results(self):
+        """
+        :return: list of (camera name, True if rendered) over all workers
+        """
+        return [(row['camera'], bool(row['rendered'])) for row in self.rows()]
+
+
+def _failed_row(name):
+    return {'camera': name, 'rendered': False, 'wall_time': None,
+            'first_stats_time': None, 'peak_memory': None, 'file_size': None}
+
+
+def worker_pool(scene, cameras, directory, blend_path, workers, threads=0, output_dir=None,
+                animation=False, split_frames=False, estimates=None):
+    """
+    Pool of workers for cameras of scene: `workers` workers rendering a shard of
+    the cameras each, or with split_frames, every camera's animation split into
+    up to `workers` interleaved frame ranges, `workers` of them running at a time
+    in the order of cameras.
+    :param estimates: camera name -> estimated seconds, to balance the shards with pack()
+        instead of dealing the cameras round-robin
+    """
+    if animation and split_frames:
+        pool = WorkerPool(directory, limit=workers)
+        threads = worker_threads(workers, threads)
+        for camera in cameras:
+            frame_start, frame_end = camera_frame_range(scene, camera)
+            step = max(1, min(workers, frame_end - frame_start + 1))
+            output = animation_output(scene, camera, output_dir)
+            for offset in range(step):
+                pool.add(frame_worker_command(blend_path, camera.name, output, frame_start + offset, frame_end,
+                                              step, threads, scene.name), [camera.name])
+        return pool
+
+    names = [obj.name for obj in cameras]
+    shards = pack(names, estimates, workers) if estimates else shard(names, workers)
+    pool = WorkerPool(directory)
+    threads = worker_threads(len(shards), threads)
+    for i, names in enumerate(shards):
+        report = os.path.join(directory, f"worker_{i}.json")
+        pool.add(worker_command(blend_path, names, report, threads, scene.name, output_dir, animation), names, report)
+    return pool
+
+
+def render_parallel(scene, cameras, workers, threads=0, output_dir=None, animation=False, split_frames=False,
+                    estimates=None, journal=None):
+    """
+    Render cameras in `workers` background Blender processes and wait for them.
+    Worker logs are kept in a temporary directory if anything failed.
+    :param estimates: camera name -> estimated seconds, see worker_pool()
+    :param journal: BatchJournal to record split cameras in as their frame workers exit
+    :return: report rows of the cameras
+    """
+    directory = tempfile.mkdtemp(prefix="scm_batch_")
+    blend_path = snapshot_blend(directory)
+    pool = worker_pool(scene, cameras, directory, blend_path, workers, threads, output_dir, animation, split_frames,
+                       estimates)
+    pool.start()
+    while pool.running():
+        _journal_completed(pool, journal)
+        time.sleep(_WAIT_POLL_INTERVAL)
+    _journal_completed(pool, journal)
+    _finish_pool(pool, pool.results())
+    return pool.rows()
+
+
+def _journal_completed(pool, journal):
+    """Record the split cameras whose frame workers all exited, which run Blender's own
+    animation render and don't journal."""
+    if journal is None:
+        return
+    for name, ok in pool.completed():
+        journal.finished(name, ok)
+
+
+def _finish_pool(pool, results):
+    """Print the workers' exit codes and remove their directory unless something failed."""
+    codes = pool.exit_codes()
+    print(f"Worker exit codes: {codes}")
+    if all(ok for _name, ok in results) and not any(codes):
+        shutil.rmtree(pool.directory, ignore_errors=True)
+    else:
+        print(f"Worker logs kept in {pool.directory}")
+
+
+def blend_files(patterns):
+    """
+    .blend files of a multi-file batch.
+    :param patterns: files, directories, whose .blend files are taken, and glob patterns,
+        which may use ** for subdirectories. Existing files and directories are taken as they
+        are, even if their names contain glob characters such as [ ]
+    :return: absolute paths, sorted, each once
+    """
+    paths = set()
+    for pattern in patterns:
+        if os.path.isfile(pattern):
+            if pattern.endswith(".blend"):
+                paths.add(pattern)
+            continue
+        if os.path.isdir(pattern):
+            pattern = os.path.join(glob.escape(pattern), "*.blend")
+        paths.update(path for path in glob.glob(pattern, recursive=True)
+                     if path.endswith(".blend") and os.path.isfile(path))
+    return sorted(os.path.abspath(path) for path in paths)
+
+
+def _file_script_args(args, report_path, output_dir):
+    """Options of a multi-file batch passed on to the main() of each file's worker."""
+    script_args = ['--scm-report', report_path]
+    if args.scm_scene:
+        script_args += ['--scm-scene', args.scm_scene]
+    if args.scm_cameras:
+        script_args += ['--scm-cameras', *args.scm_cameras]
+    elif args.scm_glob:
+        script_args += ['--scm-glob', args.scm_glob]
+    elif args.scm_resume:
+        script_args.append('--scm-resume')
+    elif args.scm_after_review:
+        script_args += ['--scm-after-review', '--scm-final-pass', args.scm_final_pass]
+    if output_dir:
+        script_args += ['--scm-output', output_dir]
+    script_args += ['--scm-order', args.scm_order]
+    if args.scm_animation:
+        script_args.append('--scm-animation')
+    if args.scm_draft_first:
+        script_args += ['--scm-draft-first', '--scm-final-pass', args.scm_final_pass]
+    if args.scm_skip_unchanged:
+        script_args += ['--scm-skip-unchanged', '--scm-cache-scope', args.scm_cache_scope]
+    if args.scm_dedupe:
+        script_args.append('--scm-dedupe')
+    if args.scm_hardlink:
+        script_args.append('--scm-hardlink')
+    if args.scm_contact_sheet:
+        script_args.append('--scm-contact-sheet')
+    return script_args
+
+
+def render_files(paths, args):
+    """
+    Render the cameras of each .blend of paths in a background Blender of its
+    own, which loads the file once and runs main() for all of its cameras,
+    args.scm_workers files at a time.
+    :param args: parsed command line; camera selection and render options apply to every file,
+        --scm-output DIR writes each file's renders into DIR/<file name>
+    :return: report rows of all files' cameras, with the file and a status added to each row:
+        'rendered' or 'failed' for a camera, and a row of its own with no camera for a file
+        with 'no cameras' to render or whose worker 'crashed'
+    """
+    directory = tempfile.mkdtemp(prefix="scm_files_")
+    workers = max(1, args.scm_workers)
+    threads = worker_threads(min(workers, len(paths)), args.scm_threads)
+    pool = WorkerPool(directory, limit=workers)
+    for i, path in enumerate(paths):
+        output_dir = None
+        if args.scm_output:
+            output_dir = os.path.join(os.path.abspath(args.scm_output), os.path.splitext(os.path.basename(path))[0])
+        report = os.path.join(directory, f"worker_{i}.json")
+        pool.add(main_command(path, _file_script_args(args, report, output_dir), threads), [path], report)
+    pool.start()
+    pool.wait()
+
+    rows = []
+    for worker in pool.workers:
+        path = worker['cameras'][0]
+        # main() leaves an empty report when there is nothing to render, a crashed worker none.
+        if not os.path.exists(worker['report']):
+            print(f"Rendering {path} failed, see {worker['log']}")
+            rows.append({'file': path, **_failed_row(None), 'status': 'crashed'})
+            continue
+        reported = read_report(worker['report'])
+        if not reported:
+            print(f"No cameras to render in {path}")
+            rows.append({'file': path, **_failed_row(None), 'status': 'no cameras'})
+        rows.extend({'file': path, **row, 'status': 'rendered' if row['rendered'] else 'failed'}
+                    for row in reported)
+    _finish_pool(pool, [(row['camera'], bool(row['rendered'])) for row in rows if row['status'] != 'no cameras'])
+    return rows
+
+
+def interrupted_batch(scene, output_dir=None):
+    """
+    Journal of the batch render to resume: the output folder's, or if that has
+    no unfinished batch, the draft folder's, where draft passes journal.
+    :return: (BatchJournal, True if it is a draft pass)
+    """
+    journal = BatchJournal(output_folder(scene, output_dir))
+    if journal.pending() is None:
+        drafts = BatchJournal(draft_folder(scene, output_dir))
+        if drafts.pending() is not None:
+            return drafts, True
+    return journal, False
+
+
+def _journal_cameras(scene, journal):
+    """
+    Cameras of the unfinished batch in journal that still exist in scene.
+    :return: (cameras, names of cameras no longer in the scene), None without an unfinished batch
+    """
+    pending = journal.pending()
+    if pending is None:
+        return None
+    registry = get_registry(scene)
+    cameras = []
+    missing = []
+    for name in pending[1]:
+        camera = registry.get(name)
+        if camera is None:
+            missing.append(name)
+        else:
+            cameras.append(camera)
+    return cameras, missing
+
+
+def _view_target(context):
+    return context.preferences.addons[__package__].preferences.view_target
+
+
+class BatchRenderQueue:
+    """Render cameras one after another with no wall-clock padding.
+
+    Render handlers run on the render job's thread, so they only set flags;
+    everything else happens in poll_job(), a main thread timer that runs for
+    the whole batch. It polls bpy.app.is_job_running('RENDER') and starts the
+    next camera as soon as the job of the current one has written its image
+    and ended, polling faster once render_post said the render is done. An
+    animation job calls render_post for every frame, the camera is done once
+    the job ends after the last one. render_cancel stops the batch.
+
+    The time from the last render_post of one camera to the first render_pre
+    of the next is the queue's idle gap; the gaps are kept in `stats` and
+    copied to last_batch_stats when the batch ends.
+    """
+
+    def __init__(self, context, cameras, cache=None, animation=False, draft=False, output_dir=None, then=None,
+                 contact_sheet=None, duplicates=None, to_slots=False):
+        """
+        :param to_slots: render stills into each camera's Render Result slot only, without writing
+            images, journal or report files
+        :param draft: render at each camera's draft resolution percentage and samples
+        :param duplicates: cameras that get a copy of a rendered camera's output, see dedupe_cameras()
+        :param output_dir: write into output_dir instead of the scene's output folder
+        :param then: called without arguments after the batch completed, not after an abort
+        :param contact_sheet: cameras to tile into a contact sheet after the batch completed
+        """
+        self.contact_sheet = contact_sheet
+        self.duplicates = duplicates or {}
+        self.cameras = cameras
+        self.cache = cache
+        self.animation = animation
+        self.draft = draft
+        self.output_dir = output_dir
+        self.then = then
+        self._previous_settings = []
+        self.to_slots = to_slots
+        self.journal = None if to_slots else BatchJournal(output_folder(context.scene, output_dir))
+        self.metrics = RenderMetrics()
+        self.rendered = []
+        self.index = 0
+        self.scene = context.scene
+        self.view_target = _view_target(context)
+        self.original_camera = self.scene.camera
+        self.original_output_path = self.scene.render.filepath
+        self.original_frame_range = self.scene.frame_start, self.scene.frame_end
+        self._render_again = False
+        # Set by the render handlers, see _on_render_pre() and friends.
+        self._finished_at = None
+        self._post_seen = False
+        self._cancelled = False
+        # Set by the main thread.
+        self._gap_from = None
+        self._job_seen = False
+        self.stats = {'cameras': len(cameras), 'rendered': 0, 'gaps': [], 'aborted': False}
+
+    def start(self):
+        global _queue
+        _queue = self
+        for handlers, func in _render_handlers:
+            if func not in handlers:
+                handlers.append(func)
+        if self.journal is not None:
+            self.journal.begin(self.scene.name, [camera.name for camera in self.cameras])
+        self.metrics.listen()
+        bpy.app.timers.register(self.poll_job, first_interval=_JOB_POLL_INTERVAL)
+        self._start_next()
+
+    def _start_next(self):
+        if self.index >= len(self.cameras):
+            self.finish()
+            return
+        camera = self.cameras[self.index]
+        print(f"Setting camera: {camera.name}")
+        if self.journal is not None:
+            self.journal.started(camera.name)
+        self.metrics.start(camera.name)
+        # Only the first frame after a camera change ends an idle gap.
+        self._gap_from = self._finished_at
+        self._post_seen = False
+        self._job_seen = False
+        switch_camera(bpy.context, camera, switch_to_cam=True, select=False, view_target=self.view_target)
+        scene = self.scene
+        if self.draft:
+            self._previous_settings = apply_draft_settings(scene, camera)
+        if self.animation:
+            scene.render.filepath = animation_output(scene, camera, self.output_dir)
+            scene.frame_start, scene.frame_end = camera_frame_range(scene, camera)
+            result = bpy.ops.render.render('INVOKE_DEFAULT', animation=True, use_viewport=False)
+        else:
+            self._previous_settings += apply_subject_border(scene, camera)
+            if self.output_dir:
+                scene.render.filepath = os.path.join(self.output_dir, camera.name)
+            if self.to_slots:
+                self._activate_slot(camera)
+            result = bpy.ops.render.render('INVOKE_DEFAULT', write_still=not self.to_slots, use_viewport=False)
+        if 'CANCELLED' in result:
+            print(f"Could not start render for camera: {camera.name}")
+            self.finish(aborted=True)
+
+    def _activate_slot(self, camera):
+        """Make camera's slot the one Render Result renders into. Render Result
+        only exists after the first render of the session; a first camera
+        meant for another slot than the first is rendered again once it does."""
+        slots = get_render_slots()
+        if slots is None:
+            self._render_again = camera.data.slot > 1
+            return
+        ensure_render_slots(camera.data.slot)
+        slots.active_index = camera.data.slot - 1
+
+    def poll_job(self):
+        """Main thread timer: act on what the render handlers flagged, and
+        finish the current camera once its render job ended."""
+        if _queue is not self:
+            return None
+        if self._cancelled:
+            self.finish(aborted=True)
+            return None
+        if bpy.app.is_job_running('RENDER'):
+            self._job_seen = True
+            return _JOB_POLL_INTERVAL if self._post_seen else _WAIT_POLL_INTERVAL
+        if not (self._job_seen or self._post_seen):
+            # The job of the current camera hasn't started yet.
+            return _JOB_POLL_INTERVAL
+        # The job has written the image, only now is the camera done.
+        self._camera_done(ok=self._post_seen)
+        return _JOB_POLL_INTERVAL if _queue is self else None
+
+    def _camera_done(self, ok):
+        camera = self.cameras[self.index]
+        restore_settings(self._previous_settings)
+        self._previous_settings = []
+        if ok and self._render_again:
+            self._render_again = False
+            self._start_next()
+            return
+        if ok:
+            print(f"Render complete for camera: {camera.name}")
+            self.stats['rendered'] += 1
+            self.rendered.append(camera.name)
+        else:
+            print(f"Render job ended without a render for camera: {camera.name}")
+        output = None if self.animation or self.to_slots else output_file(self.scene, camera, self.output_dir)
+        self.metrics.finish(ok, output)
+        if self.journal is not None:
+            self.journal.finished(camera.name, ok)
+        self.index += 1
+        self._start_next()
+
+    def render_started(self):
+        """render_pre, on the render thread."""
+        if self._gap_from is not None:
+            self.stats['gaps'].append(time.perf_counter() - self._gap_from)
+            self._gap_from = None
+
+    def render_finished(self):
+        """render_post, on the render thread."""
+        self._finished_at = time.perf_counter()
+        self._post_seen = True
+
+    def render_cancelled(self):
+        """render_cancel, on the render thread."""
+        self._cancelled = True
+
+    def _detach(self):
+        """Stop receiving render events."""
+        global _queue
+        if _queue is self:
+            _queue = None
+        for handlers, func in _render_handlers:
+            if func in handlers:
+                handlers.remove(func)
+        self.metrics.stop_listening()
+
+    def abandon(self):
+        """Drop the batch without touching the scene, for when the file it renders is
+        being unloaded. Its journal is left unfinished, so the batch can be resumed."""
+        self._detach()
+        print(f"Batch render abandoned. {self.stats['rendered']} cameras rendered.")
+
+    def finish(self, aborted=False):
+        """Remove the handlers and restore the original camera and output path."""
+        global last_batch_stats
+        self._detach()
+
+        scene = self.scene
+        restore_settings(self._previous_settings)
+        self._previous_settings = []
+        if self.original_camera:
+            switch_camera(bpy.context, self.original_camera, switch_to_cam=True, view_target=self.view_target)
+        if self.original_output_path:
+            scene.render.filepath = self.original_output_path
+        scene.frame_start, scene.frame_end = self.original_frame_range
+        duplicate_rows = copy_duplicates(scene, self.duplicates, self.rendered, self.output_dir, self.animation,
+                                         scene.cam_manager_batch.hardlink_duplicates)
+        if self.cache is not None:
+            self.cache.record([(name, True) for name in self.rendered]
+                              + [(row['camera'], row['rendered']) for row in duplicate_rows])
+        # A batch with failed cameras stays open in the journal, for Resume to retry them.
+        if not aborted and self.journal is not None and len(self.rendered) == len(self.cameras):
+            self.journal.end()
+        if self.to_slots:
+            render_report.last_report = self.metrics.rows()
+        else:
+            save_report(output_folder(scene, self.output_dir), self.metrics.rows() + duplicate_rows,
+                        scene.cam_manager_batch.report_format, self.animation)
+        self.stats['renders_saved'] = sum(row['rendered'] for row in duplicate_rows)
+
+        gaps = self.stats['gaps']
+        self.stats['aborted'] = aborted
+        self.stats['idle_total'] = sum(gaps)
+        self.stats['idle_mean'] = sum(gaps) / len(gaps) if gaps else 0.0
+        last_batch_stats = self.stats
+
+        if aborted:
+            print(f"Rendering aborted. {self.stats['rendered']} cameras rendered.")
+        else:
+            print(f"Rendering completed. {self.stats['rendered']} cameras rendered, "
+                  f"{self.stats['idle_total']:.3f} s idle between renders "
+                  f"({self.stats['idle_mean'] * 1000:.1f} ms mean).")
+            if self.contact_sheet:
+                write_contact_sheet(scene, self.contact_sheet, self.output_dir, self.animation)
+            if self.then is not None:
+                self.then()
+
 
-class CAM_MANAGER_OT_multi_camera_rendering_handlers(CAM_MANAGER_BaseOperator, bpy.types.Operator):
+def _on_render_pre(scene, *_args):
+    if _queue is not None:
+        _queue.render_started()
+
+
+def _on_render_post(scene, *_args):
+    if _queue is not None:
+        _queue.render_finished()
+
+
+def _on_render_cancel(scene, *_args):
+    if _queue is not None:
+        _queue.render_cancelled()
+
+
+@persistent
+def _abandon_batch_on_load(*_args):
+    """Loading a file drops the queue's handlers and timer and the parallel
+    batch's modal operator, let go of them so a new batch can start."""
+    global _pool
+    if _queue is not None:
+        _queue.abandon()
+    if _pool is not None:
+        _pool.terminate()
+        print(f"Parallel batch render stopped, worker logs in {_pool.directory}")
+        _pool = None
+
+
+_render_handlers = (
+    (bpy.app.handlers.render_pre, _on_render_pre),
+    (bpy.app.handlers.render_post, _on_render_post),
+    (bpy.app.handlers.render_cancel, _on_render_cancel),
+)
+
+
+class CAM_MANAGER_OT_multi_camera_rendering_handlers(bpy.types.Operator):
     """Render all selected cameras using handlers"""
     bl_idname = "cam_manager.multi_camera_rendering_handlers"
     bl_label = "Render All Selected Cameras (Handlers)"
     bl_options = {'REGISTER', 'UNDO'}
 
-    def render_complete_handler(self, scene, depsgraph):
-        """Handler called when a render is complete."""
-        print(f"Render complete for camera: {self._cameras[self._current_index].name}")
-        self.report({'INFO'}, f"Render complete for camera: {self._cameras[self._current_index].name}")
-        self._rendering = False
-        self._current_index += 1
+    @classmethod
+    def poll(cls, context):
+        return not batch_running()
 
-        if self._current_index < len(self._cameras):
-            # Add a delay before starting the next render to ensure the previous render is fully completed
-            bpy.app.timers.register(self.start_next_render, first_interval=1.0)
+    def execute(self, context):
+        """Start rendering the cameras marked for rendering, one after another."""
+        cameras = select_cameras(context.scene)
+        if not cameras:
+            self.report({'ERROR'}, "No cameras selected for rendering")
+            return {'CANCELLED'}
+        cameras, cache = _skip_unchanged(self, context.scene, cameras)
+        if not cameras:
+            return {'FINISHED'}
+        settings = context.scene.cam_manager_batch
+        duplicates = None
+        if settings.deduplicate:
+            cameras, duplicates = _dedupe(self, context.scene, cameras)
+        cameras = order_cameras(cameras, settings.order, batch_estimates(context.scene, cameras)[0])
+
+        print(f"Cameras to render: {[cam.name for cam in cameras]}")
+        self.report({'INFO'}, f"Cameras to render: {[cam.name for cam in cameras]}")
+
+        contact_sheet = select_cameras(context.scene) if settings.contact_sheet else None
+        if settings.two_pass:
+            queue = _two_pass_queue(context, cameras, settings, duplicates)
         else:
-            # Add a delay before final cleanup to ensure the last render is fully completed
-            bpy.app.timers.register(lambda: self.final_cleanup(bpy.context), first_interval=2.0)
-
-    def start_next_render(self):
-        """Start the next render after a delay."""
-        if self._current_index < len(self._cameras):
-            # Set camera settings for the next render
-            camera = self._cameras[self._current_index]
-            self.set_camera_settings(bpy.context, camera)
-            print(f"Setting camera: {camera.name}")
-            self.report({'INFO'}, f"Setting camera: {camera.name}")
-            # Trigger the next render
-            self._rendering = True
-            bpy.ops.render.render('INVOKE_DEFAULT', write_still=True, use_viewport=False)
-
-    def final_cleanup(self, context):
-        """Perform final cleanup after all renders are complete."""
-        self.cleanup(context)
-        # Ensure the handler is removed after the last render to avoid memory leaks or crashes
-        if self.render_complete_handler in bpy.app.handlers.render_complete:
-            bpy.app.handlers.render_complete.remove(self.render_complete_handler)
+            queue = BatchRenderQueue(context, cameras, cache, settings.animation, contact_sheet=contact_sheet,
+                                     duplicates=duplicates)
+        try:
+            queue.start()
+        except Exception as e:
+            self.report({'ERROR'}, f"Rendering failed: {e}")
+            queue.finish(aborted=True)
+            return {'CANCELLED'}
+
+        return {'FINISHED'}
+
+
+def _two_pass_queue(context, cameras, settings, duplicates=None):
+    """
+    Queue rendering drafts of cameras into the draft folder. The draft pass is
+    saved there for its final pass right away, so that it survives a Resume of
+    the drafts. Once they are done it waits for review: Render Final Pass renders
+    the cameras settings.final_pass selects, or a timer does after
+    settings.review_delay seconds.
+    :param duplicates: see dedupe_cameras(), copied in both passes
+    """
+    scene = context.scene
+    names = [camera.name for camera in cameras]
+    fingerprints = {camera.name: _draft_fingerprint(scene, camera) for camera in cameras}
+    saved = save_draft_pass(scene, names, fingerprints, duplicates)
+
+    def drafts_done():
+        global _review_timer
+        if settings.review_delay:
+            print(f"Draft pass done, rendering the final pass in {settings.review_delay} seconds")
+            _review_timer = functools.partial(_final_pass_after_review, scene.name, saved)
+            bpy.app.timers.register(_review_timer, first_interval=settings.review_delay)
+        else:
+            print("Draft pass done, review the drafts and render the final pass with Render Final Pass")
+
+    return BatchRenderQueue(context, cameras, animation=settings.animation, draft=True,
+                            output_dir=draft_folder(scene), then=drafts_done, duplicates=duplicates)
+
+
+def _final_pass_queue(context, cameras, duplicates):
+    """Queue for the final pass of a reviewed draft pass, with the scene's batch settings."""
+    scene = context.scene
+    settings = scene.cam_manager_batch
+    cache = None
+    if settings.skip_unchanged and not settings.animation:
+        cache = RenderCache(scene, cameras, settings.cache_scope)
+    return BatchRenderQueue(context, cameras, cache, settings.animation, duplicates=duplicates,
+                            contact_sheet=select_cameras(scene) if settings.contact_sheet else None)
+
+
+def _final_pass_after_review(scene_name, saved):
+    """Timer starting the final pass of the draft pass saved at `saved` once the review time is up."""
+    context = bpy.context
+    scene = context.scene
+    if scene.name != scene_name or batch_running():
+        return 5.0
+    found = load_draft_pass(scene, scene.cam_manager_batch.final_pass)
+    if found is None or found[2] != saved:
+        # Rendered with Render Final Pass already, or a later draft pass replaced it.
+        return None
+    cameras, duplicates, _saved = found
+    clear_draft_pass(scene)
+    print(f"Review time is up, rendering {len(cameras)} cameras at full quality")
+    if cameras:
+        queue = _final_pass_queue(context, cameras, duplicates)
+        try:
+            queue.start()
+        except Exception as e:
+            print(f"Rendering failed: {e}")
+            queue.finish(aborted=True)
+    return None
+
+
+def batch_estimates(scene, cameras, output_dir=None, history=None):
+    """
+    Estimated render times of cameras from the render history of the output folder.
+    :param history: RenderHistory to use instead of reading the folder's
+    :return: see RenderHistory.estimates()
+    """
+    if history is None:
+        history = RenderHistory(output_folder(scene, output_dir))
+    return history.estimates([obj.name for obj in cameras], scene.cam_manager_batch.animation)
+
+
+def draw_estimate(layout, scene):
+    """Estimated duration of batch rendering the cameras marked for rendering, from the render history."""
+    settings = scene.cam_manager_batch
+    cameras = select_cameras(scene)
+    history = cached_history(output_folder(scene))
+    estimates, timed = batch_estimates(scene, cameras, history=history)
+    if not timed:
+        layout.label(text="No render times recorded yet", icon='TIME')
+        return
+    names = [obj.name for obj in cameras]
+    total, makespan = estimate_duration(names, estimates, settings.workers)
+    text = f"About {format_duration(total)}"
+    if settings.workers > 1:
+        text += f", {format_duration(makespan)} in parallel"
+    if timed < len(cameras):
+        text += f" ({timed} of {len(cameras)} timed)"
+    layout.label(text=text, icon='TIME')
+
+
+def _dedupe(operator, scene, cameras):
+    """dedupe_cameras() with the scene's batch settings, reporting what it found."""
+    settings = scene.cam_manager_batch
+    unique, duplicates = dedupe_cameras(scene, cameras, settings.animation, settings.two_pass)
+    if duplicates:
+        operator.report({'INFO'}, f"{len(cameras) - len(unique)} cameras are duplicates, rendering {len(unique)}")
+    return unique, duplicates
+
+
+def _skip_unchanged(operator, scene, cameras):
+    """
+    Drop the up-to-date cameras if the scene's batch settings ask for it.
+    :return: (cameras to render, RenderCache to record the renders in or None)
+    """
+    settings = scene.cam_manager_batch
+    # The manifest tracks one image per camera, animations are always rendered.
+    if not settings.skip_unchanged or settings.animation:
+        return cameras, None
+    cache = RenderCache(scene, cameras, settings.cache_scope)
+    if cache.unsaved:
+        operator.report({'WARNING'}, "The file has unsaved changes, rendering every camera. Save it to skip "
+                                     "unchanged cameras")
+    if cache.skipped:
+        operator.report({'INFO'}, f"Skipping {len(cache.skipped)} unchanged cameras")
+    if not cache.pending:
+        operator.report({'INFO'}, f"All {len(cameras)} cameras are up to date")
+    return cache.pending, cache
+
+
+class BatchRenderSettings(bpy.types.PropertyGroup):
+    workers: bpy.props.IntProperty(
+        name="Workers",
+        description="Number of background Blender processes rendering cameras in parallel",
+        default=2, min=1, soft_max=16)
+    threads: bpy.props.IntProperty(
+        name="Threads per Worker",
+        description="Render threads of each worker. 0 splits the CPU cores evenly between the workers",
+        default=0, min=0, soft_max=64)
+    animation: bpy.props.BoolProperty(
+        name="Render Animation",
+        description=("Render each camera's frame range, its own or the scene's, into "
+                     "<output folder>/<camera name>/<frame> instead of a still"),
+        default=False)
+    split_frames: bpy.props.BoolProperty(
+        name="Split Frames Between Workers",
+        description=("In parallel animation renders, split every camera's frames between the workers "
+                     "instead of giving each worker whole cameras"),
+        default=False)
+    two_pass: bpy.props.BoolProperty(
+        name="Draft First",
+        description=("Render every camera at its draft resolution percentage and samples into the draft "
+                     "folder first, and the full quality pass once the drafts are reviewed. Batch Render only"),
+        default=False)
+    final_pass: bpy.props.EnumProperty(
+        name="Final Pass",
+        description="Cameras rendered at full quality after the draft pass",
+        items=(
+            ('ALL', "All", "Every camera of the draft pass"),
+            ('APPROVED', "Approved", "Cameras marked as approved"),
+            ('APPROVED_OR_UNCHANGED', "Approved or Unchanged",
+             "Cameras marked as approved and cameras left unchanged since their draft"),
+        ),
+        default='ALL')
+    review_delay: bpy.props.IntProperty(
+        name="Review Time",
+        description=("Seconds after the draft pass until the final pass starts on its own. "
+                     "0 waits for Render Final Pass"),
+        default=0, min=0, soft_max=3600)
+    skip_unchanged: bpy.props.BoolProperty(
+        name="Skip Unchanged Cameras",
+        description=("Don't render cameras whose settings and output file are unchanged since their last "
+                     "batch render, as recorded in a manifest in the output folder"),
+        default=False)
+    cache_scope: bpy.props.EnumProperty(
+        name="Changes",
+        description="What counts as a change for Skip Unchanged Cameras",
+        items=(
+            ('FILE', "File", "The camera settings and any saved change to the .blend"),
+            ('CAMERA', "Camera Only",
+             "The camera, its render settings, resolution, exposure and world. "
+             "Edits to objects, materials or lights don't re-render the camera"),
+        ),
+        default='FILE')
+    order: bpy.props.EnumProperty(
+        name="Order",
+        description="Order the cameras of a batch render in, by the render times recorded in the output folder",
+        items=(
+            ('LIST', "Camera List", "Camera list order"),
+            ('SHORTEST', "Shortest First", "Cameras with the shortest recorded render time first"),
+            ('LONGEST', "Longest First",
+             "Cameras with the longest recorded render time first, which packs parallel workers best"),
+            ('SLOT', "Render Slot", "By the cameras' render slot"),
+        ),
+        default='LIST')
+    deduplicate: bpy.props.BoolProperty(
+        name="Render Duplicates Once",
+        description=("Render cameras with the same placement, lens, sensor, clipping, resolution, exposure and "
+                     "world only once and copy the image to the others. Animated cameras are always "
+                     "rendered in animation batches"),
+        default=False)
+    hardlink_duplicates: bpy.props.BoolProperty(
+        name="Hardlink Duplicates",
+        description=("Hardlink the images of duplicate cameras instead of copying them. Blender overwrites "
+                     "images in place, so rendering either camera again later also changes the other"),
+        default=False)
+    contact_sheet: bpy.props.BoolProperty(
+        name="Contact Sheet",
+        description=("Tile every marked camera's render, labeled and in the order the camera list last "
+                     f"showed them, into {CONTACT_SHEET_NAME} in the output folder after each batch. "
+                     "Until the list is drawn in this session the tiles are in name order"),
+        default=False)
+    report_format: bpy.props.EnumProperty(
+        name="Report",
+        description="File format of the render report written into the output folder after each batch",
+        items=(
+            ('JSON', "JSON", "scm_render_report.json"),
+            ('CSV', "CSV", "scm_render_report.csv"),
+        ),
+        default='JSON')
+
+
+class CAM_MANAGER_OT_parallel_batch_render(bpy.types.Operator):
+    """Render all selected cameras in several background Blender processes"""
+    bl_idname = "cam_manager.parallel_batch_render"
+    bl_label = "Parallel Batch Render"
+    bl_description = ("Render the cameras selected for rendering in background Blender processes, "
+                      "each rendering a share of the cameras. Press Esc to stop")
+
+    _pool = None
+    _timer = None
+    _cache = None
+    _journal = None
+    _duplicates = None
+
+    @classmethod
+    def poll(cls, context):
+        return not batch_running()
 
     def execute(self, context):
-        """Execute the operator and start the rendering process."""
-        if not self.initialize(context):
+        scene = context.scene
+        settings = scene.cam_manager_batch
+        cameras = select_cameras(scene)
+        if not cameras:
+            self.report({'ERROR'}, "No cameras selected for rendering")
+            return {'CANCELLED'}
+        if settings.two_pass:
+            self.report({'ERROR'}, "Draft First renders one camera at a time, use Batch Render for it")
+            return {'CANCELLED'}
+        if not os.path.isabs(bpy.path.abspath(scene.render.filepath)):
+            self.report({'ERROR'}, "Save the file or use an absolute output path for parallel rendering")
+            return {'CANCELLED'}
+        cameras, self._cache = _skip_unchanged(self, scene, cameras)
+        if not cameras:
+            return {'FINISHED'}
+
+        directory = tempfile.mkdtemp(prefix="scm_batch_")
+        try:
+            blend_path = snapshot_blend(directory)
+        except RuntimeError as e:
+            shutil.rmtree(directory, ignore_errors=True)
+            self.report({'ERROR'}, f"Could not save a copy of the file for the workers: {e}")
             return {'CANCELLED'}
 
-        # Register the render complete handler
-        bpy.app.handlers.render_complete.append(self.render_complete_handler)
+        self._duplicates = {}
+        if settings.deduplicate:
+            cameras, self._duplicates = _dedupe(self, scene, cameras)
+        estimates, timed = batch_estimates(scene, cameras)
+        cameras = order_cameras(cameras, settings.order, estimates)
+        self._pool = worker_pool(scene, cameras, directory, blend_path, settings.workers, settings.threads,
+                                 animation=settings.animation, split_frames=settings.split_frames,
+                                 estimates=estimates if timed else None)
+        self._journal = BatchJournal(output_folder(scene))
+        self._journal.begin(scene.name, [obj.name for obj in cameras])
+        global _pool
+        _pool = self._pool
+        self._pool.start()
+        self.report({'INFO'}, f"Rendering {len(cameras)} cameras in {len(self._pool.workers)} workers")
+
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.5, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if _pool is not self._pool:
+            # Stopped when a file was loaded.
+            context.window_manager.event_timer_remove(self._timer)
+            return {'CANCELLED'}
+        if event.type == 'ESC':
+            self._pool.terminate()
+            self._finish(context, cancelled=True)
+            return {'CANCELLED'}
+        if event.type == 'TIMER':
+            if not self._pool.running():
+                self._finish(context)
+                return {'FINISHED'}
+            _journal_completed(self._pool, self._journal)
+        return {'PASS_THROUGH'}
+
+    def _finish(self, context, cancelled=False):
+        global _pool, last_batch_stats
+        _pool = None
+        context.window_manager.event_timer_remove(self._timer)
+        settings = context.scene.cam_manager_batch
+        rows = self._pool.rows()
+        rendered = [row['camera'] for row in rows if row['rendered']]
+        duplicate_rows = copy_duplicates(context.scene, self._duplicates, rendered, animation=settings.animation,
+                                         hardlink=settings.hardlink_duplicates)
+        rows += duplicate_rows
+        results = [(row['camera'], bool(row['rendered'])) for row in rows]
+        failed = [name for name, ok in results if not ok]
+        last_batch_stats = {
+            'cameras': len(results),
+            'rendered': len(results) - len(failed),
+            'failed': failed,
+            'exit_codes': self._pool.exit_codes(),
+            'aborted': cancelled,
+            'renders_saved': sum(row['rendered'] for row in duplicate_rows),
+        }
+        _finish_pool(self._pool, results)
+        save_report(output_folder(context.scene), rows, settings.report_format, settings.animation)
+        if self._cache is not None:
+            self._cache.record(results)
+        _journal_completed(self._pool, self._journal)
+        if not cancelled and not failed:
+            self._journal.end()
+        if not cancelled and settings.contact_sheet:
+            write_contact_sheet(context.scene, select_cameras(context.scene), animation=settings.animation)
+        if cancelled:
+            self.report({'WARNING'}, f"Parallel rendering stopped. {len(results) - len(failed)} cameras rendered")
+        elif failed:
+            self.report({'WARNING'}, f"{len(failed)} of {len(results)} cameras failed, logs in {self._pool.directory}")
+        else:
+            self.report({'INFO'}, f"Rendering completed. {len(results)} cameras rendered")
+
 
+class CAM_MANAGER_OT_render_final_pass(bpy.types.Operator):
+    """Render the reviewed draft pass at full quality"""
+    bl_idname = "cam_manager.render_final_pass"
+    bl_label = "Render Final Pass"
+    bl_description = ("Render the cameras of the draft pass waiting in the draft folder at full quality, "
+                      "those the Final Pass setting selects")
+
+    @classmethod
+    def poll(cls, context):
+        return not batch_running()
+
+    def execute(self, context):
+        scene = context.scene
+        found = load_draft_pass(scene, scene.cam_manager_batch.final_pass)
+        if found is None:
+            self.report({'INFO'}, "No draft pass waiting for review in the draft folder")
+            return {'CANCELLED'}
+        cameras, duplicates, _saved = found
+        clear_draft_pass(scene)
+        if not cameras:
+            self.report({'INFO'}, "No cameras selected for the final pass")
+            return {'FINISHED'}
+
+        self.report({'INFO'}, f"Rendering {len(cameras)} cameras at full quality")
+        queue = _final_pass_queue(context, cameras, duplicates)
         try:
-            # Set camera settings for the first render
-            if self._cameras:
-                first_camera = self._cameras[0]
-                self.set_camera_settings(context, first_camera)
-
-            # Start the first render
-            print(f"Starting first render for camera: {first_camera.name}")
-            self.report({'INFO'}, f"Starting first render for camera: {first_camera.name}")
-            self._rendering = True
-            bpy.ops.render.render('INVOKE_DEFAULT', write_still=True, use_viewport=False)
+            queue.start()
         except Exception as e:
             self.report({'ERROR'}, f"Rendering failed: {e}")
-            self.cleanup(context, aborted=True)
+            queue.finish(aborted=True)
             return {'CANCELLED'}
+        return {'FINISHED'}
+
+
+class CAM_MANAGER_OT_render_to_slots(bpy.types.Operator):
+    """Render all selected cameras into their Render Result slots without saving them"""
+    bl_idname = "cam_manager.render_to_slots"
+    bl_label = "Render to Slots"
+    bl_description = ("Render a still of every camera selected for rendering into its own Render Result slot "
+                      "for comparing in the Image Editor, without writing any files. Cameras sharing a slot "
+                      "get a free one")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return not batch_running()
+
+    def execute(self, context):
+        scene = context.scene
+        cameras = select_cameras(scene)
+        if not cameras:
+            self.report({'ERROR'}, "No cameras selected for rendering")
+            return {'CANCELLED'}
+        changed = assign_distinct_slots(cameras)
+        if changed:
+            self.report({'INFO'}, f"New render slots for {', '.join(changed)}")
+        cameras = sorted(cameras, key=lambda obj: obj.data.slot)
+
+        queue = BatchRenderQueue(context, cameras, to_slots=True)
+        try:
+            queue.start()
+        except Exception as e:
+            self.report({'ERROR'}, f"Rendering failed: {e}")
+            queue.finish(aborted=True)
+            return {'CANCELLED'}
+        return {'FINISHED'}
+
+
+class CAM_MANAGER_OT_contact_sheet(bpy.types.Operator):
+    """Tile the batch renders of the marked cameras into one overview image"""
+    bl_idname = "cam_manager.contact_sheet"
+    bl_label = "Contact Sheet"
+    bl_description = ("Tile the last batch render of every camera marked for rendering, labeled and in camera "
+                      f"list order, into {CONTACT_SHEET_NAME} in the output folder")
+
+    def execute(self, context):
+        scene = context.scene
+        cameras = select_cameras(scene)
+        if not cameras:
+            self.report({'ERROR'}, "No cameras selected for rendering")
+            return {'CANCELLED'}
+        path, tiled = write_contact_sheet(scene, cameras, animation=scene.cam_manager_batch.animation)
+        if path is None:
+            self.report({'ERROR'}, "Could not write the contact sheet")
+            return {'CANCELLED'}
+        if not tiled:
+            self.report({'WARNING'}, "No renders found in the output folder")
+        else:
+            self.report({'INFO'}, f"Contact sheet of {tiled} of {len(cameras)} cameras: {path}")
+        return {'FINISHED'}
+
+
+class CAM_MANAGER_OT_resume_batch_render(bpy.types.Operator):
+    """Render the cameras an interrupted batch render didn't get to"""
+    bl_idname = "cam_manager.resume_batch_render"
+    bl_label = "Resume Batch Render"
+    bl_description = ("Continue the last batch render into the output folder, or the last draft pass, "
+                      "from the first camera it didn't finish, using the journal it left in the folder")
+
+    @classmethod
+    def poll(cls, context):
+        return not batch_running()
+
+    def execute(self, context):
+        scene = context.scene
+        journal, draft = interrupted_batch(scene)
+        found = _journal_cameras(scene, journal)
+        if found is None:
+            self.report({'INFO'}, "No interrupted batch render in the output folder")
+            return {'CANCELLED'}
+        cameras, missing = found
+        if missing:
+            self.report({'WARNING'}, f"Cameras no longer in the scene: {', '.join(missing)}")
+        if not cameras:
+            journal.end()
+            self.report({'INFO'}, "Nothing left to render")
+            return {'FINISHED'}
+
+        self.report({'INFO'}, f"Resuming {'draft pass' if draft else 'batch render'}, {len(cameras)} cameras left")
+        queue = BatchRenderQueue(context, cameras, animation=scene.cam_manager_batch.animation, draft=draft,
+                                 output_dir=draft_folder(scene) if draft else None)
+        try:
+            queue.start()
+        except Exception as e:
+            self.report({'ERROR'}, f"Rendering failed: {e}")
+            queue.finish(aborted=True)
+            return {'CANCELLED'}
+        return {'FINISHED'}
+
+
+def _script_args(argv=None):
+    """Arguments after '--' on Blender's command line, which Blender leaves to scripts."""
+    argv = sys.argv if argv is None else argv
+    return argv[argv.index('--') + 1:] if '--' in argv else []
+
+
+def _parse_args(args):
+    parser = argparse.ArgumentParser(
+        prog="blender -b file.blend -- --scm-render",
+        description="Render cameras of the loaded .blend with Simple Camera Manager's per-camera settings.")
+    parser.add_argument('--scm-render', action='store_true',
+                        help="render when the add-on loads the file, without --python-expr")
+    parser.add_argument('--scm-scene', metavar='NAME', help="scene to render, the file's active scene by default")
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument('--scm-cameras', nargs='+', metavar='NAME', help="render these cameras")
+    selection.add_argument('--scm-glob', metavar='PATTERN', help="render cameras whose name matches PATTERN")
+    selection.add_argument('--scm-resume', action='store_true',
+                           help=("render the cameras the last, interrupted batch into the output folder didn't "
+                                 "finish, or those of an interrupted draft pass"))
+    selection.add_argument('--scm-after-review', action='store_true',
+                           help="render the final pass of the draft pass waiting in <output folder>/draft")
+    parser.add_argument('--scm-files', nargs='+', metavar='PATH',
+                        help=("render the cameras of each of these .blend files, directories or glob patterns "
+                              "instead of the loaded file, --scm-workers files at a time"))
+    parser.add_argument('--scm-output', metavar='DIR', help="write <DIR>/<camera name> instead of the output path")
+    parser.add_argument('--scm-report', metavar='PATH',
+                        help="also write the report to PATH, as CSV if it ends in .csv, JSON otherwise")
+    parser.add_argument('--scm-workers', type=int, default=1, metavar='N',
+                        help="render in N background Blender processes")
+    parser.add_argument('--scm-threads', type=int, default=0, metavar='T',
+                        help="render threads per worker, the CPU cores split between the workers by default")
+    parser.add_argument('--scm-animation', action='store_true',
+                        help="render each camera's frame range into <output folder>/<camera>/<frame>")
+    parser.add_argument('--scm-split-frames', action='store_true',
+                        help="with --scm-workers and --scm-animation, split every camera's frames between the workers")
+    parser.add_argument('--scm-order', choices=('LIST', 'SHORTEST', 'LONGEST', 'SLOT'), default='LIST',
+                        help="render order; SHORTEST and LONGEST use the render times recorded in the output folder")
+    parser.add_argument('--scm-draft-first', action='store_true',
+                        help=("render every camera's draft into <output folder>/draft and stop for review, "
+                              "the final pass is rendered with --scm-after-review; one camera at a time, "
+                              "not with --scm-workers"))
+    parser.add_argument('--scm-final-pass', choices=('ALL', 'APPROVED', 'APPROVED_OR_UNCHANGED'), default='ALL',
+                        help="cameras of the draft pass rendered at full quality")
+    parser.add_argument('--scm-dedupe', action='store_true',
+                        help=("render identical cameras once and copy the image to the others; animated cameras "
+                              "are always rendered with --scm-animation"))
+    parser.add_argument('--scm-hardlink', action='store_true',
+                        help=("with --scm-dedupe, hardlink the duplicates' images instead of copying them; a "
+                              "later render into either path changes both"))
+    parser.add_argument('--scm-contact-sheet', action='store_true',
+                        help=(f"tile the renders into {CONTACT_SHEET_NAME} in the output folder afterwards, in "
+                              "camera name order: the camera list's sorting is only known with the UI drawn"))
+    parser.add_argument('--scm-skip-unchanged', action='store_true',
+                        help="skip cameras whose render is up to date in the output folder's manifest")
+    parser.add_argument('--scm-cache-scope', choices=('FILE', 'CAMERA'), default='FILE',
+                        help="FILE re-renders every camera when the .blend was saved since; CAMERA "
+                             "only checks the camera and render settings and misses scene edits")
+    # Set by the parallel coordinator on its workers' command lines.
+    parser.add_argument('--scm-worker', action='store_true', help=argparse.SUPPRESS)
+    # Leave unknown arguments to other scripts sharing the command line.
+    return parser.parse_known_args(args)[0]
+
+
+def _nothing_to_render(args, message, code=0):
+    """Print why main() renders nothing and return code. An empty --scm-report is still
+    written, which tells a file without cameras from a crashed worker in render_files()."""
+    print(message)
+    if args.scm_report:
+        write_report(args.scm_report, [])
+    return code
+
+
+def main(argv=None):
+    """
+    Headless batch render of the loaded .blend. Renders the cameras marked
+    for rendering, or those given by --scm-cameras / --scm-glob::
+
+        blender -b scene.blend --python-expr "import sys, simple_camera_manager.batch_render as m; sys.exit(m.main())" -- --scm-glob "SH01*"
+
+    or, with the add-on enabled in the user preferences, just::
+
+        blender -b scene.blend -- --scm-render
+
+    :param argv: command line, sys.argv by default; only the part after '--' is read
+    :return: exit code, 0 if every camera rendered, 1 otherwise
+    """
+    args = _parse_args(_script_args(argv))
+    if args.scm_files:
+        return main_files(args)
+    if args.scm_draft_first and args.scm_workers > 1:
+        print("--scm-draft-first renders one camera at a time and can't be used with --scm-workers")
+        return 1
+    context = bpy.context
+    scene = context.scene
+    view_layer = context.view_layer
+    if args.scm_scene:
+        scene = bpy.data.scenes.get(args.scm_scene)
+        if scene is None:
+            print(f"Scene not found: {args.scm_scene}")
+            return 1
+        view_layer = scene.view_layers[0]
+
+    journal = BatchJournal(output_folder(scene, args.scm_output))
+    duplicates = {}
+    resume_draft = False
+    if args.scm_resume:
+        journal, resume_draft = interrupted_batch(scene, args.scm_output)
+        found = _journal_cameras(scene, journal)
+        if found is None:
+            return _nothing_to_render(args, "No interrupted batch render to resume")
+        cameras, missing = found
+        if missing:
+            print(f"Cameras no longer in the scene: {', '.join(missing)}")
+        if not cameras:
+            journal.end()
+            return _nothing_to_render(args, "Nothing left to render")
+    elif args.scm_after_review:
+        found = load_draft_pass(scene, args.scm_final_pass, args.scm_output)
+        if found is None:
+            return _nothing_to_render(args, "No draft pass waiting for review")
+        cameras, duplicates, _saved = found
+        clear_draft_pass(scene, args.scm_output)
+        if not cameras:
+            return _nothing_to_render(args, "No cameras selected for the final pass")
+    else:
+        cameras = select_cameras(scene, args.scm_cameras, args.scm_glob)
+        if not cameras:
+            return _nothing_to_render(args, "No cameras to render", 1)
+
+    selected = cameras
+    with context.temp_override(scene=scene, view_layer=view_layer):
+        cache = None
+        if args.scm_skip_unchanged and not args.scm_animation:
+            cache = RenderCache(scene, cameras, args.scm_cache_scope, args.scm_output)
+            cameras = cache.pending
+            if cache.unsaved:
+                print("The file has unsaved changes, rendering every camera")
+            print(f"Skipping {len(cache.skipped)} unchanged cameras")
+        if args.scm_dedupe and not args.scm_after_review:
+            cameras, duplicates = dedupe_cameras(scene, cameras, args.scm_animation, args.scm_draft_first)
+        history = RenderHistory(output_folder(scene, args.scm_output))
+        estimates, timed = history.estimates([obj.name for obj in cameras], args.scm_animation)
+        cameras = order_cameras(cameras, args.scm_order, estimates)
+        if timed:
+            _total, makespan = estimate_duration([obj.name for obj in cameras], estimates, args.scm_workers)
+            print(f"Estimated render time: {format_duration(makespan)}")
+        if args.scm_draft_first or resume_draft:
+            if args.scm_draft_first:
+                fingerprints = {camera.name: _draft_fingerprint(scene, camera) for camera in cameras}
+                save_draft_pass(scene, [camera.name for camera in cameras], fingerprints, duplicates,
+                                args.scm_output)
+                journal = BatchJournal(draft_folder(scene, args.scm_output))
+                journal.begin(scene.name, [camera.name for camera in cameras])
+            drafts = render_cameras(context, cameras, draft_folder(scene, args.scm_output), journal,
+                                    animation=args.scm_animation, draft=True)
+            copy_duplicates(scene, duplicates, [name for name, ok in drafts if ok],
+                            draft_folder(scene, args.scm_output), args.scm_animation, args.scm_hardlink)
+            if all(ok for _name, ok in drafts):
+                journal.end()
+            if args.scm_report:
+                write_report(args.scm_report, [{**_failed_row(name), 'rendered': ok} for name, ok in drafts])
+            print(f"Drafts in {draft_folder(scene, args.scm_output)}, review them and render the final "
+                  f"pass with --scm-after-review")
+            return 0 if all(ok for _name, ok in drafts) else 1
+
+        # Workers only journal their own cameras, the batch is begun and ended by whoever started them.
+        if not args.scm_worker:
+            journal.begin(scene.name, [obj.name for obj in cameras])
+        if args.scm_workers > 1 and cameras:
+            rows = render_parallel(scene, cameras, args.scm_workers, args.scm_threads, args.scm_output,
+                                   args.scm_animation, args.scm_split_frames, estimates if timed else None, journal)
+        else:
+            metrics = RenderMetrics()
+            render_cameras(context, cameras, args.scm_output, journal, metrics, args.scm_animation)
+            rows = metrics.rows()
+        rows += copy_duplicates(scene, duplicates, [row['camera'] for row in rows if row['rendered']],
+                                args.scm_output, args.scm_animation, args.scm_hardlink)
+        results = [(row['camera'], bool(row['rendered'])) for row in rows]
+        if cache is not None:
+            cache.record(results)
+        if not args.scm_worker and all(ok for _name, ok in results):
+            journal.end()
+
+    if args.scm_report:
+        write_report(args.scm_report, rows)
+    if not args.scm_worker:
+        path = save_report(output_folder(scene, args.scm_output), rows, scene.cam_manager_batch.report_format,
+                           args.scm_animation)
+        if path:
+            print(f"Render report: {path}")
+        if args.scm_contact_sheet:
+            write_contact_sheet(scene, selected, args.scm_output, args.scm_animation)
+
+    failed = [name for name, ok in results if not ok]
+    print(f"Rendered {len(results) - len(failed)} of {len(results)} cameras")
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+    return 1 if failed else 0
+
+
+def main_files(args):
+    """
+    Multi-file part of main(), for --scm-files. Writes one report over all
+    files, to --scm-report or scm_render_report.json in the working directory::
+
+        blender -b --python-expr "import sys, simple_camera_manager.batch_render as m; sys.exit(m.main())" -- --scm-files "catalog/**/*.blend" --scm-workers 4 --scm-report catalog.csv
+
+    :return: exit code, 0 if every camera of every file rendered, 1 otherwise. Files
+        without cameras to render don't count as failed
+    """
+    paths = blend_files(args.scm_files)
+    if not paths:
+        print(f"No .blend files found: {' '.join(args.scm_files)}")
+        return 1
+    print(f"Rendering {len(paths)} files")
+    rows = render_files(paths, args)
+
+    report_path = args.scm_report or os.path.join(os.getcwd(), f"{REPORT_NAME}.json")
+    try:
+        write_report(report_path, rows, ('file',) + FIELDS + ('status',))
+        print(f"Render report: {report_path}")
+    except OSError as e:
+        print(f"Could not write render report {report_path}: {e}")
+
+    failed_files = sorted({row['file'] for row in rows if row['status'] in ('failed', 'crashed')})
+    empty_files = [row['file'] for row in rows if row['status'] == 'no cameras']
+    rendered = sum(1 for row in rows if row['rendered'])
+    print(f"Rendered {rendered} cameras from {len(paths)} files")
+    if empty_files:
+        print(f"Files without cameras to render: {', '.join(empty_files)}")
+    if failed_files:
+        print(f"Files with failed cameras: {', '.join(failed_files)}")
+    return 1 if failed_files else 0
+
+
+_cli_render_done = False
+
+
+def _python_on_command_line(argv):
+    blender_args = argv[:argv.index('--')] if '--' in argv else argv
+    return any(arg in ('-P', '--python', '--python-expr', '--python-text') for arg in blender_args)
+
+
+@persistent
+def _cli_render_on_load(*_args):
+    """Run main() once the .blend given with '-- --scm-render' is loaded and exit
+    with its exit code on failure. Skipped when a script was given on the
+    command line, which calls main() itself."""
+    global _cli_render_done
+    if _cli_render_done or not bpy.app.background or '--scm-render' not in _script_args():
+        return
+    if _python_on_command_line(sys.argv):
+        return
+    _cli_render_done = True
+    exit_code = main()
+    if exit_code:
+        sys.exit(exit_code)
 
-        return {'RUNNING_MODAL'}
 
 classes = (
+    BatchRenderSettings,
     CAM_MANAGER_OT_multi_camera_rendering_handlers,
+    CAM_MANAGER_OT_parallel_batch_render,
+    CAM_MANAGER_OT_resume_batch_render,
+    CAM_MANAGER_OT_render_final_pass,
+    CAM_MANAGER_OT_contact_sheet,
+    CAM_MANAGER_OT_render_to_slots,
 )
 
 def register():
@@ -127,8 +1945,32 @@ def register():
     for cls in classes:
         register_class(cls)
 
+    bpy.types.Scene.cam_manager_batch = bpy.props.PointerProperty(name="Batch Render", type=BatchRenderSettings)
+
+    if _cli_render_on_load not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_cli_render_on_load)
+    if _abandon_batch_on_load not in bpy.app.handlers.load_pre:
+        bpy.app.handlers.load_pre.append(_abandon_batch_on_load)
+
 def unregister():
     """Unregister the operators from Blender."""
+    global _queue, _pool
+    if _cli_render_on_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_cli_render_on_load)
+    if _abandon_batch_on_load in bpy.app.handlers.load_pre:
+        bpy.app.handlers.load_pre.remove(_abandon_batch_on_load)
+
+    if _queue is not None:
+        _queue.finish(aborted=True)
+    _queue = None
+    if _pool is not None:
+        _pool.terminate()
+    _pool = None
+    if _review_timer is not None and bpy.app.timers.is_registered(_review_timer):
+        bpy.app.timers.unregister(_review_timer)
+
+    del bpy.types.Scene.cam_manager_batch
+
     from bpy.utils import unregister_class
 
     for cls in reversed(classes):
@@ -3,16 +3,16 @@ import os
 
 from bpy.app.handlers import persistent
 
+from .camera_registry import camera_data_changed, get_cameras, get_registry, in_view_layer
+from .render_slots import allocator, ensure_render_slots, get_render_slots
+from .view3d_cache import cache as view3d_cache, tag_redraw_view3d, window_region
+
 cam_collection_name = 'Cameras'
 
 
 def get_next_free_slot():
-    """Return the lowest render slot number not already assigned to any camera."""
-    used_slots = {cam.slot for cam in bpy.data.cameras}
-    slot = 1
-    while slot in used_slots:
-        slot += 1
-    return slot
+    """Reserve and return the lowest render slot number not already assigned to any camera."""
+    return allocator.allocate()[0]
 
 
 @persistent
@@ -68,32 +68,43 @@ def moveToCollection(ob, collection):
     return ob
 
 
-def cycleCamera(context, direction):
+def cycleCamera(context, direction, order='NAME'):
     """
     Change the active camera to the previous or next camera one in the camera list
     :param context:
     :param direction: string with 'FORWARD' or 'BACKWARD' to define the direction
+    :param order: 'NAME' to cycle alphabetically, 'LIST' to follow the camera list's sorting and filter
     :return: Bool for either successful or unsuccessful try
     """
 
     scene = context.scene
-    vl_objects = context.view_layer.objects
-    cam_objects = sorted([ob for ob in scene.objects if ob.type == 'CAMERA' and ob.name in vl_objects], key=lambda ob: ob.name.lower())
+    view_layer = context.view_layer
+    registry = get_registry(scene)
 
-    if len(cam_objects) == 0:
-        return False
+    camera = registry.ring(view_layer, order).step(scene.camera, direction)
+    if camera is not None and not in_view_layer(camera, view_layer):
+        # The ring predates a collection being excluded, rebuild it once.
+        registry.drop_rings(view_layer)
+        camera = registry.ring(view_layer, order).step(scene.camera, direction)
 
-    try:
-        idx = cam_objects.index(scene.camera)
-        new_idx = (idx + 1 if direction == 'FORWARD' else idx - 1) % len(cam_objects)
-    except ValueError:
-        new_idx = 0
+    if camera is None:
+        return False
 
-    bpy.ops.cam_manager.change_scene_camera(camera_name=cam_objects[new_idx].name)
-    # scene.camera = cam_objects[new_idx]
+    switch_camera(context, camera)
     return True
 
 
+def camera_list_index(scene, camera):
+    """Index of camera in scene.camera_list, -1 if it isn't listed. Constant
+    time while the list is in sync with the camera registry."""
+    idx = get_registry(scene).index(camera)
+    items = scene.camera_list
+    if 0 <= idx < len(items) and items[idx].camera == camera:
+        return idx
+    # List not synced yet (e.g. right after the camera was added).
+    return next((i for i, item in enumerate(items) if item.camera == camera), -1)
+
+
 def lock_camera(obj, lock):
     """ Locks or unlocks all transformation attributes of the camera. It further adds a custom property
     :param obj: object to lock/unlock
@@ -116,11 +127,10 @@ def lock_camera(obj, lock):
 
 def _find_view3d_area_region(context):
     """Return (area, region) for the first VIEW_3D window region on the current screen, or (None, None)."""
-    for area in context.screen.areas:
-        if area.type == 'VIEW_3D':
-            for region in area.regions:
-                if region.type == 'WINDOW':
-                    return area, region
+    for area in view3d_cache.areas(context.screen):
+        region = window_region(area)
+        if region is not None:
+            return area, region
     return None, None
 
 
@@ -252,7 +262,8 @@ class CAM_MANAGER_OT_cycle_cameras_next(bpy.types.Operator):
     )
 
     def execute(self, context):
-        if cycleCamera(context, self.direction):
+        prefs = context.preferences.addons[__package__].preferences
+        if cycleCamera(context, self.direction, prefs.cycle_order):
             return {'FINISHED'}
         else:
             return {'CANCELLED'}
@@ -275,7 +286,8 @@ class CAM_MANAGER_OT_cycle_cameras_backward(bpy.types.Operator):
     )
 
     def execute(self, context):
-        if cycleCamera(context, self.direction):
+        prefs = context.preferences.addons[__package__].preferences
+        if cycleCamera(context, self.direction, prefs.cycle_order):
             return {'FINISHED'}
         else:
             return {'CANCELLED'}
@@ -346,6 +358,127 @@ class CAM_MANAGER_OT_hide_unhide_camera(bpy.types.Operator):
         return {'FINISHED'}
 
 
+# Number of property writes switch_camera() applied, and skipped because the
+# property already had the value. Every write tags the depsgraph, a world
+# write can make EEVEE recompile shaders.
+switch_stats = {'applied': 0, 'skipped': 0}
+
+
+def _plan_camera_switch(scene, camera):
+    """
+    List the (owner, property, value) writes that make camera the scene camera, computed from
+    the current scene state before anything is written.
+    """
+    render = scene.render
+    changes = []
+
+    currently_overwriting = scene.camera is not None and scene.camera.data.resolution_overwrite
+    if camera.data.resolution_overwrite:
+        if not currently_overwriting:
+            changes.append((scene, 'cam_manager_base_res_x', render.resolution_x))
+            changes.append((scene, 'cam_manager_base_res_y', render.resolution_y))
+        resolution = camera.data.resolution
+        changes.append((render, 'resolution_x', resolution[0]))
+        changes.append((render, 'resolution_y', resolution[1]))
+    elif currently_overwriting:
+        changes.append((render, 'resolution_x', scene.cam_manager_base_res_x))
+        changes.append((render, 'resolution_y', scene.cam_manager_base_res_y))
+
+    # if camera.data.exposure: #returns 0 when exposure = 0
+    changes.append((scene.view_settings, 'exposure', camera.data.exposure))
+
+    if camera.data.world:
+        changes.append((scene, 'world', camera.data.world))
+
+    changes.append((scene, 'camera', camera))
+
+    # Highlight the camera in the camera UI lists. scene.camera_list
+    # mirrors the registry, so its index is the registry's, looked up
+    # by name instead of searching the list or scene.objects.
+    idx = camera_list_index(scene, camera)
+    if idx != -1:
+        changes.append((scene, 'camera_list_index', idx))
+
+    slots = get_render_slots()
+    if slots is not None and camera.data.slot <= len(slots):
+        # subtract by one to make 1 the first slot 'Slot1' and not user input 0
+        changes.append((slots, 'active_index', camera.data.slot - 1))
+
+    if scene.output_use_cam_name:
+        path, basename = os.path.split(render.filepath)
+        changes.append((render, 'filepath', os.path.join(path, camera.name)))
+
+    return changes
+
+
+def _apply_changes(changes):
+    """Write only the values that differ from the current ones."""
+    for owner, prop, value in changes:
+        if getattr(owner, prop) != value:
+            setattr(owner, prop, value)
+            switch_stats['applied'] += 1
+        else:
+            switch_stats['skipped'] += 1
+
+
+def _view_target_areas(context, view_target='FIRST', mouse=None):
+    """
+    3D viewports switch_camera retargets, looked up in the VIEW_3D area cache.
+    :param view_target: 'FIRST' for the first 3D viewport of any screen, 'VISIBLE' for every
+        3D viewport shown in a window, 'HOVERED' for the one under the mouse
+    :param mouse: (window, x, y) of the mouse in window coordinates, used by 'HOVERED'
+    :return: list of VIEW_3D areas
+    """
+    if view_target == 'VISIBLE':
+        return [area for _window, area in view3d_cache.visible(context.window_manager)]
+    if view_target == 'HOVERED' and mouse is not None:
+        area = view3d_cache.at(*mouse)
+        if area is not None:
+            return [area]
+    area = view3d_cache.first()
+    return [area] if area is not None else []
+
+
+def switch_camera(context, camera, switch_to_cam=False, select=True, view_target='FIRST', mouse=None):
+    """
+    Make camera the scene camera and apply its per-camera settings: resolution override, exposure,
+    world, render slot and output file name. This is what cam_manager.change_scene_camera runs,
+    exposed so batch rendering and scripts can switch cameras without operator dispatch.
+    All writes are planned against the current scene first and only the ones that change a value
+    are applied, so switching between cameras sharing a world and resolution writes neither.
+    :param context: context whose scene and view layer are changed
+    :param camera: camera object of context.scene
+    :param switch_to_cam: also make 3D viewports look through the camera
+    :param view_target: which 3D viewports switch_to_cam retargets, 'FIRST', 'VISIBLE' or 'HOVERED'
+    :param mouse: (window, x, y) mouse position for view_target 'HOVERED'. Without it, or with the
+        mouse outside any 3D viewport, 'HOVERED' falls back to 'FIRST'
+    :param select: make the camera the only selected and the active object
+    :return: None
+    """
+    scene = context.scene
+    _apply_changes(_plan_camera_switch(scene, camera))
+
+    view_layer = context.view_layer
+    if select and in_view_layer(camera, view_layer):
+        if view_layer.objects.active != camera:
+            view_layer.objects.active = camera
+        # Deselect what is selected instead of bpy.ops.object.select_all(),
+        # which needs operator context and visits every object.
+        for obj in view_layer.objects.selected:
+            if obj != camera:
+                obj.select_set(False)
+        if not camera.select_get():
+            camera.select_set(True)
+
+    if switch_to_cam:
+        for area in _view_target_areas(context, view_target, mouse):
+            space = area.spaces.active
+            _apply_changes((
+                (space.region_3d, 'view_perspective', 'CAMERA'),
+                (space, 'camera', camera),
+            ))
+
+
 class CAM_MANAGER_OT_switch_camera(bpy.types.Operator):
     """Set a camera as the scene camera, apply its resolution and exposure overrides, and select it."""
     bl_idname = "cam_manager.change_scene_camera"
@@ -355,70 +488,18 @@ class CAM_MANAGER_OT_switch_camera(bpy.types.Operator):
     camera_name: bpy.props.StringProperty()
     switch_to_cam: bpy.props.BoolProperty(default=False)
 
+    _mouse = None
+
+    def invoke(self, context, event):
+        self._mouse = (context.window, event.mouse_x, event.mouse_y) if context.window else None
+        return self.execute(context)
+
     def execute(self, context):
-        scene = context.scene
-        if self.camera_name and scene.objects.get(self.camera_name):
-            camera = scene.objects[self.camera_name]
-
-            currently_overwriting = scene.camera is not None and scene.camera.data.resolution_overwrite
-            if camera.data.resolution_overwrite:
-                if not currently_overwriting:
-                    scene.cam_manager_base_res_x = scene.render.resolution_x
-                    scene.cam_manager_base_res_y = scene.render.resolution_y
-                resolution = camera.data.resolution
-                scene.render.resolution_x = resolution[0]
-                scene.render.resolution_y = resolution[1]
-            elif currently_overwriting:
-                scene.render.resolution_x = scene.cam_manager_base_res_x
-                scene.render.resolution_y = scene.cam_manager_base_res_y
-
-            # if camera.data.exposure: #returns 0 when exposure = 0
-            scene.view_settings.exposure = camera.data.exposure
-
-            if camera.data.world:
-                try:
-                    world = camera.data.world
-                    scene.world = world
-                except KeyError:
-                    self.report({'WARNING'}, 'World material could not be found')
-                    pass
-
-            scene.camera = camera
-            if camera.name in context.view_layer.objects:
-                context.view_layer.objects.active = camera
-                bpy.ops.object.select_all(action='DESELECT')
-                camera.select_set(True)
-
-            objectlist = list(context.scene.objects)
-            idx = objectlist.index(camera)
-
-            if self.switch_to_cam:
-                found_view_3d = False
-                for screen in bpy.data.screens:
-                    for area in screen.areas:
-                        if area.type == 'VIEW_3D':
-                            for space in area.spaces:
-                                if space.type == 'VIEW_3D':
-                                    space.region_3d.view_perspective = 'CAMERA'
-                                    space.camera = camera
-                                    found_view_3d = True
-                                    break
-                            if found_view_3d:
-                                break
-                    if found_view_3d:
-                        break
-
-            scene.camera_list_index = idx
-
-            if camera.data.slot <= len(bpy.data.images['Render Result'].render_slots):
-                # subtract by one to make 1 the first slot 'Slot1' and not user input 0
-                bpy.data.images['Render Result'].render_slots.active_index = camera.data.slot - 1
-
-            if scene.output_use_cam_name:
-                old_path = bpy.context.scene.render.filepath
-                path, basename = os.path.split(old_path)
-                new_path = os.path.join(path, self.camera_name)
-                bpy.context.scene.render.filepath = new_path
+        camera = get_registry(context.scene).get(self.camera_name) if self.camera_name else None
+        if camera is not None:
+            prefs = context.preferences.addons[__package__].preferences
+            switch_camera(context, camera, switch_to_cam=self.switch_to_cam,
+                          view_target=prefs.view_target, mouse=self._mouse)
 
         return {'FINISHED'}
 
@@ -486,10 +567,10 @@ class CAM_MANAGER_OT_all_cameras_to_collection(bpy.types.Operator):
             parent_collection = context.scene.collection
             scene.cam_collection.collection = make_collection(cam_collection_name, parent_collection)
 
-        for obj in bpy.data.objects:
-            if obj.type == 'CAMERA':
-                cam_collection = scene.cam_collection.collection
-                moveToCollection(obj, cam_collection)
+        cam_collection = scene.cam_collection.collection
+        # Copy, moving cameras between collections invalidates the registry.
+        for obj in list(get_cameras(scene)):
+            moveToCollection(obj, cam_collection)
 
         return {'FINISHED'}
 
@@ -508,7 +589,11 @@ class CAM_MANAGER_OT_render(bpy.types.Operator):
 
     def execute(self, context):
         scene = context.scene
-        bpy.ops.cam_manager.change_scene_camera(camera_name=self.camera_name, switch_to_cam=False)
+        camera = get_registry(scene).get(self.camera_name)
+        if camera is None:
+            self.report({'WARNING'}, f"Camera '{self.camera_name}' not found in this scene")
+            return {'CANCELLED'}
+        switch_camera(context, camera)
         bpy.ops.render.render('INVOKE_DEFAULT', animation=False, write_still=scene.output_render, use_viewport=False)
         return {'FINISHED'}
 
@@ -520,6 +605,7 @@ def resolution_update_func(self, context):
     :param context:
     :return: None
     """
+    camera_data_changed(context.scene, self)
     if context.scene.camera.data.name == self.name:
         context.scene.render.resolution_x = self.resolution[0]
         context.scene.render.resolution_y = self.resolution[1]
@@ -554,31 +640,30 @@ def world_update_func(self, context):
 
 def render_slot_update_funce(self, context):
     """
-    Update the render slot when changing render slot for the active camera. A new render slot will
-    be created if the number is higher than the number of current render slots. The newly created
-    render slots gets assigned automatically.
+    Update the render slot when changing render slot for the active camera. If the number is
+    higher than the number of current render slots, Render Result is grown to that many slots
+    in one go.
     :param self:
     :param context:
     :return: None
     """
+    camera_data_changed(context.scene, self)
+    allocator.assign(self, self.slot)
 
-    new_slot = False
-    render_result = bpy.data.images['Render Result']
+    slots = get_render_slots()
+    if slots is None:
+        return
+    ensure_render_slots(self.slot)
 
-    # Create new slot if the input is higher than the current number of render slots
-    if self.slot > len(bpy.data.images['Render Result'].render_slots):
-        render_result.render_slots.new()
-        new_slot = True
-        self.slot = len(bpy.data.images['Render Result'].render_slots)
+    scene_camera = context.scene.camera
+    if scene_camera and scene_camera.data.name == self.name:
+        # subtract by one to make 1 the first slot 'Slot1' and not user input 0
+        slots.active_index = self.slot - 1
 
-    if context.scene.camera.data.name == self.name:
-        if new_slot:
-            new_render_slot_nr = len(bpy.data.images['Render Result'].render_slots)
-            render_result.render_slots.active_index = new_render_slot_nr
-            self.slot = new_render_slot_nr
-        else:
-            # subtract by one to make 1 the first slot 'Slot1' and not user input 0
-            render_result.render_slots.active_index = self.slot - 1
+
+def render_selected_update_func(self, context):
+    """Let the camera UI lists re-filter when a camera is (un)marked for rendering."""
+    camera_data_changed(context.scene, self)
 
 
 def update_func(self, context):
@@ -600,17 +685,11 @@ def dolly_zoom_link_focus_update_func(self, context):
 
 
 def show_dolly_gizmo_update_func(self, context):
-    for window in bpy.context.window_manager.windows:
-        for area in window.screen.areas:
-            if area.type == 'VIEW_3D':
-                area.tag_redraw()
+    tag_redraw_view3d()
 
 
 def show_rotation_gizmo_update_func(self, context):
-    for window in bpy.context.window_manager.windows:
-        for area in window.screen.areas:
-            if area.type == 'VIEW_3D':
-                area.tag_redraw()
+    tag_redraw_view3d()
 
 
 class CAM_MANAGER_OT_reload_addon(bpy.types.Operator):
@@ -706,7 +785,7 @@ def register():
 
     cam.render_selected = bpy.props.BoolProperty(name="Select Camera",
                                                  description="Select this camera for rendering",
-                                                 default=False)
+                                                 default=False, update=render_selected_update_func)
 
     cam.exposure = bpy.props.FloatProperty(name='exposure', description='Camera exposure', default=0, soft_min=-10,
                                            soft_max=10, update=exposure_update_func)
@@ -714,6 +793,26 @@ def register():
     cam.slot = bpy.props.IntProperty(name="Slot", default=1, description='Render slot, used when rendering this camera',
                                      min=1, soft_max=15, update=render_slot_update_funce)
 
+    cam.use_frame_range = bpy.props.BoolProperty(name="Own Frame Range",
+                                                 description="Render this camera's own frame range in animation batch renders instead of the scene's",
+                                                 default=False)
+    cam.frame_start = bpy.props.IntProperty(name="Start Frame", description="First frame of this camera's animation batch render",
+                                            default=1, min=0)
+    cam.frame_end = bpy.props.IntProperty(name="End Frame", description="Last frame of this camera's animation batch render",
+                                          default=250, min=0)
+
+    cam.draft_resolution_percentage = bpy.props.IntProperty(name="Draft Resolution", description="Resolution percentage of this camera's draft render",
+                                                            default=25, min=1, max=100, subtype='PERCENTAGE')
+    cam.draft_samples = bpy.props.IntProperty(name="Draft Samples", description="Render samples of this camera's draft render",
+                                              default=16, min=1)
+    cam.draft_approved = bpy.props.BoolProperty(name="Approved", description="The draft of this camera is approved for the final render",
+                                                default=False)
+
+    cam.use_subject_border = bpy.props.BoolProperty(name="Render Only Subject", description="Render only the part of the frame the subject collection covers, plus padding, in batch renders",
+                                                    default=False)
+    cam.subject_padding = bpy.props.IntProperty(name="Padding", description="Pixels rendered around the subject",
+                                                default=16, min=0, soft_max=512, subtype='PIXEL')
+
     cam.dolly_zoom_target_scale = bpy.props.FloatProperty(name='Target Scale', description='', default=2, min=0,
                                                           update=update_func)
     cam.dolly_zoom_target_distance = bpy.props.FloatProperty(name='Target Distance', description='', default=10, min=0,
@@ -743,6 +842,8 @@ def register():
         register_class(cls)
 
     # The PointerProperty has to be after registering the classes to know about the custom property type
+    cam.subject_collection = bpy.props.PointerProperty(type=bpy.types.Collection, name="Subject",
+                                                       description="Collection whose objects a subject-only render is cropped to")
     cam.world = bpy.props.PointerProperty(update=world_update_func, type=bpy.types.World,
                                           name="World Material")  # type=WorldMaterialProperty, name="World Material", description='World material assigned to the camera',
 
@@ -774,6 +875,15 @@ def unregister():
     del cam.resolution
     del cam.render_selected
     del cam.slot
+    del cam.use_frame_range
+    del cam.frame_start
+    del cam.frame_end
+    del cam.draft_resolution_percentage
+    del cam.draft_samples
+    del cam.draft_approved
+    del cam.use_subject_border
+    del cam.subject_padding
+    del cam.subject_collection
     del cam.exposure
     del cam.world
     del cam.dolly_zoom_target_scale
@@ -45,6 +45,49 @@ def _get_camera_frame_rect(region, rv3d, scene, cam_ob):
     return x0, y0, x1 - x0, y1 - y0
 
 
+# Object types whose bounding box is something that renders.
+_NON_GEOMETRY_TYPES = {'CAMERA', 'LIGHT', 'LIGHT_PROBE', 'SPEAKER', 'EMPTY', 'ARMATURE', 'LATTICE'}
+
+
+def get_subject_frame_rect(scene, cam_ob, objects):
+    """Return (x0, y0, x1, y1) of the bounding boxes of objects projected into the camera's
+    render frame, as fractions of the frame from its bottom left corner, clamped to 0..1.
+    Projects onto the frame view_frame() returns like _get_camera_frame_rect, so lens shift
+    and sensor fit are accounted for. Returns the whole frame if a bounding box reaches
+    behind a perspective camera, None if no object has geometry or none is in frame."""
+    frame = cam_ob.data.view_frame(scene=scene)
+    frame_x = [co.x for co in frame]
+    frame_y = [co.y for co in frame]
+    frame_z = frame[0].z
+    left, bottom = min(frame_x), min(frame_y)
+    width, height = max(frame_x) - left, max(frame_y) - bottom
+    perspective = cam_ob.data.type != 'ORTHO'
+    to_camera = cam_ob.matrix_world.inverted()
+
+    xs = []
+    ys = []
+    for ob in objects:
+        if ob.type in _NON_GEOMETRY_TYPES or ob.hide_render:
+            continue
+        mat = to_camera @ ob.matrix_world
+        for corner in ob.bound_box:
+            co = mat @ mathutils.Vector(corner)
+            if perspective:
+                if co.z >= 0.0:
+                    return 0.0, 0.0, 1.0, 1.0
+                co = co * (frame_z / co.z)
+            xs.append((co.x - left) / width)
+            ys.append((co.y - bottom) / height)
+    if not xs:
+        return None
+
+    x0, x1 = max(min(xs), 0.0), min(max(xs), 1.0)
+    y0, y1 = max(min(ys), 0.0), min(max(ys), 1.0)
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return x0, y0, x1, y1
+
+
 def _draw_rect(x0, y0, x1, y1, color):
     shader = gpu.shader.from_builtin('UNIFORM_COLOR')
     batch = batch_for_shader(shader, 'TRI_FAN', {"pos": ((x0, y0), (x1, y0), (x1, y1), (x0, y1))})
@@ -0,0 +1,477 @@
+import bisect
+
+import bpy
+
+from bpy.app.handlers import persistent
+
+from .camera_search import CameraNameIndex
+
+# One CameraRegistry per scene, keyed by scene name. Rebuilt lazily the first
+# time a dirty registry is read, so the cost of scanning scene.objects is paid
+# only after the set of objects actually changed, not on every lookup.
+_registries = {}
+
+
+class SortedCameraIndex:
+    """Cameras kept ordered by key(obj), updated in place as single cameras
+    change instead of being re-sorted.
+
+    Entries are (key, name) tuples, so the object name breaks ties and every
+    entry is unique, which makes the old entry of a changed camera findable
+    by bisection.
+    """
+
+    def __init__(self, key, cameras):
+        self.key = key
+        self._key_of = {ob.name: key(ob) for ob in cameras}
+        self._entries = sorted((k, name) for name, k in self._key_of.items())
+
+    @property
+    def names(self):
+        return [name for _key, name in self._entries]
+
+    def update(self, obj):
+        """Move obj to its new position. O(log n) search plus a list shift."""
+        name = obj.name
+        old_key = self._key_of.get(name)
+        new_key = self.key(obj)
+        if old_key == new_key:
+            return
+        if old_key is not None:
+            del self._entries[bisect.bisect_left(self._entries, (old_key, name))]
+        bisect.insort(self._entries, (new_key, name))
+        self._key_of[name] = new_key
+
+
+def in_view_layer(obj, view_layer):
+    """True if obj has a base in view_layer, i.e. isn't in an excluded
+    collection. hide_get() looks the base up in the view layer's base hash
+    and raises if there is none, unlike `obj.name in view_layer.objects`
+    which walks every base."""
+    try:
+        obj.hide_get(view_layer=view_layer)
+    except RuntimeError:
+        return False
+    return True
+
+
+class CameraRing:
+    """Circular camera order for cycling, with constant time next/previous."""
+
+    def __init__(self, cameras, base_count):
+        self.cameras = cameras
+        # len(view_layer.objects) when built, see _on_depsgraph_update().
+        self.base_count = base_count
+        self._positions = {ob.name: i for i, ob in enumerate(cameras)}
+
+    def step(self, obj, direction):
+        """Camera after ('FORWARD') or before ('BACKWARD') obj. The first
+        camera if obj isn't part of the ring, None if the ring is empty."""
+        if not self.cameras:
+            return None
+        pos = self._positions.get(obj.name) if obj is not None else None
+        if pos is None or self.cameras[pos] != obj:
+            return self.cameras[0]
+        pos += 1 if direction == 'FORWARD' else -1
+        return self.cameras[pos % len(self.cameras)]
+
+
+class CameraRegistry:
+    """Cached list of the camera objects linked to one scene.
+
+    `cameras` is ordered by lowercase name (the order the add-on has always
+    cycled cameras in), `objects` maps object name to object and
+    `active_index` is the position of scene.camera in `cameras` (-1 if the
+    scene camera is unset or not a camera of this scene). `revision` is
+    bumped whenever the cameras, their names or their data change, so
+    consumers can cache anything derived from them against it.
+    """
+
+    def __init__(self, scene_name):
+        self.scene_name = scene_name
+        self.objects = {}
+        self.cameras = []
+        self.active_index = -1
+        self.revision = 0
+        self._sort_indices = {}
+        self._name_index = None
+        self._rings = {}
+        self._display_order = None
+        # Camera objects by the as_pointer() of their camera data, which unlike
+        # the data's name survives renames, and the reverse.
+        self._data_users = {}
+        self._data_of = {}
+        self._positions = {}
+        self._object_count = -1
+        # scene_state() when last seen, see _on_depsgraph_update().
+        self._scene_state = None
+        self._dirty = True
+
+    def invalidate(self):
+        """Mark the registry out of date, the next read rebuilds it."""
+        self._dirty = True
+
+    def touch(self):
+        """Record that camera data changed without the camera set changing."""
+        self.revision += 1
+
+    def scene_state(self, scene):
+        """The scene camera and which cameras are visible, the parts of the
+        scene the registry's consumers depend on. O(camera count)."""
+        active = scene.camera
+        return (active.as_pointer() if active is not None else 0,
+                tuple(ob.visible_get() for ob in self.cameras))
+
+    @property
+    def name_index(self):
+        """CameraNameIndex over the camera names, built on first use."""
+        if self._name_index is None:
+            self._name_index = CameraNameIndex(self.objects)
+        return self._name_index
+
+    def sorted_index(self, mode, key):
+        """SortedCameraIndex of this registry's cameras for sort `mode`.
+
+        Built with a full sort the first time a mode is asked for after a
+        rebuild, afterwards kept current by cameras_changed().
+        """
+        index = self._sort_indices.get(mode)
+        if index is None:
+            index = self._sort_indices[mode] = SortedCameraIndex(key, self.cameras)
+        return index
+
+    def set_display_order(self, names):
+        """Record the camera names in the order a camera UI list shows them,
+        filtered and sorted, for cycling in 'LIST' order."""
+        if names != self._display_order:
+            self._display_order = names
+            for key in [key for key in self._rings if key[1] == 'LIST']:
+                del self._rings[key]
+
+    def in_display_order(self, cameras):
+        """cameras in the order the camera UI list last showed them. Cameras the
+        list didn't show, or all of them before it was drawn, follow in the
+        order given."""
+        if self._display_order is None:
+            return list(cameras)
+        position = {name: i for i, name in enumerate(self._display_order)}
+        end = len(position)
+        return sorted(cameras, key=lambda ob: position.get(ob.name, end))
+
+    def ring(self, view_layer, order='NAME'):
+        """Cached CameraRing of the cameras in view_layer.
+
+        order 'NAME' cycles alphabetically, 'LIST' follows the last order a
+        camera UI list displayed (its filter and sort_type), falling back to
+        'NAME' if no list was drawn yet.
+        """
+        if order == 'LIST' and self._display_order is None:
+            order = 'NAME'
+        key = (view_layer.name, order)
+        ring = self._rings.get(key)
+        if ring is None:
+            if order == 'LIST':
+                cameras = [self.objects[name] for name in self._display_order if name in self.objects]
+            else:
+                cameras = self.cameras
+            cameras = [ob for ob in cameras if in_view_layer(ob, view_layer)]
+            ring = self._rings[key] = CameraRing(cameras, len(view_layer.objects))
+        return ring
+
+    def drop_rings(self, view_layer=None):
+        """Forget the cached rings of view_layer, or all of them."""
+        for key in list(self._rings):
+            if view_layer is None or key[0] == view_layer.name:
+                del self._rings[key]
+
+    def cameras_changed(self, ids):
+        """Re-position the cameras behind `ids` (camera objects or camera
+        data, original not evaluated) in every sorted index."""
+        ids = list(ids)
+        changed = {}
+        # Objects first, so that camera data just assigned to one of them is found.
+        for id_data in ids:
+            if not isinstance(id_data, bpy.types.Camera) and self.objects.get(id_data.name) == id_data:
+                self._update_data_user(id_data)
+                changed[id_data.name] = id_data
+        for id_data in ids:
+            if isinstance(id_data, bpy.types.Camera):
+                for ob in self._data_users.get(id_data.as_pointer(), ()):
+                    changed[ob.name] = ob
+
+        for index in self._sort_indices.values():
+            for ob in changed.values():
+                index.update(ob)
+        self.touch()
+
+    def _update_data_user(self, ob):
+        """Move ob to the users of its current camera data if another datablock
+        was assigned to ob.data since it was recorded."""
+        pointer = ob.data.as_pointer()
+        old = self._data_of.get(ob.name)
+        if old == pointer:
+            return
+        users = self._data_users.get(old)
+        if users is not None:
+            users[:] = [user for user in users if user != ob]
+            if not users:
+                del self._data_users[old]
+        self._data_users.setdefault(pointer, []).append(ob)
+        self._data_of[ob.name] = pointer
+
+    def rebuild(self, scene):
+        """Rescan scene.objects for cameras. The only O(object count) step."""
+        objects = scene.objects
+        cameras = [ob for ob in objects if ob.type == 'CAMERA']
+        cameras.sort(key=lambda ob: ob.name.lower())
+
+        self.cameras = cameras
+        self.objects = {ob.name: ob for ob in cameras}
+        self._positions = {ob.name: i for i, ob in enumerate(cameras)}
+        self._data_users = {}
+        self._data_of = {}
+        for ob in cameras:
+            pointer = ob.data.as_pointer()
+            self._data_users.setdefault(pointer, []).append(ob)
+            self._data_of[ob.name] = pointer
+        self._sort_indices.clear()
+        self._name_index = None
+        self._rings.clear()
+        self._object_count = len(objects)
+        self._dirty = False
+        self.revision += 1
+        self.update_active(scene)
+        self._scene_state = self.scene_state(scene)
+
+    def ensure(self, scene):
+        """Return self, rebuilt first if anything invalidated it."""
+        if self._dirty:
+            self.rebuild(scene)
+        else:
+            try:
+                self.update_active(scene)
+            except ReferenceError:
+                # A cached object was freed behind our back (e.g. removed via
+                # bpy.data.objects.remove with no depsgraph update in between).
+                self.rebuild(scene)
+        return self
+
+    def update_active(self, scene):
+        active = scene.camera
+        self.active_index = self.index(active) if active is not None else -1
+
+    def index(self, obj):
+        """Position of obj in `cameras`, or -1. Constant time."""
+        if obj is None:
+            return -1
+        pos = self._positions.get(obj.name, -1)
+        if pos == -1 or self.cameras[pos] != obj:
+            return -1
+        return pos
+
+    def get(self, name):
+        """Camera object called `name` in this scene, or None."""
+        return self.objects.get(name)
+
+
+def get_registry(scene):
+    """Return the up-to-date CameraRegistry of `scene`."""
+    registry = _registries.get(scene.name)
+    if registry is None:
+        registry = _registries[scene.name] = CameraRegistry(scene.name)
+    return registry.ensure(scene)
+
+
+def get_cameras(scene):
+    """Camera objects of `scene`, ordered by lowercase name."""
+    return get_registry(scene).cameras
+
+
+def sync_camera_list(scene):
+    """Mirror the registry into scene.camera_list, the camera-only collection
+    the camera UI lists are drawn from. Rewritten only when the cameras or
+    their order differ, so calling it from update handlers is cheap and
+    doesn't keep re-triggering depsgraph updates.
+
+    Must not be called while drawing, ID properties are read-only there.
+    """
+    cameras = get_registry(scene).cameras
+    items = scene.camera_list
+    if len(items) == len(cameras) and all(item.camera == ob for item, ob in zip(items, cameras)):
+        return False
+
+    items.clear()
+    for ob in cameras:
+        items.add().camera = ob
+    return True
+
+
+def camera_data_changed(scene, camera_data):
+    """Tell the registry of `scene` that `camera_data` changed, for property
+    update callbacks whose writes the depsgraph doesn't report."""
+    registry = _registries.get(scene.name)
+    if registry is not None and not registry._dirty:
+        registry.cameras_changed((camera_data,))
+
+
+def invalidate(scene=None):
+    """Invalidate the registry of `scene`, or of every scene if None."""
+    if scene is None:
+        _registries.clear()
+        return
+    registry = _registries.get(scene.name)
+    if registry is not None:
+        registry.invalidate()
+
+
+def _is_camera_update(id_data):
+    if isinstance(id_data, bpy.types.Camera):
+        return True
+    return isinstance(id_data, bpy.types.Object) and id_data.type == 'CAMERA'
+
+
+@persistent
+def _on_depsgraph_update(scene, depsgraph):
+    """Keep a scene's registry in step with the depsgraph.
+
+    Linking to a regular collection tags that collection. Linking to the
+    scene's master collection only tags the scene, which selection changes
+    do as well, so those are told apart by the object count (counted in C).
+    Any other change to a camera object or camera data re-positions just
+    that camera in the sorted indices and bumps the registry revision. A
+    scene update bumps it only if scene_state() changed, so selecting
+    objects doesn't invalidate what was cached against the revision.
+    """
+    registry = _registries.get(scene.name)
+    if registry is None or registry._dirty:
+        sync_camera_list(scene)
+        return
+
+    scene_updated = depsgraph.id_type_updated('SCENE')
+    if depsgraph.id_type_updated('COLLECTION'):
+        registry.invalidate()
+    elif scene_updated and len(scene.objects) != registry._object_count:
+        registry.invalidate()
+    else:
+        changed = [update.id.original for update in depsgraph.updates if _is_camera_update(update.id)]
+        if changed:
+            registry.cameras_changed(changed)
+        if scene_updated:
+            # scene.camera and hide_set() changes only tag the scene.
+            state = registry.scene_state(scene)
+            if state != registry._scene_state:
+                registry._scene_state = state
+                if not changed:
+                    registry.touch()
+
+    if scene_updated and registry._rings:
+        # Excluding or including a collection changes the view layer's bases
+        # without changing scene.objects. Bases are counted in C.
+        base_counts = {}
+        for key, ring in list(registry._rings.items()):
+            view_layer = scene.view_layers.get(key[0])
+            if view_layer is not None and key[0] not in base_counts:
+                base_counts[key[0]] = len(view_layer.objects)
+            if view_layer is None or ring.base_count != base_counts[key[0]]:
+                del registry._rings[key]
+
+    if registry._dirty:
+        sync_camera_list(scene)
+
+
+@persistent
+def _on_file_change(*_args):
+    """Every object reference is stale after loading a file or undo/redo."""
+    invalidate()
+
+
+# msgbus owner for the rename subscription, renames don't go through the
+# depsgraph so they're caught here instead.
+_msgbus_owner = object()
+
+
+def _on_object_renamed(*_args):
+    # Every registry, renaming a mesh doesn't need a re-sort but it's cheaper
+    # to rebuild on the next read than to find out which object was renamed.
+    for registry in _registries.values():
+        registry.invalidate()
+    # Renaming reorders the registry, keep scene.camera_list in step.
+    _sync_context_scene()
+
+
+def _subscribe_rename():
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    bpy.msgbus.subscribe_rna(
+        key=(bpy.types.Object, "name"),
+        owner=_msgbus_owner,
+        args=(),
+        notify=_on_object_renamed,
+    )
+
+
+@persistent
+def _on_load_post(*_args):
+    invalidate()
+    # msgbus subscriptions are dropped when a new file is loaded.
+    _subscribe_rename()
+    # Files saved without the add-on (or by an older version) have no
+    # camera_list yet. Other scenes catch up on their first depsgraph update.
+    _sync_context_scene()
+
+
+def _sync_context_scene():
+    scene = bpy.context.scene
+    if scene is not None:
+        sync_camera_list(scene)
+
+
+class CameraListItem(bpy.types.PropertyGroup):
+    """One entry of scene.camera_list, a reference to a camera object."""
+    camera: bpy.props.PointerProperty(name="Camera", type=bpy.types.Object)
+
+
+classes = (
+    CameraListItem,
+)
+
+
+_handlers = (
+    (bpy.app.handlers.depsgraph_update_post, _on_depsgraph_update),
+    (bpy.app.handlers.load_post, _on_load_post),
+    (bpy.app.handlers.undo_post, _on_file_change),
+    (bpy.app.handlers.redo_post, _on_file_change),
+)
+
+
+def register():
+    from bpy.utils import register_class
+
+    for cls in classes:
+        register_class(cls)
+
+    # The CollectionProperty has to be after registering the classes to know about the custom property type
+    bpy.types.Scene.camera_list = bpy.props.CollectionProperty(name="Cameras", type=CameraListItem)
+
+    for handlers, func in _handlers:
+        if func not in handlers:
+            handlers.append(func)
+    _subscribe_rename()
+
+    # Deferred, bpy.context.scene isn't writable while the add-on registers.
+    bpy.app.timers.register(_sync_context_scene, first_interval=0.0)
+
+
+def unregister():
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    for handlers, func in _handlers:
+        if func in handlers:
+            handlers.remove(func)
+    _registries.clear()
+
+    del bpy.types.Scene.camera_list
+
+    from bpy.utils import unregister_class
+
+    for cls in reversed(classes):
+        if hasattr(cls, 'bl_rna'):
+            unregister_class(cls)
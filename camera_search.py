@@ -0,0 +1,106 @@
+import bisect
+
+
+def _grams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class CameraNameIndex:
+    """Lowercase n-gram index over camera names for the UI list name filter.
+
+    Every 1-, 2- and 3-character substring of every name maps to the names
+    containing it. A substring query intersects the postings of its
+    trigrams (or looks up a 1/2 character query directly) and only verifies
+    the few candidates left, so typing into the filter doesn't scan every
+    camera. Prefix queries bisect a sorted list of the lowercase names.
+    """
+
+    def __init__(self, names):
+        self._lower = {name: name.lower() for name in names}
+        self._postings = {}
+        for name, lower in self._lower.items():
+            for n in (1, 2, 3):
+                for gram in _grams(lower, n):
+                    self._postings.setdefault(gram, set()).add(name)
+        self._sorted = sorted((lower, name) for name, lower in self._lower.items())
+
+    def _candidates(self, query):
+        """Names that may contain `query`, exact for queries up to 3 chars."""
+        if len(query) <= 3:
+            return self._postings.get(query, set())
+        postings = sorted((self._postings.get(gram, set()) for gram in _grams(query, 3)), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return candidates
+
+    def contains(self, query):
+        """Set of names containing `query`, case-insensitive."""
+        query = query.lower()
+        if not query:
+            return set(self._lower)
+        return {name for name in self._candidates(query) if query in self._lower[name]}
+
+    def prefix(self, query):
+        """Set of names starting with `query`, case-insensitive."""
+        query = query.lower()
+        start = bisect.bisect_left(self._sorted, (query,))
+        matches = set()
+        for lower, name in self._sorted[start:]:
+            if not lower.startswith(query):
+                break
+            matches.add(name)
+        return matches
+
+    def fuzzy(self, query):
+        """Dict of name -> score for every name containing the characters of
+        `query` in order. Higher scores are better matches."""
+        query = query.lower()
+        if not query:
+            return {name: 0 for name in self._lower}
+        candidates = None
+        for char in set(query):
+            posting = self._postings.get(char, set())
+            candidates = set(posting) if candidates is None else candidates & posting
+            if not candidates:
+                return {}
+        scores = {}
+        for name in candidates:
+            score = fuzzy_score(query, self._lower[name])
+            if score is not None:
+                scores[name] = score
+        return scores
+
+
+_SEPARATORS = '_-. '
+
+
+def fuzzy_score(query, text):
+    """Score `text` against `query` (both lowercase), None if the characters
+    of `query` don't all appear in `text` in order.
+
+    Each matched character scores a point, with bonuses for runs of
+    consecutive matches and for matches at the start of a word, so for
+    "sh045" the name "SQ010_SH0450_CAM" ranks above "SQ010_SH0045_CAM".
+    Skipped characters between matches cost a little, so tighter matches win
+    among otherwise equal candidates.
+    """
+    score = 0
+    pos = 0
+    prev = -2
+    for char in query:
+        found = text.find(char, pos)
+        if found == -1:
+            return None
+        score += 1
+        if found == prev + 1:
+            score += 3
+        if found == 0 or text[found - 1] in _SEPARATORS:
+            score += 2
+        if prev >= 0:
+            score -= min(found - prev - 1, 3) * 0.5
+        prev = found
+        pos = found + 1
+    return score
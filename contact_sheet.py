@@ -0,0 +1,208 @@
+import math
+import os
+import struct
+import zlib
+
+import bpy
+import numpy as np
+
+CONTACT_SHEET_NAME = "scm_contact_sheet.png"
+
+# 3x5 pixel glyphs, top row first. Labels are drawn upper case, other
+# characters as '?'.
+_FONT = {
+    'A': "010 101 111 101 101", 'B': "110 101 110 101 110", 'C': "011 100 100 100 011",
+    'D': "110 101 101 101 110", 'E': "111 100 110 100 111", 'F': "111 100 110 100 100",
+    'G': "011 100 101 101 011", 'H': "101 101 111 101 101", 'I': "111 010 010 010 111",
+    'J': "001 001 001 101 010", 'K': "101 101 110 101 101", 'L': "100 100 100 100 111",
+    'M': "101 111 111 101 101", 'N': "110 101 101 101 101", 'O': "010 101 101 101 010",
+    'P': "110 101 110 100 100", 'Q': "010 101 101 110 011", 'R': "110 101 110 101 101",
+    'S': "011 100 010 001 110", 'T': "111 010 010 010 010", 'U': "101 101 101 101 111",
+    'V': "101 101 101 101 010", 'W': "101 101 111 111 101", 'X': "101 101 010 101 101",
+    'Y': "101 101 010 010 010", 'Z': "111 001 010 100 111",
+    '0': "111 101 101 101 111", '1': "010 110 010 010 111", '2': "110 001 010 100 111",
+    '3': "110 001 010 001 110", '4': "101 101 111 001 001", '5': "111 100 110 001 110",
+    '6': "011 100 111 101 111", '7': "111 001 010 010 010", '8': "111 101 111 101 111",
+    '9': "111 101 111 001 110",
+    '-': "000 000 111 000 000", '_': "000 000 000 000 111", '.': "000 000 000 000 010",
+    ' ': "000 000 000 000 000", '?': "110 001 010 000 010",
+}
+
+_GLYPH_WIDTH = 3
+_GLYPH_HEIGHT = 5
+_BACKGROUND = (40, 40, 40)
+_LABEL_COLOR = (230, 230, 230)
+
+
+def _glyph(char):
+    """Bool mask of char, bottom row first like Image.pixels."""
+    rows = _FONT.get(char.upper(), _FONT['?']).split()
+    return np.array([[bit == '1' for bit in row] for row in reversed(rows)], dtype=bool)
+
+
+def downscale(pixels, width, height):
+    """
+    Shrink an image to fit width x height by averaging square blocks of pixels.
+    :param pixels: (h, w, 4) float array
+    :return: float array of at most (height, width, 4); the block size is a whole
+        number, so the result may be smaller than the box
+    """
+    h, w = pixels.shape[:2]
+    block = max(1, math.ceil(w / width), math.ceil(h / height))
+    h, w = h // block * block, w // block * block
+    if h == 0 or w == 0:
+        return pixels[:min(h, height), :min(w, width)]
+    return pixels[:h, :w].reshape(h // block, block, w // block, block, -1).mean(axis=(1, 3))
+
+
+def _linear_to_srgb(rgb):
+    rgb = np.clip(rgb, 0.0, 1.0)
+    return np.where(rgb <= 0.0031308, rgb * 12.92, 1.055 * rgb ** (1.0 / 2.4) - 0.055)
+
+
+class ContactSheet:
+    """Overview image of up to `count` renders with their names underneath.
+
+    Renders are added one at a time: each is loaded, read into one reused
+    float buffer with foreach_get, averaged down to its tile and freed again,
+    so memory holds a single full-size render next to the 8 bit sheet. Float
+    renders are averaged in linear space and only their tile is converted
+    to sRGB.
+    """
+
+    def __init__(self, count, tile_width=256, aspect=9 / 16, columns=0, label_scale=2):
+        """
+        :param aspect: height / width of the tiles; renders of another aspect are fitted into them
+        :param columns: tiles per row, 0 for a roughly square sheet
+        """
+        self.columns = columns or max(1, math.ceil(math.sqrt(count)))
+        self.rows = max(1, math.ceil(count / self.columns))
+        self.tile_width = tile_width
+        self.tile_height = max(1, round(tile_width * aspect))
+        self.label_scale = label_scale
+        self.padding = 2 * label_scale
+        self.label_height = _GLYPH_HEIGHT * label_scale + 2 * self.padding
+        self.cell_width = tile_width + 2 * self.padding
+        self.cell_height = self.tile_height + self.label_height + self.padding
+        self.pixels = np.empty((self.rows * self.cell_height, self.columns * self.cell_width, 4), dtype=np.uint8)
+        self.pixels[...] = (*_BACKGROUND, 255)
+        self.count = 0
+        self._buffer = np.empty(0, dtype=np.float32)
+
+    def _read(self, path):
+        """
+        :return: ((h, w, 4) float pixels of the image at path, True if they are linear
+            rather than display space), None if it can't be read
+        """
+        try:
+            image = bpy.data.images.load(path, check_existing=False)
+        except RuntimeError as e:
+            print(f"Contact sheet: could not load {path}: {e}")
+            return None
+        try:
+            width, height = image.size
+            channels = image.channels
+            size = width * height * channels
+            if size == 0:
+                return None
+            if self._buffer.size < size:
+                self._buffer = np.empty(size, dtype=np.float32)
+            buffer = self._buffer[:size]
+            image.pixels.foreach_get(buffer)
+            pixels = buffer.reshape(height, width, channels)
+            if channels < 3:
+                pixels = np.repeat(pixels[..., :1], 3, axis=2)
+            if pixels.shape[2] == 3:
+                pixels = np.concatenate((pixels, np.ones((height, width, 1), dtype=np.float32)), axis=2)
+            return pixels, image.is_float
+        finally:
+            bpy.data.images.remove(image)
+
+    def _cell_origin(self, index):
+        """Bottom left pixel of cell index, counted row by row from the top left."""
+        row, column = divmod(index, self.columns)
+        return column * self.cell_width, (self.rows - 1 - row) * self.cell_height
+
+    def add(self, label, path):
+        """
+        Tile the render at path into the next cell, labeled. A render that can't
+        be read leaves its cell empty, still labeled.
+        :return: True if the render was tiled
+        """
+        if self.count >= self.rows * self.columns:
+            return False
+        x, y = self._cell_origin(self.count)
+        self.count += 1
+        self._draw_label(x + self.padding, y + self.padding, label)
+
+        read = self._read(path) if path and os.path.exists(path) else None
+        if read is None:
+            return False
+        pixels, linear = read
+        tile = downscale(pixels, self.tile_width, self.tile_height)
+        if linear:
+            tile = np.concatenate((_linear_to_srgb(tile[..., :3]), tile[..., 3:]), axis=2)
+        alpha = np.clip(tile[..., 3:], 0.0, 1.0)
+        background = np.array(_BACKGROUND, dtype=np.float32) / 255.0
+        rgb = np.clip(tile[..., :3], 0.0, 1.0) * alpha + background * (1.0 - alpha)
+        h, w = tile.shape[:2]
+        left = x + self.padding + (self.tile_width - w) // 2
+        bottom = y + self.label_height + (self.tile_height - h) // 2
+        self.pixels[bottom:bottom + h, left:left + w, :3] = (rgb * 255.0 + 0.5).astype(np.uint8)
+        return True
+
+    def _draw_label(self, x, y, text):
+        scale = self.label_scale
+        advance = (_GLYPH_WIDTH + 1) * scale
+        text = text[:max(0, (self.cell_width - 2 * self.padding + scale) // advance)]
+        color = np.array(_LABEL_COLOR, dtype=np.uint8)
+        for i, char in enumerate(text):
+            mask = np.kron(_glyph(char), np.ones((scale, scale), dtype=bool))
+            left = x + i * advance
+            region = self.pixels[y:y + mask.shape[0], left:left + mask.shape[1], :3]
+            region[mask] = color
+
+    def save(self, path):
+        """Write the sheet as a PNG."""
+        write_png(path, self.pixels)
+
+
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+
+
+def write_png(path, pixels):
+    """
+    Write 8 bit pixels as an RGBA PNG, compressing row by row instead of
+    going through a float copy of the image for Blender's image API.
+    :param pixels: (h, w, 4) uint8 array, bottom row first like Image.pixels
+    """
+    height, width = pixels.shape[:2]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    compressor = zlib.compressobj(6)
+    data = []
+    for row in pixels[::-1]:
+        # Filter type 0 (none) in front of every row.
+        data.append(compressor.compress(b"\x00" + row.tobytes()))
+    data.append(compressor.flush())
+    with open(path, 'wb') as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)))
+        f.write(_png_chunk(b"IDAT", b"".join(data)))
+        f.write(_png_chunk(b"IEND", b""))
+
+
+def build_contact_sheet(entries, path, tile_width=256, aspect=9 / 16, columns=0):
+    """
+    Write a contact sheet of renders.
+    :param entries: (label, image path) in sheet order
+    :return: number of renders tiled
+    """
+    sheet = ContactSheet(len(entries), tile_width, aspect, columns)
+    tiled = 0
+    for i, (label, image_path) in enumerate(entries):
+        tiled += sheet.add(label, image_path)
+        if (i + 1) % 50 == 0:
+            print(f"Contact sheet: {i + 1} of {len(entries)}")
+    sheet.save(path)
+    return tiled
@@ -314,6 +314,27 @@ def draw_camera_settings(context, layout, cam_obj, use_subpanel=False):
             row = col.row(align=True)
             row.label(text="Camera has no Background Images", icon='INFO')
 
+    def draw_batch_render_settings(layout):
+        col = layout.column(align=True)
+        col.prop(cam, "use_frame_range")
+        row = col.row(align=True)
+        row.active = cam.use_frame_range
+        row.prop(cam, "frame_start", text="Start")
+        row.prop(cam, "frame_end", text="End")
+
+        col = layout.column(align=True)
+        row = col.row(align=True)
+        row.prop(cam, "draft_resolution_percentage", text="Draft")
+        row.prop(cam, "draft_samples", text="Samples")
+        col.prop(cam, "draft_approved")
+
+        col = layout.column(align=True)
+        col.prop(cam, "use_subject_border")
+        row = col.row(align=True)
+        row.active = cam.use_subject_border
+        row.prop(cam, "subject_collection", text="")
+        row.prop(cam, "subject_padding")
+
     # Conditionally use subpanels or direct layout
     if use_subpanel:
         header, body = layout.panel(idname="FOCUS_PANEL", default_closed=True)
@@ -330,6 +351,11 @@ def draw_camera_settings(context, layout, cam_obj, use_subpanel=False):
         header.label(text="Background Image:")
         if body:
             draw_background_image_settings(body)
+
+        header, body = layout.panel(idname="CAMERA_BATCH_RENDER", default_closed=True)
+        header.label(text="Batch Render:")
+        if body:
+            draw_batch_render_settings(body)
     else:
         draw_focus_settings(layout)
         draw_lighting_settings(layout)
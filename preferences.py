@@ -254,6 +254,25 @@ class CamManagerAddonPreferences(bpy.types.AddonPreferences):
         default=False,
         update=update_auto_cycle_render_slot)
 
+    cycle_order: bpy.props.EnumProperty(
+        name="Cycle Order",
+        description="Order used by Next/Previous Camera",
+        items=(
+            ('NAME', "Alphabetical", "Cycle through the cameras alphabetically"),
+            ('LIST', "Camera List", "Follow the sorting and filter of the camera list"),
+        ),
+        default='NAME')
+
+    view_target: bpy.props.EnumProperty(
+        name="Look Through",
+        description="3D viewports that look through a camera when switching to it",
+        items=(
+            ('FIRST', "First 3D Viewport", "The first 3D viewport found in any workspace"),
+            ('VISIBLE', "Visible 3D Viewports", "Every 3D viewport shown in an open window"),
+            ('HOVERED', "3D Viewport Under Mouse", "The 3D viewport under the mouse, the first 3D viewport otherwise"),
+        ),
+        default='FIRST')
+
     def keymap_ui(self, layout, title, property_prefix):
         box = layout.box()
         split = box.split(align=True, factor=0.5)
@@ -321,6 +340,11 @@ class CamManagerAddonPreferences(bpy.types.AddonPreferences):
             if version_check.update_available:
                 box.label(text=f"Update available: v{version_check.latest_version_str}", icon='WARNING_LARGE')
 
+            box = layout.box()
+            box.label(text="Cameras")
+            box.prop(self, 'cycle_order')
+            box.prop(self, 'view_target')
+
             box = layout.box()
             box.label(text="Rendering")
             box.prop(self, 'auto_cycle_render_slot')
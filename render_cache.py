@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+
+import bpy
+
+MANIFEST_NAME = ".scm_render_cache.json"
+
+
+def output_folder(scene, output_dir=None):
+    """Absolute folder a batch render of scene writes into."""
+    return os.path.abspath(output_dir or os.path.dirname(bpy.path.abspath(scene.render.filepath)))
+
+
+def output_file(scene, camera, output_dir=None):
+    """
+    Absolute path of the image a batch render of camera writes, the way
+    switch_camera() names it: <output_dir>/<camera name> if output_dir is
+    given, the camera name in the output folder with 'Use Camera Name as File
+    Name', the output path otherwise.
+    """
+    render = scene.render
+    if output_dir:
+        filepath = os.path.join(output_dir, camera.name)
+    elif scene.output_use_cam_name:
+        filepath = os.path.join(os.path.split(render.filepath)[0], camera.name)
+    else:
+        filepath = render.filepath
+
+    # frame_path() adds frame numbers and the file extension the way the
+    # render does, but only for the current output path.
+    original = render.filepath
+    try:
+        render.filepath = filepath
+        return render.frame_path(frame=scene.frame_current)
+    finally:
+        render.filepath = original
+
+
+def _camera_state(scene, camera):
+    """Everything about a camera and the scene settings switch_camera() applies
+    for it that changes its render."""
+    data = camera.data
+    render = scene.render
+    dof = data.dof
+    if data.resolution_overwrite:
+        resolution = tuple(data.resolution)
+    elif scene.camera is not None and scene.camera.data.resolution_overwrite:
+        resolution = (scene.cam_manager_base_res_x, scene.cam_manager_base_res_y)
+    else:
+        resolution = (render.resolution_x, render.resolution_y)
+    world = data.world or scene.world
+    stereo = data.stereo
+    return (
+        [tuple(row) for row in camera.matrix_world],
+        data.type, data.lens, data.ortho_scale, data.sensor_fit, data.sensor_width, data.sensor_height,
+        data.shift_x, data.shift_y, data.clip_start, data.clip_end,
+        dof.use_dof, dof.focus_object.name if dof.focus_object else None, dof.focus_distance,
+        dof.aperture_fstop, dof.aperture_blades, dof.aperture_rotation, dof.aperture_ratio,
+        resolution, render.resolution_percentage, render.pixel_aspect_x, render.pixel_aspect_y,
+        render.engine, data.exposure, world.name if world else None,
+        data.use_subject_border, data.subject_padding,
+        data.subject_collection.name if data.subject_collection else None,
+        data.panorama_type, data.fisheye_fov, data.fisheye_lens,
+        data.latitude_min, data.latitude_max, data.longitude_min, data.longitude_max,
+        data.fisheye_polynomial_k0, data.fisheye_polynomial_k1, data.fisheye_polynomial_k2,
+        data.fisheye_polynomial_k3, data.fisheye_polynomial_k4,
+        render.use_multiview, render.views_format,
+        stereo.convergence_mode, stereo.convergence_distance, stereo.interocular_distance, stereo.pivot,
+        stereo.use_spherical_stereo, stereo.use_pole_merge, stereo.pole_merge_angle_from,
+        stereo.pole_merge_angle_to,
+    )
+
+
+def _file_state():
+    """Modification time of the saved .blend, None for an unsaved file."""
+    try:
+        return os.stat(bpy.data.filepath).st_mtime_ns if bpy.data.filepath else None
+    except OSError:
+        return None
+
+
+def camera_fingerprint(scene, camera, output, scope='FILE'):
+    """
+    Hash of what a batch render of camera depends on.
+    :param output: output file path, part of the hash
+    :param scope: 'FILE' also hashes the .blend's modification time, so that saving the file
+        re-renders every camera; 'CAMERA' hashes the camera and its render settings only and
+        misses edits to the scene's objects, materials and lights
+    :return: hex digest
+    """
+    state = (_camera_state(scene, camera), output, _file_state() if scope == 'FILE' else None)
+    return hashlib.sha1(repr(state).encode('utf-8')).hexdigest()
+
+
+def render_fingerprint(scene, camera):
+    """Hash of the camera and render settings alone: cameras with the same one render the same image."""
+    return hashlib.sha1(repr(_camera_state(scene, camera)).encode('utf-8')).hexdigest()
+
+
+class RenderManifest:
+    """Fingerprints and output files of the cameras rendered into a folder.
+
+    Stored as MANIFEST_NAME in the output folder. A camera is up to date when
+    its fingerprint is the recorded one and its output file still has the
+    recorded size and modification time.
+    """
+
+    def __init__(self, directory):
+        self.path = os.path.join(directory, MANIFEST_NAME)
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f).get('cameras', {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    @staticmethod
+    def _stat(output):
+        try:
+            stat = os.stat(output)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def up_to_date(self, name, fingerprint, output):
+        entry = self.entries.get(name)
+        return (entry is not None
+                and entry['fingerprint'] == fingerprint
+                and entry['output'] == output
+                and entry['stat'] == self._stat(output))
+
+    def record(self, name, fingerprint, output):
+        """Record a finished render. Ignored if its output file doesn't exist."""
+        stat = self._stat(output)
+        if stat is None:
+            self.entries.pop(name, None)
+            return
+        self.entries[name] = {'fingerprint': fingerprint, 'output': output, 'stat': stat}
+
+    def forget(self, name):
+        self.entries.pop(name, None)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'cameras': self.entries}, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+
+class RenderCache:
+    """The cameras of one batch, checked against the manifest of its output folder.
+
+    With 'FILE' scope the file's modification time stands for everything
+    outside the camera, which says nothing about unsaved changes: while the
+    file is dirty no camera counts as up to date and renders aren't recorded.
+    """
+
+    def __init__(self, scene, cameras, scope='FILE', output_dir=None):
+        self.manifest = RenderManifest(output_folder(scene, output_dir))
+        self.pending = []
+        self.skipped = []
+        self.unsaved = scope == 'FILE' and bpy.data.is_dirty
+        self._fingerprints = {}
+        for camera in cameras:
+            output = output_file(scene, camera, output_dir)
+            fingerprint = camera_fingerprint(scene, camera, output, scope)
+            self._fingerprints[camera.name] = (fingerprint, output)
+            if not self.unsaved and self.manifest.up_to_date(camera.name, fingerprint, output):
+                self.skipped.append(camera.name)
+            else:
+                self.pending.append(camera)
+
+    def record(self, results):
+        """Record rendered cameras, given as (camera name, True if rendered), and save the manifest."""
+        for name, ok in results:
+            if not ok or name not in self._fingerprints:
+                continue
+            if self.unsaved:
+                # Rendered from unsaved changes, up to date with no saved state of the file.
+                self.manifest.forget(name)
+            else:
+                self.manifest.record(name, *self._fingerprints[name])
+        try:
+            self.manifest.save()
+        except OSError as e:
+            print(f"Could not write render cache manifest {self.manifest.path}: {e}")
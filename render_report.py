@@ -0,0 +1,261 @@
+import csv
+import json
+import os
+import re
+import time
+
+import bpy
+
+REPORT_NAME = "scm_render_report"
+HISTORY_NAME = ".scm_render_history.json"
+
+# Render times kept per camera in the history, the estimate is their mean.
+HISTORY_LENGTH = 5
+
+FIELDS = ('camera', 'rendered', 'wall_time', 'first_stats_time', 'peak_memory', 'file_size')
+
+# Rows of the last batch render's report in this session, for the panel.
+last_report = []
+
+_PEAK_MEMORY = re.compile(r'Peak[:\s]*([\d.]+)\s*([KMG])', re.IGNORECASE)
+_MEMORY_UNITS = {'K': 1.0 / 1024.0, 'M': 1.0, 'G': 1024.0}
+
+
+def parse_peak_memory(stats):
+    """Peak memory in MiB from a render stats string such as
+    'Fra:1 | Mem:85.21M, Peak:112.40M | ...', None if it has none."""
+    match = _PEAK_MEMORY.search(stats)
+    if match is None:
+        return None
+    return float(match.group(1)) * _MEMORY_UNITS[match.group(2).upper()]
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path) if path else None
+    except OSError:
+        return None
+
+
+class RenderMetrics:
+    """Timing and memory of each camera of a batch render.
+
+    The batch runners call start() and finish() around each camera; while
+    listening, a render_stats handler times the first stats update of the
+    render (scene sync done, first samples coming in) and keeps the highest
+    peak memory reported.
+    """
+
+    def __init__(self):
+        self.records = {}
+        self._current = None
+        self._started = 0.0
+
+    def start(self, name):
+        self._current = {'camera': name, 'rendered': False, 'wall_time': None,
+                         'first_stats_time': None, 'peak_memory': None, 'file_size': None}
+        self.records[name] = self._current
+        self._started = time.perf_counter()
+
+    def stats(self, text):
+        record = self._current
+        if record is None:
+            return
+        if record['first_stats_time'] is None:
+            record['first_stats_time'] = time.perf_counter() - self._started
+        peak = parse_peak_memory(text)
+        if peak is not None and (record['peak_memory'] is None or peak > record['peak_memory']):
+            record['peak_memory'] = peak
+
+    def finish(self, ok, output=None):
+        """End the current camera's record.
+        :param output: path of the image it wrote, for the file size
+        """
+        record = self._current
+        if record is None:
+            return
+        record['rendered'] = ok
+        record['wall_time'] = time.perf_counter() - self._started
+        record['file_size'] = _file_size(output) if ok else None
+        self._current = None
+
+    def rows(self):
+        return list(self.records.values())
+
+    def listen(self):
+        global _listening
+        _listening = self
+        if _on_render_stats not in bpy.app.handlers.render_stats:
+            bpy.app.handlers.render_stats.append(_on_render_stats)
+
+    def stop_listening(self):
+        global _listening
+        if _listening is self:
+            _listening = None
+        if _on_render_stats in bpy.app.handlers.render_stats:
+            bpy.app.handlers.render_stats.remove(_on_render_stats)
+
+
+# The RenderMetrics render_stats updates go to.
+_listening = None
+
+
+def _on_render_stats(stats, *_args):
+    if _listening is not None:
+        _listening.stats(stats)
+
+
+def write_report(path, rows, fields=FIELDS):
+    """Write report rows to path, as CSV if it ends in .csv and as JSON otherwise.
+    :param fields: CSV columns
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.lower().endswith('.csv'):
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, 'w') as f:
+            json.dump({'cameras': rows}, f, indent=1)
+
+
+def read_report(path):
+    """Rows of a JSON report written by write_report(), empty if there is none."""
+    try:
+        with open(path) as f:
+            return [row for row in json.load(f)['cameras'] if 'camera' in row]
+    except (OSError, ValueError, KeyError, TypeError):
+        return []
+
+
+def save_report(directory, rows, file_format='JSON', animation=False):
+    """Write the batch report into the output folder, add its render times to
+    the folder's render history and keep its rows for the panel.
+    :param animation: the rows are animation renders, which are timed apart from stills
+    :return: path of the report, None if it couldn't be written
+    """
+    global last_report
+    last_report = rows
+    history = RenderHistory(directory)
+    history.record(rows, animation)
+    try:
+        history.save()
+    except OSError as e:
+        print(f"Could not write render history {history.path}: {e}")
+    path = os.path.join(directory, f"{REPORT_NAME}.{file_format.lower()}")
+    try:
+        write_report(path, rows)
+    except OSError as e:
+        print(f"Could not write render report {path}: {e}")
+        return None
+    return path
+
+
+class RenderHistory:
+    """The last HISTORY_LENGTH render times of each camera batch rendered into a folder.
+
+    Stored as HISTORY_NAME in the output folder, with still and animation
+    renders kept apart. The batch queue orders cameras and packs them onto
+    parallel workers by the estimates.
+    """
+
+    def __init__(self, directory):
+        self.path = os.path.join(directory, HISTORY_NAME)
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            self.entries = {'still': data.get('still', {}), 'animation': data.get('animation', {})}
+        except (OSError, ValueError, AttributeError):
+            self.entries = {'still': {}, 'animation': {}}
+
+    def _times(self, animation):
+        return self.entries['animation' if animation else 'still']
+
+    def record(self, rows, animation=False):
+        """Add the wall times of the rendered cameras of report rows."""
+        times = self._times(animation)
+        for row in rows:
+            if row['rendered'] and row['wall_time'] is not None:
+                recent = times.setdefault(row['camera'], [])
+                recent.append(row['wall_time'])
+                del recent[:-HISTORY_LENGTH]
+
+    def estimate(self, name, animation=False):
+        """Mean of camera name's recorded render times in seconds, None if it has none."""
+        recent = self._times(animation).get(name)
+        return sum(recent) / len(recent) if recent else None
+
+    def estimates(self, names, animation=False):
+        """
+        :return: (camera name -> estimated seconds, number of cameras with recorded times).
+            Cameras without recorded times are estimated at the mean of the others, 0 if none has any
+        """
+        known = {name: self.estimate(name, animation) for name in names}
+        known = {name: time for name, time in known.items() if time is not None}
+        default = sum(known.values()) / len(known) if known else 0.0
+        return {name: known.get(name, default) for name in names}, len(known)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+
+# (path, modification time, RenderHistory) of the history cached_history() read last.
+_cached_history = (None, None, None)
+
+
+def cached_history(directory):
+    """RenderHistory of directory, read again only once its file changed. For drawing."""
+    global _cached_history
+    path = os.path.join(directory, HISTORY_NAME)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+    if _cached_history[:2] != (path, mtime):
+        _cached_history = (path, mtime, RenderHistory(directory))
+    return _cached_history[2]
+
+
+def format_duration(seconds):
+    """'1h 02m', '3m 20s' or '12.5 s'."""
+    if seconds >= 3600:
+        return f"{int(seconds // 3600)}h {int(seconds % 3600 // 60):02d}m"
+    if seconds >= 60:
+        return f"{int(seconds // 60)}m {int(seconds % 60):02d}s"
+    return f"{seconds:.1f} s"
+
+
+def summary(rows):
+    """Total wall time and the number of rendered cameras of report rows."""
+    return (sum(row['wall_time'] or 0.0 for row in rows),
+            sum(1 for row in rows if row['rendered']))
+
+
+def draw_report(layout, rows, limit=10):
+    """Table of the slowest cameras of report rows."""
+    total, rendered = summary(rows)
+    layout.label(text=f"{rendered} of {len(rows)} cameras rendered in {total:.1f} s")
+    if not rows:
+        return
+    col = layout.column(align=True)
+    header = col.row(align=True)
+    for text in ("Camera", "Time", "Sync", "Peak", "Size"):
+        header.label(text=text)
+    slowest = sorted(rows, key=lambda row: row['wall_time'] or 0.0, reverse=True)
+    for row in slowest[:limit]:
+        line = col.row(align=True)
+        line.alert = not row['rendered']
+        line.label(text=row['camera'])
+        line.label(text=_format(row['wall_time'], "{:.1f} s"))
+        line.label(text=_format(row['first_stats_time'], "{:.1f} s"))
+        line.label(text=_format(row['peak_memory'], "{:.0f} M"))
+        line.label(text=_format(row['file_size'] and row['file_size'] / 1024.0, "{:.0f} K"))
+
+
+def _format(value, fmt):
+    return "-" if value is None else fmt.format(value)
@@ -0,0 +1,273 @@
+import time
+
+import bpy
+
+from bpy.app.handlers import persistent
+
+
+def get_render_slots():
+    """Render slots of the 'Render Result' image, or None before the first
+    render of the session created it."""
+    render_result = bpy.data.images.get('Render Result')
+    if render_result is None:
+        return None
+    return render_result.render_slots
+
+
+def ensure_render_slots(count):
+    """Grow Render Result to at least `count` slots in one go.
+    :return: the number of slots available afterwards, 0 without Render Result
+    """
+    slots = get_render_slots()
+    if slots is None:
+        return 0
+    for _ in range(count - len(slots)):
+        slots.new()
+    return len(slots)
+
+
+def _remove_last_render_slot(render_result):
+    slots = render_result.render_slots
+    if hasattr(slots, 'remove'):
+        slots.remove(slots[-1])
+        return
+    # Older API without RenderSlots.remove(): the image operator removes the
+    # active slot of the image in context.
+    slots.active_index = len(slots) - 1
+    with bpy.context.temp_override(edit_image=render_result):
+        bpy.ops.image.remove_render_slot()
+
+
+def shrink_render_slots(count):
+    """Remove trailing Render Result slots until only `count` are left.
+    :return: the number of slots left
+    """
+    render_result = bpy.data.images.get('Render Result')
+    if render_result is None:
+        return 0
+    slots = render_result.render_slots
+    while len(slots) > max(count, 1):
+        before = len(slots)
+        _remove_last_render_slot(render_result)
+        if len(slots) == before:
+            break
+    return len(slots)
+
+
+# How long a slot handed out by allocate() stays reserved if no camera is
+# assigned to it, e.g. because the operator that asked for it failed.
+_RESERVATION_SECONDS = 10.0
+
+
+class RenderSlotAllocator:
+    """Render slot usage of all cameras, kept as a bitmap.
+
+    Bit n-1 of `_bits` is set while slot n is used by at least one camera or
+    reserved by allocate(), so the lowest free slot is a couple of integer
+    operations instead of a walk over the cameras. Cameras may share a slot,
+    `_counts` holds how many use each one. Slot changes are fed in by
+    Camera.slot's update callback, camera data created without it is added as
+    the depsgraph reports it, see _on_depsgraph_update(). Deletions aren't
+    reported, so allocate() compares the slots it knows with bpy.data.cameras
+    and rebuilds if anything differs. Reservations nobody assigned a camera
+    to expire after _RESERVATION_SECONDS.
+    """
+
+    def __init__(self):
+        self._bits = 0
+        self._counts = {}
+        self._slot_of = {}
+        self._reserved = {}
+        self._valid = False
+
+    def invalidate(self):
+        self._valid = False
+
+    def rebuild(self, slots=None):
+        """
+        :param slots: camera data pointer -> slot of all camera data, read from bpy.data.cameras if not given
+        """
+        if slots is None:
+            slots = {cam.as_pointer(): cam.slot for cam in bpy.data.cameras}
+        self._bits = 0
+        self._counts = {}
+        self._slot_of = {}
+        for key, slot in slots.items():
+            self._add(key, slot)
+        for slot in self._reserved:
+            self._bits |= 1 << (slot - 1)
+        self._valid = True
+
+    def _expire_reservations(self, now):
+        for slot in [slot for slot, deadline in self._reserved.items() if deadline <= now]:
+            del self._reserved[slot]
+            if slot not in self._counts:
+                self._bits &= ~(1 << (slot - 1))
+
+    def _ensure(self):
+        self._expire_reservations(time.monotonic())
+        slots = {cam.as_pointer(): cam.slot for cam in bpy.data.cameras}
+        if not self._valid or slots != self._slot_of:
+            self.rebuild(slots)
+
+    def track(self, camera_data):
+        """Record the slot of camera_data if it isn't known yet. Constant time."""
+        if self._valid and camera_data.as_pointer() not in self._slot_of:
+            self._add(camera_data.as_pointer(), camera_data.slot)
+
+    def _add(self, key, slot):
+        self._slot_of[key] = slot
+        self._reserved.pop(slot, None)
+        self._counts[slot] = self._counts.get(slot, 0) + 1
+        self._bits |= 1 << (slot - 1)
+
+    def release(self, camera_data):
+        """Forget the slot used by camera_data."""
+        slot = self._slot_of.pop(camera_data.as_pointer(), None)
+        if slot is None:
+            return
+        count = self._counts[slot] - 1
+        if count:
+            self._counts[slot] = count
+            return
+        del self._counts[slot]
+        if slot not in self._reserved:
+            self._bits &= ~(1 << (slot - 1))
+
+    def assign(self, camera_data, slot):
+        """Record that camera_data now uses `slot`."""
+        if not self._valid:
+            return
+        self.release(camera_data)
+        self._add(camera_data.as_pointer(), slot)
+
+    def _take_lowest_free(self):
+        # (bits + 1) & ~bits isolates the lowest zero bit of bits.
+        slot = ((self._bits + 1) & ~self._bits).bit_length()
+        self._bits |= 1 << (slot - 1)
+        self._reserved[slot] = time.monotonic() + _RESERVATION_SECONDS
+        return slot
+
+    def allocate(self, count=1):
+        """Reserve the `count` lowest free slots and make sure Render Result
+        has that many, growing it once rather than slot by slot. A slot
+        stays reserved until a camera is assigned to it, or for
+        _RESERVATION_SECONDS.
+        :return: list of slot numbers
+        """
+        self._ensure()
+        slots = [self._take_lowest_free() for _ in range(count)]
+        if slots:
+            ensure_render_slots(max(slots))
+        return slots
+
+
+allocator = RenderSlotAllocator()
+
+
+def assign_distinct_slots(cameras):
+    """
+    Give camera objects that share a render slot with an earlier one of
+    cameras a free slot of their own, so that rendering them one after
+    another into their slots keeps every image, and grow Render Result to the
+    highest slot. Objects sharing one camera datablock keep sharing its slot.
+    :return: names of the cameras whose slot changed
+    """
+    seen = {}
+    clashing = {}
+    for obj in cameras:
+        data = obj.data
+        if seen.setdefault(data.slot, data) != data:
+            clashing.setdefault(data.as_pointer(), []).append(obj)
+    changed = []
+    for objects, slot in zip(clashing.values(), allocator.allocate(len(clashing))):
+        objects[0].data.slot = slot
+        changed.extend(obj.name for obj in objects)
+    if cameras:
+        ensure_render_slots(max(obj.data.slot for obj in cameras))
+    return changed
+
+
+@persistent
+def _on_file_change(*_args):
+    allocator.invalidate()
+
+
+class CAM_MANAGER_OT_compact_render_slots(bpy.types.Operator):
+    """Renumber the render slots of all cameras densely and remove unused Render Result slots"""
+    bl_idname = "cam_manager.compact_render_slots"
+    bl_label = "Compact Render Slots"
+    bl_description = "Renumber camera render slots to 1, 2, 3... without gaps and remove the unused render slots"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        used = sorted({cam.slot for cam in bpy.data.cameras})
+        renumber = {old: new for new, old in enumerate(used, start=1)}
+
+        changed = 0
+        for cam in bpy.data.cameras:
+            new_slot = renumber[cam.slot]
+            if cam.slot != new_slot:
+                cam.slot = new_slot
+                changed += 1
+        allocator.invalidate()
+
+        try:
+            remaining = shrink_render_slots(len(used))
+        except RuntimeError as e:
+            self.report({'WARNING'}, f"Slots renumbered, but unused render slots could not be removed: {e}")
+            return {'FINISHED'}
+
+        self.report({'INFO'}, f"Renumbered {changed} cameras, {remaining} render slots left")
+        return {'FINISHED'}
+
+
+classes = (
+    CAM_MANAGER_OT_compact_render_slots,
+)
+
+
+@persistent
+def _on_depsgraph_update(scene, depsgraph):
+    """Pick up camera data added without the slot update callback."""
+    if not (depsgraph.id_type_updated('CAMERA') or depsgraph.id_type_updated('OBJECT')):
+        return
+    for update in depsgraph.updates:
+        id_data = update.id.original
+        if isinstance(id_data, bpy.types.Object):
+            id_data = id_data.data
+        if isinstance(id_data, bpy.types.Camera):
+            allocator.track(id_data)
+
+
+_handlers = (
+    (bpy.app.handlers.depsgraph_update_post, _on_depsgraph_update),
+    (bpy.app.handlers.load_post, _on_file_change),
+    (bpy.app.handlers.undo_post, _on_file_change),
+    (bpy.app.handlers.redo_post, _on_file_change),
+)
+
+
+def register():
+    from bpy.utils import register_class
+
+    for cls in classes:
+        register_class(cls)
+
+    for handlers, func in _handlers:
+        if func not in handlers:
+            handlers.append(func)
+
+
+def unregister():
+    for handlers, func in _handlers:
+        if func in handlers:
+            handlers.remove(func)
+
+    allocator.invalidate()
+
+    from bpy.utils import unregister_class
+
+    for cls in reversed(classes):
+        if hasattr(cls, 'bl_rna'):
+            unregister_class(cls)
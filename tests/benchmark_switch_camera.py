@@ -0,0 +1,81 @@
+"""
+Benchmark for cam_manager.change_scene_camera's list-index lookup.
+
+Switching cameras used to run `list(scene.objects).index(camera)` to set
+scene.camera_list_index, so every switch cost O(scene objects). It now
+reads the camera registry's name->index map. This script times both
+lookups, and the full operator, in a scene padded with empty objects, so
+the difference between a small and a huge scene is visible.
+
+Not part of the test suite (run_tests.py only picks up test_*.py). Run with::
+
+    blender --background --factory-startup --python tests/benchmark_switch_camera.py -- 50 500000
+"""
+
+import os
+import sys
+import time
+
+_ADDON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_ADDON_SOURCE = os.path.dirname(_ADDON_ROOT)
+_ADDON_NAME = os.path.basename(_ADDON_ROOT)
+
+if _ADDON_SOURCE not in sys.path:
+    sys.path.insert(0, _ADDON_SOURCE)
+
+import addon_utils  # noqa: E402
+import bpy  # noqa: E402
+
+addon_utils.enable(_ADDON_NAME, default_set=True)
+
+import simple_camera_manager as _addon  # noqa: E402
+
+_CAMERAS = 20
+_SWITCHES = 200
+
+
+def _populate(scene, object_count):
+    """Fill a fresh scene with `object_count` objects, _CAMERAS of them cameras."""
+    collection = scene.collection
+    for i in range(object_count - _CAMERAS):
+        collection.objects.link(bpy.data.objects.new(f"Empty.{i:06d}", None))
+    cameras = []
+    for i in range(_CAMERAS):
+        obj = bpy.data.objects.new(f"BenchCam.{i:03d}", bpy.data.cameras.new(f"BenchCam.{i:03d}"))
+        collection.objects.link(obj)
+        cameras.append(obj)
+    scene.view_layers[0].update()
+    return cameras
+
+
+def _time(label, func, cameras):
+    start = time.perf_counter()
+    for i in range(_SWITCHES):
+        func(cameras[i % len(cameras)])
+    elapsed = (time.perf_counter() - start) / _SWITCHES
+    print(f"    {label:<28} {elapsed * 1e6:10.1f} us/switch")
+
+
+def run(object_count):
+    scene = bpy.data.scenes.new(f"Bench{object_count}")
+    view_layer = scene.view_layers[0]
+    cameras = _populate(scene, object_count)
+    print(f"\n{object_count} objects, {_CAMERAS} cameras:")
+
+    with bpy.context.temp_override(scene=scene, view_layer=view_layer):
+        _time("list(scene.objects).index", lambda cam: list(scene.objects).index(cam), cameras)
+        _time("camera_list_index", lambda cam: _addon.camera_controlls.camera_list_index(scene, cam), cameras)
+        _time(
+            "change_scene_camera operator",
+            lambda cam: bpy.ops.cam_manager.change_scene_camera(camera_name=cam.name),
+            cameras,
+        )
+
+
+if __name__ == "__main__":
+    try:
+        sizes = [int(arg) for arg in sys.argv[sys.argv.index('--') + 1:]]
+    except ValueError:
+        sizes = []
+    for size in sizes or [50, 50000]:
+        run(max(size, _CAMERAS))
@@ -0,0 +1,428 @@
+"""
+Tests for batch_render.py's headless entry point.
+
+Run individually with::
+
+    blender --background --factory-startup --python tests/test_batch_render.py
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+_ADDON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_ADDON_SOURCE = os.path.dirname(_ADDON_ROOT)
+_ADDON_NAME = os.path.basename(_ADDON_ROOT)
+
+if _ADDON_SOURCE not in sys.path:
+    sys.path.insert(0, _ADDON_SOURCE)
+
+import addon_utils  # noqa: E402
+import bpy  # noqa: E402
+
+addon_utils.enable(_ADDON_NAME, default_set=True)
+
+import simple_camera_manager as _addon  # noqa: E402
+
+batch_render = _addon.batch_render
+
+
+def _add_cameras(scene, names):
+    cameras = []
+    for name in names:
+        obj = bpy.data.objects.new(name, bpy.data.cameras.new(name))
+        scene.collection.objects.link(obj)
+        cameras.append(obj)
+    bpy.context.view_layer.update()
+    return cameras
+
+
+class _CamerasTestCase(unittest.TestCase):
+    names = ('BatchSH010', 'BatchSH020', 'BatchWide')
+
+    def setUp(self):
+        self.scene = bpy.context.scene
+        self.cameras = _add_cameras(self.scene, self.names)
+
+    def tearDown(self):
+        for obj in self.cameras:
+            bpy.data.objects.remove(obj, do_unlink=True)
+        bpy.context.view_layer.update()
+
+
+class TestSelectCameras(_CamerasTestCase):
+    def setUp(self):
+        super().setUp()
+        for obj, marked in zip(self.cameras, (True, False, True)):
+            obj.data.render_selected = marked
+
+    def _names(self, *args):
+        return [obj.name for obj in batch_render.select_cameras(self.scene, *args) if obj.name.startswith('Batch')]
+
+    def test_marked_cameras_by_default(self):
+        self.assertEqual(self._names(), ['BatchSH010', 'BatchWide'])
+
+    def test_names_and_glob(self):
+        self.assertEqual(self._names(['BatchSH020', 'Missing']), ['BatchSH020'])
+        self.assertEqual(self._names(None, 'BatchSH*'), ['BatchSH010', 'BatchSH020'])
+
+
+class TestCameraSettings(_CamerasTestCase):
+    names = ('BatchSH010',)
+
+    def test_camera_frame_range(self):
+        scene, cam = self.scene, self.cameras[0]
+        self.assertEqual(batch_render.camera_frame_range(scene, cam), (scene.frame_start, scene.frame_end))
+        cam.data.use_frame_range = True
+        cam.data.frame_start, cam.data.frame_end = 10, 24
+        self.assertEqual(batch_render.camera_frame_range(scene, cam), (10, 24))
+
+    def test_draft_settings_are_restored(self):
+        scene, cam = self.scene, self.cameras[0]
+        percentage = scene.render.resolution_percentage
+        cam.data.draft_resolution_percentage = 10
+        previous = batch_render.apply_draft_settings(scene, cam)
+        self.assertEqual(scene.render.resolution_percentage, 10)
+        batch_render.restore_settings(previous)
+        self.assertEqual(scene.render.resolution_percentage, percentage)
+
+
+class TestDraftPass(_CamerasTestCase):
+    def test_final_pass_cameras(self):
+        scene = self.scene
+        names = [obj.name for obj in self.cameras]
+        fingerprints = {obj.name: batch_render._draft_fingerprint(scene, obj) for obj in self.cameras}
+        self.cameras[0].data.draft_approved = True
+        self.cameras[1].data.lens = 85.0
+        final = batch_render.final_pass_cameras
+        self.assertEqual(final(scene, names, fingerprints, 'ALL'), self.cameras)
+        self.assertEqual(final(scene, names, fingerprints, 'APPROVED'), [self.cameras[0]])
+        self.assertEqual(final(scene, names, fingerprints, 'APPROVED_OR_UNCHANGED'),
+                         [self.cameras[0], self.cameras[2]])
+
+    def test_draft_pass_waits_for_review(self):
+        scene = self.scene
+        names = [obj.name for obj in self.cameras]
+        fingerprints = {obj.name: batch_render._draft_fingerprint(scene, obj) for obj in self.cameras}
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertIsNone(batch_render.load_draft_pass(scene, output_dir=tmp))
+            saved = batch_render.save_draft_pass(scene, names, fingerprints, {'BatchSH010': [self.cameras[2]]}, tmp)
+            self.cameras[1].data.draft_approved = True
+            cameras, duplicates, found = batch_render.load_draft_pass(scene, 'APPROVED', tmp)
+            self.assertEqual((cameras, duplicates, found),
+                             ([self.cameras[1]], {'BatchSH010': [self.cameras[2]]}, saved))
+            batch_render.clear_draft_pass(scene, tmp)
+            self.assertIsNone(batch_render.load_draft_pass(scene, output_dir=tmp))
+
+
+class TestDedupeCameras(_CamerasTestCase):
+    def test_identical_cameras_are_rendered_once(self):
+        scene = self.scene
+        self.cameras[1].data.lens = 85.0
+        unique, duplicates = batch_render.dedupe_cameras(scene, self.cameras)
+        self.assertEqual(unique, self.cameras[:2])
+        self.assertEqual(duplicates, {'BatchSH010': [self.cameras[2]]})
+
+        orig_filepath = scene.render.filepath
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                output = _addon.render_cache.output_file(scene, self.cameras[0], tmp)
+                with open(output, 'wb') as f:
+                    f.write(b'image')
+                rows = batch_render.copy_duplicates(scene, duplicates, ['BatchSH010'], tmp)
+                self.assertEqual([(row['camera'], row['rendered'], row['duplicate_of']) for row in rows],
+                                 [('BatchWide', True, 'BatchSH010')])
+                with open(_addon.render_cache.output_file(scene, self.cameras[2], tmp), 'rb') as f:
+                    self.assertEqual(f.read(), b'image')
+            finally:
+                scene.render.filepath = orig_filepath
+
+    def test_panoramic_cameras_differing_in_projection_are_not_deduped(self):
+        for obj in self.cameras:
+            obj.data.type = 'PANO'
+            obj.data.panorama_type = 'FISHEYE_EQUIDISTANT'
+        self.cameras[1].data.fisheye_fov = 2.0
+        self.cameras[2].data.stereo.interocular_distance = 0.1
+        unique, duplicates = batch_render.dedupe_cameras(self.scene, self.cameras)
+        self.assertEqual((unique, duplicates), (self.cameras, {}))
+
+    def test_animated_cameras_are_not_deduped_in_animation_batches(self):
+        scene = self.scene
+        self.cameras[1].data.lens = 85.0
+        self.cameras[2].keyframe_insert('location', frame=scene.frame_start)
+        self.assertEqual(batch_render.dedupe_cameras(scene, self.cameras)[1], {'BatchSH010': [self.cameras[2]]})
+        unique, duplicates = batch_render.dedupe_cameras(scene, self.cameras, animation=True)
+        self.assertEqual((unique, duplicates), (self.cameras, {}))
+
+
+class TestSubjectBorder(unittest.TestCase):
+    def setUp(self):
+        self.scene = bpy.context.scene
+        self.camera = bpy.data.objects.new('BorderCam', bpy.data.cameras.new('BorderCam'))
+        self.camera.data.lens, self.camera.data.sensor_width = 50.0, 36.0
+        self.camera.data.sensor_fit = 'HORIZONTAL'
+        mesh = bpy.data.meshes.new('BorderCube')
+        mesh.from_pydata([(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)], [], [])
+        self.cube = bpy.data.objects.new('BorderCube', mesh)
+        self.cube.location = (0.0, 0.0, -10.0)
+        self.collection = bpy.data.collections.new('BorderSubject')
+        self.collection.objects.link(self.cube)
+        self.scene.collection.objects.link(self.camera)
+        self.scene.collection.children.link(self.collection)
+        bpy.context.view_layer.update()
+
+    def tearDown(self):
+        bpy.data.objects.remove(self.camera, do_unlink=True)
+        bpy.data.objects.remove(self.cube, do_unlink=True)
+        bpy.data.collections.remove(self.collection)
+        self.scene.render.use_border = False
+
+    def test_subject_rect_is_projected_bounding_box(self):
+        x0, y0, x1, y1 = _addon.camera_gizmos.get_subject_frame_rect(self.scene, self.camera, [self.cube])
+        # The near face at 9 units spans 1/9 of the distance to each side, the frame 18/50.
+        self.assertAlmostEqual(x0, 0.5 - (1 / 9) / (36 / 50), places=4)
+        self.assertAlmostEqual(x1, 1.0 - x0, places=4)
+        self.assertAlmostEqual(y1, 1.0 - y0, places=4)
+
+        self.cube.location.z = 10.0
+        bpy.context.view_layer.update()
+        self.assertEqual(_addon.camera_gizmos.get_subject_frame_rect(self.scene, self.camera, [self.cube]),
+                         (0.0, 0.0, 1.0, 1.0))
+
+    def test_border_is_applied_and_restored(self):
+        data = self.camera.data
+        data.use_subject_border, data.subject_collection, data.subject_padding = True, self.collection, 0
+        render = self.scene.render
+        render.use_border = False
+        previous = batch_render.apply_subject_border(self.scene, self.camera)
+        self.assertTrue(render.use_border)
+        self.assertLess(render.border_max_x - render.border_min_x, 0.5)
+        batch_render.restore_settings(previous)
+        self.assertFalse(render.use_border)
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.scene = bpy.context.scene
+        self._orig_filepath = self.scene.render.filepath
+        self._tmp = tempfile.TemporaryDirectory()
+        self.scene.render.filepath = os.path.join(self._tmp.name, "")
+        self.camera = bpy.data.objects.new('CacheCam', bpy.data.cameras.new('CacheCam'))
+        self.scene.collection.objects.link(self.camera)
+
+    def tearDown(self):
+        bpy.data.objects.remove(self.camera, do_unlink=True)
+        self.scene.render.filepath = self._orig_filepath
+        self._tmp.cleanup()
+
+    def _render(self, scope='CAMERA'):
+        """Fake a batch render of the camera: write its output and record it."""
+        cache = _addon.render_cache.RenderCache(self.scene, [self.camera], scope)
+        output = _addon.render_cache.output_file(self.scene, self.camera)
+        with open(output, 'wb') as f:
+            f.write(b'image')
+        cache.record([(self.camera.name, True)])
+
+    def _pending(self, scope='CAMERA'):
+        return _addon.render_cache.RenderCache(self.scene, [self.camera], scope).pending
+
+    def test_unchanged_camera_is_skipped(self):
+        self.assertEqual(self._pending(), [self.camera])
+        self._render()
+        self.assertEqual(self._pending(), [])
+
+    def test_changed_camera_or_missing_output_is_rendered(self):
+        self._render()
+        self.camera.data.lens = 85.0
+        self.assertEqual(self._pending(), [self.camera])
+
+        self._render()
+        os.remove(_addon.render_cache.output_file(self.scene, self.camera))
+        self.assertEqual(self._pending(), [self.camera])
+
+    def test_unsaved_changes_render_every_camera_in_file_scope(self):
+        self._render()
+        cache = _addon.render_cache.RenderCache(self.scene, [self.camera], 'FILE')
+        self.assertEqual(cache.unsaved, bpy.data.is_dirty)
+        if cache.unsaved:
+            self.assertEqual(cache.pending, [self.camera])
+            cache.record([(self.camera.name, True)])
+            self.assertNotIn(self.camera.name, cache.manifest.entries)
+
+
+class TestBatchJournal(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.journal = _addon.batch_journal.BatchJournal(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_pending_after_crash(self):
+        self.assertIsNone(self.journal.pending())
+        self.journal.begin('Scene', ['A', 'B', 'C'])
+        self.journal.started('A')
+        self.journal.finished('A', True)
+        self.journal.started('B')
+        # A line cut short by a crash is ignored.
+        with open(self.journal.path, 'a') as f:
+            f.write('{"event": "do')
+        self.assertEqual(self.journal.pending(), ('Scene', ['B', 'C']))
+
+    def test_ended_batch_has_nothing_pending(self):
+        self.journal.begin('Scene', ['A'])
+        self.journal.finished('A', True)
+        self.journal.end()
+        self.assertIsNone(self.journal.pending())
+
+    def test_interrupted_draft_pass_is_resumed(self):
+        scene = bpy.context.scene
+        drafts = _addon.batch_journal.BatchJournal(batch_render.draft_folder(scene, self._tmp.name))
+        drafts.begin(scene.name, ['A'])
+        journal, draft = batch_render.interrupted_batch(scene, self._tmp.name)
+        self.assertEqual((journal.path, draft), (drafts.path, True))
+
+        self.journal.begin(scene.name, ['B'])
+        journal, draft = batch_render.interrupted_batch(scene, self._tmp.name)
+        self.assertEqual((journal.path, draft), (self.journal.path, False))
+
+
+class TestRenderReport(unittest.TestCase):
+    def test_parse_peak_memory(self):
+        parse = _addon.render_report.parse_peak_memory
+        self.assertAlmostEqual(parse("Fra:1 | Mem:85.21M, Peak:112.40M | Time:00:01.20"), 112.40)
+        self.assertAlmostEqual(parse("Mem:1.5G, Peak:2G"), 2048.0)
+        self.assertIsNone(parse("Fra:1 | Syncing Cube"))
+
+    def test_history_estimates(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            history = _addon.render_report.RenderHistory(tmp)
+            for wall_time in (1.0, 3.0):
+                history.record([{'camera': 'A', 'rendered': True, 'wall_time': wall_time},
+                                {'camera': 'B', 'rendered': False, 'wall_time': 9.0}])
+            history.save()
+            history = _addon.render_report.RenderHistory(tmp)
+            self.assertEqual(history.estimate('A'), 2.0)
+            self.assertIsNone(history.estimate('A', animation=True))
+            self.assertEqual(history.estimates(['A', 'B']), ({'A': 2.0, 'B': 2.0}, 1))
+
+    def test_report_round_trip(self):
+        rows = [{'camera': 'A', 'rendered': True, 'wall_time': 1.5, 'first_stats_time': 0.2,
+                 'peak_memory': 100.0, 'file_size': 2048}]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'report.json')
+            _addon.render_report.write_report(path, rows)
+            self.assertEqual(_addon.render_report.read_report(path), rows)
+            csv_path = os.path.join(tmp, 'report.csv')
+            _addon.render_report.write_report(csv_path, rows)
+            with open(csv_path) as f:
+                self.assertEqual(f.readline().strip(), ','.join(_addon.render_report.FIELDS))
+
+
+class TestContactSheet(unittest.TestCase):
+    def test_downscale_averages_blocks(self):
+        import numpy as np
+        pixels = np.zeros((4, 8, 4), dtype=np.float32)
+        pixels[:, :4] = 1.0
+        tile = _addon.contact_sheet.downscale(pixels, 4, 4)
+        self.assertEqual(tile.shape, (2, 4, 4))
+        self.assertEqual(tile[0, :, 0].tolist(), [1.0, 1.0, 0.0, 0.0])
+
+    def test_sheet_tiles_renders_in_order(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            render_path = os.path.join(tmp, 'render.png')
+            image = bpy.data.images.new('SheetSource', 64, 36)
+            image.filepath_raw = render_path
+            image.file_format = 'PNG'
+            image.save()
+            bpy.data.images.remove(image)
+
+            sheet_path = os.path.join(tmp, 'sheet.png')
+            tiled = _addon.contact_sheet.build_contact_sheet(
+                [('A', render_path), ('Missing', os.path.join(tmp, 'missing.png')), ('C', render_path)],
+                sheet_path, tile_width=32)
+            self.assertEqual(tiled, 2)
+            sheet = bpy.data.images.load(sheet_path)
+            self.assertEqual(tuple(sheet.size), (2 * (32 + 8), 2 * (18 + 18 + 4)))
+            bpy.data.images.remove(sheet)
+
+
+class TestCommandLine(unittest.TestCase):
+    def test_only_script_arguments_are_parsed(self):
+        argv = ['blender', '-b', 'scene.blend', '--', '--scm-render', '--scm-glob', 'SH*', '--other']
+        args = batch_render._parse_args(batch_render._script_args(argv))
+        self.assertTrue(args.scm_render)
+        self.assertEqual(args.scm_glob, 'SH*')
+        self.assertFalse(batch_render._python_on_command_line(argv))
+        self.assertTrue(batch_render._python_on_command_line(['blender', '--python-expr', 'x', '--', '--scm-render']))
+
+    def test_worker_command_round_trips_through_parser(self):
+        command = batch_render.worker_command('/tmp/snap.blend', ['CamA', 'CamB'], '/tmp/r.json', threads=4)
+        self.assertEqual(command[command.index('--threads') + 1], '4')
+        args = batch_render._parse_args(batch_render._script_args(command))
+        self.assertEqual(args.scm_cameras, ['CamA', 'CamB'])
+        self.assertEqual(args.scm_report, '/tmp/r.json')
+
+    def test_frame_worker_renders_interleaved_frames(self):
+        command = batch_render.frame_worker_command('/tmp/snap.blend', 'CamA', '/out/CamA/####', 3, 20, 4)
+        self.assertEqual(command[-1], '--render-anim')
+        self.assertLess(command.index('--python-expr'), command.index('--render-output'))
+        for flag, value in (('--frame-start', '3'), ('--frame-end', '20'), ('--frame-jump', '4')):
+            self.assertEqual(command[command.index(flag) + 1], value)
+
+    def test_pack_balances_estimated_time(self):
+        estimates = {'a': 10.0, 'b': 1.0, 'c': 6.0, 'd': 5.0}
+        self.assertEqual(batch_render.pack(list('abcd'), estimates, 2), [['a', 'b'], ['c', 'd']])
+        self.assertEqual(batch_render.estimate_duration(list('abcd'), estimates, 2), (22.0, 11.0))
+
+    def test_blend_files_from_directories_and_globs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ('a.blend', 'b.blend', 'b.blend1', os.path.join('sub', 'c.blend')):
+                os.makedirs(os.path.dirname(os.path.join(tmp, name)), exist_ok=True)
+                open(os.path.join(tmp, name), 'w').close()
+            found = batch_render.blend_files([tmp, os.path.join(tmp, 'a.blend')])
+            self.assertEqual([os.path.basename(path) for path in found], ['a.blend', 'b.blend'])
+            found = batch_render.blend_files([os.path.join(tmp, '**', '*.blend')])
+            self.assertEqual(len(found), 3)
+
+    def test_blend_files_with_glob_characters_in_their_names(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            folder = os.path.join(tmp, 'shots [v2]')
+            os.makedirs(folder)
+            path = os.path.join(folder, 'SH010[final].blend')
+            open(path, 'w').close()
+            self.assertEqual(batch_render.blend_files([path]), [path])
+            self.assertEqual(batch_render.blend_files([folder]), [path])
+
+    def test_file_worker_options(self):
+        args = batch_render._parse_args(['--scm-files', 'x/*.blend', '--scm-glob', 'SH*', '--scm-animation'])
+        script_args = batch_render._file_script_args(args, '/tmp/r.json', '/out/x')
+        forwarded = batch_render._parse_args(script_args)
+        self.assertIsNone(forwarded.scm_files)
+        self.assertEqual((forwarded.scm_glob, forwarded.scm_output, forwarded.scm_report), ('SH*', '/out/x', '/tmp/r.json'))
+        self.assertTrue(forwarded.scm_animation)
+
+    def test_split_camera_completes_when_all_its_frame_workers_exit(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            pool = batch_render.WorkerPool(tmp, limit=2)
+            pool.add([sys.executable, '-c', 'pass'], ['CamA'])
+            pool.add([sys.executable, '-c', 'import sys; sys.exit(1)'], ['CamA'])
+            pool.add([sys.executable, '-c', 'pass'], ['CamB'])
+            pool.start()
+            pool.wait()
+            self.assertEqual(pool.completed(), [('CamA', False), ('CamB', True)])
+            self.assertEqual(pool.completed(), [])
+
+    def test_shard_is_round_robin_without_empty_shards(self):
+        self.assertEqual(batch_render.shard(list('abcde'), 2), [list('ace'), list('bd')])
+        self.assertEqual(batch_render.shard(list('ab'), 4), [['a'], ['b']])
+
+
+if __name__ == "__main__":
+    try:
+        idx = sys.argv.index('--')
+        sys.argv = [sys.argv[0]] + sys.argv[idx + 1:]
+    except ValueError:
+        sys.argv = [sys.argv[0]]
+    unittest.main()
@@ -27,6 +27,8 @@ import bpy  # noqa: E402
 
 addon_utils.enable(_ADDON_NAME, default_set=True)
 
+import simple_camera_manager as _addon  # noqa: E402
+
 
 def _find_view3d_area(context):
     for area in context.screen.areas:
@@ -96,6 +98,79 @@ class TestCameraToViewFromCameraView(unittest.TestCase):
         self.assertEqual(self.space.region_3d.view_perspective, 'CAMERA')
 
 
+class TestSwitchCamera(unittest.TestCase):
+    """camera_controlls.switch_camera() is the operator's logic without the
+    operator, so it has to apply the same per-camera settings."""
+
+    def setUp(self):
+        self.scene = bpy.context.scene
+        self._orig_scene_camera = self.scene.camera
+        self._orig_resolution = (self.scene.render.resolution_x, self.scene.render.resolution_y)
+        self._orig_exposure = self.scene.view_settings.exposure
+
+        self.camera_obj = bpy.data.objects.new('SwitchCam', bpy.data.cameras.new('SwitchCam'))
+        self.scene.collection.objects.link(self.camera_obj)
+        bpy.context.view_layer.update()
+
+    def tearDown(self):
+        bpy.data.objects.remove(self.camera_obj, do_unlink=True)
+        self.scene.camera = self._orig_scene_camera
+        self.scene.render.resolution_x, self.scene.render.resolution_y = self._orig_resolution
+        self.scene.view_settings.exposure = self._orig_exposure
+
+    def test_applies_camera_settings(self):
+        cam = self.camera_obj.data
+        cam.resolution_overwrite = True
+        cam.resolution = (640, 480)
+        cam.exposure = 1.25
+
+        _addon.camera_controlls.switch_camera(bpy.context, self.camera_obj, select=False)
+
+        self.assertEqual(self.scene.camera, self.camera_obj)
+        self.assertEqual((self.scene.render.resolution_x, self.scene.render.resolution_y), (640, 480))
+        self.assertAlmostEqual(self.scene.view_settings.exposure, 1.25)
+
+    def test_second_switch_skips_unchanged_writes(self):
+        cam = self.camera_obj.data
+        cam.world = bpy.data.worlds.new('SwitchWorld')
+        stats = _addon.camera_controlls.switch_stats
+        try:
+            _addon.camera_controlls.switch_camera(bpy.context, self.camera_obj, select=False)
+            applied = stats['applied']
+            _addon.camera_controlls.switch_camera(bpy.context, self.camera_obj, select=False)
+            self.assertEqual(stats['applied'], applied)
+        finally:
+            bpy.data.worlds.remove(cam.world)
+
+    def test_selects_only_the_camera(self):
+        _addon.camera_controlls.switch_camera(bpy.context, self.camera_obj)
+        self.assertEqual(list(bpy.context.view_layer.objects.selected), [self.camera_obj])
+        self.assertEqual(bpy.context.view_layer.objects.active, self.camera_obj)
+
+
+class TestView3DCache(unittest.TestCase):
+    """view3d_cache remembers VIEW_3D areas by index, so it has to notice
+    when an area stops being a 3D viewport."""
+
+    def setUp(self):
+        self.cache = _addon.view3d_cache.cache
+        self.screen = bpy.context.screen
+
+    def test_matches_full_walk(self):
+        expected = [area for area in self.screen.areas if area.type == 'VIEW_3D']
+        self.assertEqual(self.cache.areas(self.screen), expected)
+
+    def test_editor_type_change_is_picked_up(self):
+        area = _find_view3d_area(bpy.context)
+        self.assertIn(area, self.cache.areas(self.screen))
+        area.type = 'IMAGE_EDITOR'
+        try:
+            self.assertNotIn(area, self.cache.areas(self.screen))
+        finally:
+            area.type = 'VIEW_3D'
+        self.assertIn(area, self.cache.areas(self.screen))
+
+
 if __name__ == "__main__":
     try:
         idx = sys.argv.index('--')
@@ -0,0 +1,219 @@
+"""
+Integration tests for camera_registry.py's per-scene camera cache.
+
+The registry is only useful if the depsgraph/rename handlers keep it in
+sync with the real scene, so these run against a real headless Blender
+and let Blender's own update machinery drive it.
+
+Run individually with::
+
+    blender --background --factory-startup --python tests/test_camera_registry.py
+"""
+
+import os
+import sys
+import unittest
+
+_ADDON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_ADDON_SOURCE = os.path.dirname(_ADDON_ROOT)
+_ADDON_NAME = os.path.basename(_ADDON_ROOT)
+
+if _ADDON_SOURCE not in sys.path:
+    sys.path.insert(0, _ADDON_SOURCE)
+
+import addon_utils  # noqa: E402
+import bpy  # noqa: E402
+
+addon_utils.enable(_ADDON_NAME, default_set=True)
+
+import simple_camera_manager as _addon  # noqa: E402
+
+camera_registry = _addon.camera_registry
+
+
+def _add_camera(name, collection=None):
+    data = bpy.data.cameras.new(name)
+    obj = bpy.data.objects.new(name, data)
+    (collection or bpy.context.scene.collection).objects.link(obj)
+    return obj
+
+
+class TestCameraRegistry(unittest.TestCase):
+    def setUp(self):
+        self.scene = bpy.context.scene
+        self._orig_objects = set(bpy.data.objects.keys())
+        self._orig_collections = set(bpy.data.collections.keys())
+        # Prime the registry so every test checks handler-driven updates,
+        # not just a lazy first build.
+        camera_registry.get_registry(self.scene)
+
+    def tearDown(self):
+        for obj in list(bpy.data.objects):
+            if obj.name not in self._orig_objects:
+                bpy.data.objects.remove(obj, do_unlink=True)
+        for col in list(bpy.data.collections):
+            if col.name not in self._orig_collections:
+                bpy.data.collections.remove(col)
+        bpy.context.view_layer.update()
+
+    def _names(self):
+        return [ob.name for ob in camera_registry.get_cameras(self.scene)]
+
+    def test_only_cameras_ordered_by_name(self):
+        _add_camera('RegB')
+        _add_camera('rega')
+        mesh = bpy.data.objects.new('RegMesh', bpy.data.meshes.new('RegMesh'))
+        self.scene.collection.objects.link(mesh)
+        bpy.context.view_layer.update()
+
+        names = self._names()
+        self.assertNotIn('RegMesh', names)
+        self.assertLess(names.index('rega'), names.index('RegB'))
+
+    def test_camera_in_child_collection_is_picked_up(self):
+        col = bpy.data.collections.new('RegCollection')
+        self.scene.collection.children.link(col)
+        bpy.context.view_layer.update()
+        self.assertNotIn('RegChild', self._names())
+
+        _add_camera('RegChild', col)
+        bpy.context.view_layer.update()
+        self.assertIn('RegChild', self._names())
+
+    def test_removed_camera_is_dropped(self):
+        obj = _add_camera('RegRemoved')
+        bpy.context.view_layer.update()
+        self.assertIn('RegRemoved', self._names())
+
+        bpy.data.objects.remove(obj, do_unlink=True)
+        bpy.context.view_layer.update()
+        self.assertNotIn('RegRemoved', self._names())
+
+    def test_camera_list_mirrors_registry(self):
+        _add_camera('RegListB')
+        _add_camera('RegListA')
+        mesh = bpy.data.objects.new('RegListMesh', bpy.data.meshes.new('RegListMesh'))
+        self.scene.collection.objects.link(mesh)
+        bpy.context.view_layer.update()
+
+        listed = [item.camera for item in self.scene.camera_list]
+        self.assertEqual(listed, list(camera_registry.get_cameras(self.scene)))
+        self.assertNotIn(mesh, listed)
+
+    def test_sorted_index_follows_lens_change(self):
+        wide = _add_camera('RegWide')
+        tele = _add_camera('RegTele')
+        wide.data.lens = 18.0
+        tele.data.lens = 135.0
+        bpy.context.view_layer.update()
+
+        key = _addon.uilist.SORT_KEYS['FOCAL_LENGTH']
+        registry = camera_registry.get_registry(self.scene)
+        names = registry.sorted_index('FOCAL_LENGTH', key).names
+        self.assertLess(names.index('RegWide'), names.index('RegTele'))
+
+        wide.data.lens = 200.0
+        bpy.context.view_layer.update()
+        registry = camera_registry.get_registry(self.scene)
+        names = registry.sorted_index('FOCAL_LENGTH', key).names
+        self.assertGreater(names.index('RegWide'), names.index('RegTele'))
+
+    def test_sorted_index_follows_renamed_and_reassigned_data(self):
+        wide = _add_camera('RegDataWide')
+        tele = _add_camera('RegDataTele')
+        wide.data.lens = 18.0
+        tele.data.lens = 135.0
+        bpy.context.view_layer.update()
+        key = _addon.uilist.SORT_KEYS['FOCAL_LENGTH']
+        camera_registry.get_registry(self.scene).sorted_index('FOCAL_LENGTH', key)
+
+        wide.data.name = 'RegDataRenamed'
+        wide.data.lens = 200.0
+        bpy.context.view_layer.update()
+        names = camera_registry.get_registry(self.scene).sorted_index('FOCAL_LENGTH', key).names
+        self.assertGreater(names.index('RegDataWide'), names.index('RegDataTele'))
+
+        tele.data = bpy.data.cameras.new('RegDataNew')
+        bpy.context.view_layer.update()
+        tele.data.lens = 300.0
+        bpy.context.view_layer.update()
+        names = camera_registry.get_registry(self.scene).sorted_index('FOCAL_LENGTH', key).names
+        self.assertGreater(names.index('RegDataTele'), names.index('RegDataWide'))
+
+    def test_ring_skips_excluded_collection(self):
+        col = bpy.data.collections.new('RegExcluded')
+        self.scene.collection.children.link(col)
+        first = _add_camera('RegRingA')
+        hidden = _add_camera('RegRingB', col)
+        last = _add_camera('RegRingC')
+        view_layer = bpy.context.view_layer
+        view_layer.layer_collection.children['RegExcluded'].exclude = True
+        view_layer.update()
+
+        ring = camera_registry.get_registry(self.scene).ring(view_layer)
+        self.assertNotIn(hidden, ring.cameras)
+        self.assertEqual(ring.step(first, 'FORWARD'), last)
+        self.assertEqual(ring.step(last, 'BACKWARD'), first)
+
+    def test_active_index_tracks_scene_camera(self):
+        orig_camera = self.scene.camera
+        obj = _add_camera('RegActive')
+        bpy.context.view_layer.update()
+        try:
+            self.scene.camera = obj
+            registry = camera_registry.get_registry(self.scene)
+            self.assertEqual(registry.cameras[registry.active_index], obj)
+            self.assertEqual(registry.index(obj), registry.active_index)
+        finally:
+            self.scene.camera = orig_camera
+
+
+    def test_revision_ignores_selection_changes(self):
+        orig_camera = self.scene.camera
+        obj = _add_camera('RegRevision')
+        bpy.context.view_layer.update()
+        revision = camera_registry.get_registry(self.scene).revision
+        try:
+            obj.select_set(not obj.select_get())
+            bpy.context.view_layer.update()
+            self.assertEqual(camera_registry.get_registry(self.scene).revision, revision)
+
+            self.scene.camera = obj
+            bpy.context.view_layer.update()
+            revision, previous = camera_registry.get_registry(self.scene).revision, revision
+            self.assertGreater(revision, previous)
+
+            obj.hide_set(True)
+            bpy.context.view_layer.update()
+            self.assertGreater(camera_registry.get_registry(self.scene).revision, revision)
+        finally:
+            self.scene.camera = orig_camera
+
+class TestCameraNameIndex(unittest.TestCase):
+    NAMES = ('SQ010_SH0450_CAM_A_v003', 'SQ010_SH0045_CAM_B_v001', 'SQ020_SH0450_CAM_A_v002', 'Overview')
+
+    def setUp(self):
+        self.index = _addon.camera_search.CameraNameIndex(self.NAMES)
+
+    def test_contains_matches_plain_substring_search(self):
+        for query in ('s', 'sh', 'sh0450', 'cam_a', 'V00', 'nope', 'overview'):
+            expected = {name for name in self.NAMES if query.lower() in name.lower()}
+            self.assertEqual(self.index.contains(query), expected, query)
+
+    def test_prefix(self):
+        self.assertEqual(self.index.prefix('sq010'), set(self.NAMES[:2]))
+        self.assertEqual(self.index.prefix('SH'), set())
+
+    def test_fuzzy_ranks_tighter_match_first(self):
+        scores = self.index.fuzzy('sh045')
+        self.assertNotIn('Overview', scores)
+        self.assertGreater(scores['SQ010_SH0450_CAM_A_v003'], scores['SQ010_SH0045_CAM_B_v001'])
+
+
+if __name__ == "__main__":
+    try:
+        idx = sys.argv.index('--')
+        sys.argv = [sys.argv[0]] + sys.argv[idx + 1:]
+    except ValueError:
+        sys.argv = [sys.argv[0]]
+    unittest.main()
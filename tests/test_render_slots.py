@@ -0,0 +1,181 @@
+"""
+Tests for render_slots.py's slot allocator and Render Result slot handling.
+
+Run individually with::
+
+    blender --background --factory-startup --python tests/test_render_slots.py
+"""
+
+import os
+import sys
+import unittest
+
+_ADDON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_ADDON_SOURCE = os.path.dirname(_ADDON_ROOT)
+_ADDON_NAME = os.path.basename(_ADDON_ROOT)
+
+if _ADDON_SOURCE not in sys.path:
+    sys.path.insert(0, _ADDON_SOURCE)
+
+import addon_utils  # noqa: E402
+import bpy  # noqa: E402
+
+addon_utils.enable(_ADDON_NAME, default_set=True)
+
+import simple_camera_manager as _addon  # noqa: E402
+
+render_slots = _addon.render_slots
+
+
+def _render_result():
+    """Render a tiny workbench frame so that Render Result and its slots exist."""
+    scene = bpy.context.scene
+    if bpy.data.images.get('Render Result') is None and scene.camera is not None:
+        engine, percentage = scene.render.engine, scene.render.resolution_percentage
+        scene.render.engine, scene.render.resolution_percentage = 'BLENDER_WORKBENCH', 1
+        try:
+            bpy.ops.render.render()
+        finally:
+            scene.render.engine, scene.render.resolution_percentage = engine, percentage
+    return bpy.data.images.get('Render Result')
+
+
+class _SlotTestCase(unittest.TestCase):
+    def setUp(self):
+        self.allocator = render_slots.allocator
+        self._orig_slots = {cam.name: cam.slot for cam in bpy.data.cameras}
+        for cam in bpy.data.cameras:
+            cam.slot = 1
+        self.data = []
+        self.allocator.invalidate()
+
+    def tearDown(self):
+        for cam in self.data:
+            if cam.name in bpy.data.cameras:
+                bpy.data.cameras.remove(cam)
+        for name, slot in self._orig_slots.items():
+            bpy.data.cameras[name].slot = slot
+        self.allocator._reserved.clear()
+        self.allocator.invalidate()
+
+    def _camera_data(self, slot):
+        cam = bpy.data.cameras.new('SlotCam')
+        cam.slot = slot
+        self.data.append(cam)
+        return cam
+
+
+class TestRenderSlotAllocator(_SlotTestCase):
+    def test_allocate_returns_the_lowest_free_slots(self):
+        self._camera_data(2)
+        self._camera_data(4)
+        self.assertEqual(self.allocator.allocate(3), [3, 5, 6])
+
+    def test_allocated_slots_stay_reserved(self):
+        slot, = self.allocator.allocate()
+        self.assertEqual(self.allocator.allocate(), [slot + 1])
+
+    def test_assigning_a_reserved_slot_keeps_it_used(self):
+        slot, = self.allocator.allocate()
+        self._camera_data(slot)
+        self.assertEqual(self.allocator.allocate(), [slot + 1])
+
+    def test_unassigned_reservations_expire(self):
+        seconds = render_slots._RESERVATION_SECONDS
+        render_slots._RESERVATION_SECONDS = 0.0
+        try:
+            slot, = self.allocator.allocate()
+        finally:
+            render_slots._RESERVATION_SECONDS = seconds
+        self.assertEqual(self.allocator.allocate(), [slot])
+
+    def test_release_frees_the_slot_of_its_last_camera(self):
+        first, second = self._camera_data(2), self._camera_data(2)
+        self.allocator.allocate(0)
+        self.allocator.release(first)
+        self.assertEqual(self.allocator._bits & 0b10, 0b10)
+        self.allocator.release(second)
+        self.assertEqual(self.allocator._bits & 0b10, 0)
+
+    def test_bitmap_matches_camera_slots(self):
+        self._camera_data(3)
+        self._camera_data(3)
+        self.allocator.allocate(0)
+        self.assertEqual(self.allocator._bits, 0b101)
+        self.assertEqual(self.allocator._counts[3], 2)
+
+    def test_deleted_camera_frees_its_slot(self):
+        self.assertEqual(self.allocator.allocate(0), [])
+        cam = self._camera_data(2)
+        bpy.data.cameras.remove(cam)
+        self._camera_data(1)
+        self.assertEqual(self.allocator.allocate(), [2])
+
+    def test_changed_slot_is_picked_up(self):
+        cam = self._camera_data(2)
+        self.allocator.allocate(0)
+        # bypass the update callback, like a driver or an undo step would
+        cam['slot'] = 3
+        self.assertEqual(self.allocator.allocate(), [2])
+
+
+class TestAssignDistinctSlots(_SlotTestCase):
+    def setUp(self):
+        super().setUp()
+        self.scene = bpy.context.scene
+        self.cameras = []
+        for name in ('SlotSH010', 'SlotSH020', 'SlotWide'):
+            obj = bpy.data.objects.new(name, self._camera_data(1))
+            self.scene.collection.objects.link(obj)
+            self.cameras.append(obj)
+
+    def tearDown(self):
+        for obj in self.cameras:
+            bpy.data.objects.remove(obj, do_unlink=True)
+        super().tearDown()
+
+    def test_cameras_sharing_a_slot_get_their_own(self):
+        changed = render_slots.assign_distinct_slots(self.cameras)
+        self.assertEqual(changed, ['SlotSH020', 'SlotWide'])
+        self.assertEqual(len({obj.data.slot for obj in self.cameras}), 3)
+
+    def test_objects_sharing_camera_data_keep_sharing_its_slot(self):
+        self.cameras[2].data = self.cameras[1].data
+        changed = render_slots.assign_distinct_slots(self.cameras)
+        self.assertEqual(changed, ['SlotSH020', 'SlotWide'])
+        self.assertEqual(self.cameras[1].data.slot, self.cameras[2].data.slot)
+        self.assertNotEqual(self.cameras[0].data.slot, self.cameras[1].data.slot)
+
+
+class TestRenderResultSlots(_SlotTestCase):
+    @classmethod
+    def setUpClass(cls):
+        if _render_result() is None:
+            raise unittest.SkipTest("Render Result could not be created")
+
+    def test_ensure_grows_render_result(self):
+        count = len(render_slots.get_render_slots())
+        self.assertEqual(render_slots.ensure_render_slots(count + 2), count + 2)
+        self.assertEqual(render_slots.ensure_render_slots(1), count + 2)
+
+    def test_shrink_keeps_at_least_one_slot(self):
+        render_slots.ensure_render_slots(4)
+        self.assertEqual(render_slots.shrink_render_slots(2), 2)
+        self.assertEqual(render_slots.shrink_render_slots(0), 1)
+
+    def test_compact_renumbers_slots_densely(self):
+        cams = [self._camera_data(slot) for slot in (3, 7, 7)]
+        render_slots.ensure_render_slots(8)
+        self.assertEqual(bpy.ops.cam_manager.compact_render_slots(), {'FINISHED'})
+        self.assertEqual([cam.slot for cam in cams], [2, 3, 3])
+        self.assertEqual(len(render_slots.get_render_slots()), 3)
+        self.assertEqual(self.allocator.allocate(), [4])
+
+
+if __name__ == "__main__":
+    try:
+        idx = sys.argv.index('--')
+        sys.argv = [sys.argv[0]] + sys.argv[idx + 1:]
+    except ValueError:
+        sys.argv = [sys.argv[0]]
+    unittest.main()
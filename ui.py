@@ -2,6 +2,7 @@ import os
 
 import bpy
 
+from . import batch_render, render_report
 from .keymap import get_keymap_string
 from .pie_menu import draw_camera_settings
 
@@ -113,7 +114,7 @@ class VIEW3D_PT_SimpleCameraManager(bpy.types.Panel):
         # with no custom draw code, use "UI_UL_list").
 
         row = layout.row()
-        row.template_list("CAMERA_UL_cameras_scene", "", scene, "objects", scene, "camera_list_index")
+        row.template_list("CAMERA_UL_cameras_scene", "", scene, "camera_list", scene, "camera_list_index")
         col = row.column(align=True)
         col.operator("cam_manager.cycle_cameras_backward", text="", icon='TRIA_UP')
         col.operator("cam_manager.cycle_cameras_next", text="", icon='TRIA_DOWN')
@@ -123,11 +124,56 @@ class VIEW3D_PT_SimpleCameraManager(bpy.types.Panel):
         row.operator("cam_manager.select_all_cameras", text="All").invert = False
         row.operator("cam_manager.select_all_cameras", text="None").invert = True
 
-        row = layout.row()
+        row = layout.row(align=True)
         row.operator("cam_manager.multi_camera_rendering_handlers", text="Batch Render ", icon="RENDER_ANIMATION")
+        row.operator("cam_manager.parallel_batch_render", text="Parallel", icon="SORTSIZE")
+        row.operator("cam_manager.render_to_slots", text="", icon="RENDERLAYERS")
+        row.operator("cam_manager.resume_batch_render", text="", icon="RECOVER_LAST")
         row = layout.row()
         row.prop(context.scene.render, 'filepath', text='Folder')
 
+        header, body = layout.panel(idname="BATCH_RENDER_PANEL", default_closed=True)
+        header.label(text="Batch Render Settings", icon='RENDER_RESULT')
+        if body:
+            settings = scene.cam_manager_batch
+            col = body.column(align=True)
+            col.prop(settings, 'workers')
+            col.prop(settings, 'threads')
+            col = body.column(align=True)
+            col.prop(settings, 'animation')
+            row = col.row()
+            row.active = settings.animation
+            row.prop(settings, 'split_frames')
+            col = body.column(align=True)
+            col.prop(settings, 'two_pass')
+            row = col.row()
+            row.active = settings.two_pass
+            row.prop(settings, 'final_pass', text="")
+            row = col.row(align=True)
+            row.active = settings.two_pass
+            row.prop(settings, 'review_delay')
+            row.operator("cam_manager.render_final_pass", text="", icon='RENDER_STILL')
+            col = body.column(align=True)
+            col.prop(settings, 'skip_unchanged')
+            row = col.row()
+            row.active = settings.skip_unchanged
+            row.prop(settings, 'cache_scope', expand=True)
+            col = body.column(align=True)
+            col.prop(settings, 'deduplicate')
+            row = col.row()
+            row.active = settings.deduplicate
+            row.prop(settings, 'hardlink_duplicates')
+            row = body.row(align=True)
+            row.prop(settings, 'contact_sheet')
+            row.operator("cam_manager.contact_sheet", text="", icon='IMAGE_BACKGROUND')
+            col = body.column(align=True)
+            col.prop(settings, 'order')
+            batch_render.draw_estimate(col, scene)
+            body.prop(settings, 'report_format', expand=True)
+            if render_report.last_report:
+                box = body.box()
+                render_report.draw_report(box, render_report.last_report)
+
         # Get the keymap for the panel
         panel_keymap = get_keymap_string("OBJECT_PT_camera_manager_popup", "PANEL")
         menu_keymap = get_keymap_string("CAMERA_MT_pie_menu", "MENU")
@@ -200,7 +246,7 @@ class CAM_MANAGER_PT_scene_properties(CAM_MANAGER_PT_scene_panel, bpy.types.Pane
         # with no custom draw code, use "UI_UL_list").
 
         row = layout.row()
-        row.template_list("CAMERA_UL_cameras_scene", "", scene, "objects", scene, "camera_list_index")
+        row.template_list("CAMERA_UL_cameras_scene", "", scene, "camera_list", scene, "camera_list_index")
         col = row.column(align=True)
         col.operator("cam_manager.cycle_cameras_backward", text="", icon='TRIA_UP')
         col.operator("cam_manager.cycle_cameras_next", text="", icon='TRIA_DOWN')
@@ -283,7 +329,7 @@ class OBJECT_PT_camera_manager_popup(bpy.types.Panel):
         row.label(text="Render Slot")
 
         row = layout.row()
-        row.template_list("CAMERA_UL_cameras_popup", "", scene, "objects", scene, "camera_list_index")
+        row.template_list("CAMERA_UL_cameras_popup", "", scene, "camera_list", scene, "camera_list_index")
         col = row.column(align=True)
         col.operator("cam_manager.cycle_cameras_backward", text="", icon='TRIA_UP')
         col.operator("cam_manager.cycle_cameras_next", text="", icon='TRIA_DOWN')
@@ -1,5 +1,7 @@
 import bpy
 
+from .camera_registry import get_registry
+
 
 SORT_ITEMS = [
     ('NAME',         "Name",             "Sort alphabetically by name",                  'SORTALPHA',           0),
@@ -11,21 +13,97 @@ SORT_ITEMS = [
     ('BG_IMAGE',     "Background Image", "Cameras with a background image assigned first", 'IMAGE_BACKGROUND',  6),
 ]
 
+FILTER_MATCH_ITEMS = [
+    ('CONTAINS', "Contains",    "Show cameras whose name contains the filter text"),
+    ('PREFIX',   "Starts With", "Show cameras whose name starts with the filter text"),
+    ('FUZZY',    "Fuzzy",       "Show cameras whose name contains the filter characters in order, best matches first"),
+]
+
+
+def _collection_key(obj):
+    cols = obj.users_collection
+    return cols[0].name.lower() if cols else '', obj.name.lower()
+
+
+# Sort key per SORT_ITEMS mode, kept incrementally by the camera registry's
+# sorted indices. NAME is the registry's own order and ACTIVE_FIRST is NAME
+# with the scene camera moved to the top, so neither needs an index.
+SORT_KEYS = {
+    'COLLECTION': _collection_key,
+    'FOCAL_LENGTH': lambda obj: (obj.data.lens, obj.name.lower()),
+    'RENDER_SLOT': lambda obj: (obj.data.slot, obj.name.lower()),
+    'RESOLUTION': lambda obj: (obj.data.resolution[0] * obj.data.resolution[1], obj.name.lower()),
+    'BG_IMAGE': lambda obj: (0 if obj.data.background_images else 1, obj.name.lower()),
+}
+
+
+# Last filter_list() result per list, keyed by (UIList class, list_id, scene
+# name). Each entry is (state, (flt_flags, flt_neworder)) where state holds
+# everything the result depends on, see _filter_state().
+_filter_cache = {}
+
+
+def _filter_state(self, context, items):
+    return (
+        get_registry(context.scene).revision,
+        len(items),
+        self.filter_name,
+        self.use_filter_name_reverse,
+        self.filter_match,
+        self.use_filter_visible_only,
+        self.use_filter_render_selected,
+        self.sort_type,
+        self.use_filter_sort_reverse,
+    )
+
 
-def filter_list(self, context):
-    objects = context.scene.objects
-    flt_flags = [0] * len(objects)
+def cached_filter_list(self, context, items):
+    """filter_list(), memoized until the filter settings change or the camera
+    registry's revision is bumped. Redraws caused by hovering or scrolling
+    don't touch any camera data."""
+    key = (type(self).__name__, self.list_id, context.scene.name)
+    state = _filter_state(self, context, items)
+    cached = _filter_cache.get(key)
+    if cached is not None and cached[0] == state:
+        return cached[1]
+
+    result = filter_list(self, context, items)
+    _filter_cache[key] = (state, result)
+    return result
+
+
+def filter_list(self, context, items):
+    """Filter and sort scene.camera_list. Both lists returned are as long as
+    the camera list, not scene.objects, so redraws scale with camera count."""
+    flt_flags = [0] * len(items)
     filtered_cameras = []
 
     filter_name = self.filter_name.lower()
     invert_name = self.use_filter_name_reverse
-
-    for idx, obj in enumerate(objects):
-        if obj.type != 'CAMERA':
+    registry = get_registry(context.scene)
+
+    # Resolve the name filter through the registry's n-gram index once, so the
+    # loop below only does set lookups instead of substring searches.
+    matched_names = None
+    fuzzy_scores = None
+    if filter_name:
+        name_index = registry.name_index
+        if self.filter_match == 'FUZZY':
+            fuzzy_scores = name_index.fuzzy(filter_name)
+            matched_names = fuzzy_scores
+        elif self.filter_match == 'PREFIX':
+            matched_names = name_index.prefix(filter_name)
+        else:
+            matched_names = name_index.contains(filter_name)
+
+    for idx, item in enumerate(items):
+        obj = item.camera
+        # Stale entry, e.g. the camera was deleted and the list not yet synced
+        if obj is None or obj.type != 'CAMERA':
             continue
 
         # Name filter
-        name_match = not filter_name or filter_name in obj.name.lower()
+        name_match = matched_names is None or obj.name in matched_names
         if not ((name_match and not invert_name) or (not name_match and invert_name)):
             continue
 
@@ -38,50 +116,49 @@ def filter_list(self, context):
             continue
 
         flt_flags[idx] = self.bitflag_filter_item | self.CAMERA_FILTER
-        filtered_cameras.append(idx)
+        filtered_cameras.append((idx, obj))
 
     # --- Sort ---
     # Note: do NOT apply use_filter_sort_reverse here — Blender's UIList base
     # class automatically reverses flt_neworder after filter_items() returns.
+    # scene.camera_list mirrors the registry, which is ordered by lowercase
+    # name, so NAME needs no sort and the other modes read the registry's
+    # pre-sorted indices instead of calling sorted() with RNA reads.
     scene = context.scene
 
-    if self.sort_type == 'NAME':
-        filtered_cameras.sort(key=lambda i: objects[i].name.lower())
-
-    elif self.sort_type == 'ACTIVE_FIRST':
+    if self.sort_type == 'ACTIVE_FIRST':
         active = scene.camera
-        filtered_cameras.sort(
-            key=lambda i: (0 if objects[i] == active else 1, objects[i].name.lower()),
-        )
-
-    elif self.sort_type == 'COLLECTION':
-        def _col_key(i):
-            cols = objects[i].users_collection
-            return (cols[0].name.lower() if cols else '', objects[i].name.lower())
-        filtered_cameras.sort(key=_col_key)
-
-    elif self.sort_type == 'FOCAL_LENGTH':
-        filtered_cameras.sort(key=lambda i: objects[i].data.lens)
-
-    elif self.sort_type == 'RENDER_SLOT':
-        filtered_cameras.sort(key=lambda i: objects[i].data.slot)
-
-    elif self.sort_type == 'RESOLUTION':
-        filtered_cameras.sort(
-            key=lambda i: objects[i].data.resolution[0] * objects[i].data.resolution[1],
-        )
-
-    elif self.sort_type == 'BG_IMAGE':
-        filtered_cameras.sort(
-            key=lambda i: (0 if objects[i].data.background_images else 1, objects[i].name.lower()),
-        )
+        for pos, entry in enumerate(filtered_cameras):
+            if entry[1] == active:
+                filtered_cameras.insert(0, filtered_cameras.pop(pos))
+                break
+
+    elif self.sort_type in SORT_KEYS:
+        by_name = {obj.name: (idx, obj) for idx, obj in filtered_cameras}
+        order = registry.sorted_index(self.sort_type, SORT_KEYS[self.sort_type]).names
+        sorted_cameras = [by_name.pop(name) for name in order if name in by_name]
+        # Entries the index doesn't know yet (list synced after the registry
+        # was read) keep their name order at the end.
+        sorted_cameras.extend(entry for entry in filtered_cameras if entry[1].name in by_name)
+        filtered_cameras = sorted_cameras
+
+    # Fuzzy matches are ranked by score, sort_type only breaks ties.
+    if fuzzy_scores is not None and not invert_name:
+        filtered_cameras.sort(key=lambda entry: -fuzzy_scores[entry[1].name])
+
+    # Let camera cycling follow what the list shows (cycle order 'LIST').
+    display_order = [obj.name for _idx, obj in filtered_cameras]
+    if self.use_filter_sort_reverse:
+        display_order.reverse()
+    registry.set_display_order(display_order)
 
     # Build flt_neworder[original_index] = new_display_position
-    filtered_set = set(filtered_cameras)
-    flt_neworder = [0] * len(objects)
-    for new_pos, old_idx in enumerate(filtered_cameras):
+    flt_neworder = [0] * len(items)
+    filtered_set = set()
+    for new_pos, (old_idx, _obj) in enumerate(filtered_cameras):
         flt_neworder[old_idx] = new_pos
-    for i, old_idx in enumerate(idx for idx in range(len(objects)) if idx not in filtered_set):
+        filtered_set.add(old_idx)
+    for i, old_idx in enumerate(idx for idx in range(len(items)) if idx not in filtered_set):
         flt_neworder[old_idx] = len(filtered_cameras) + i
 
     return flt_flags, flt_neworder
@@ -112,6 +189,13 @@ class CAMERA_UL_cameras_popup(bpy.types.UIList):
         options=set(),
         description="Invert the name filter",
     )
+    filter_match: bpy.props.EnumProperty(
+        name="Name Match",
+        default='CONTAINS',
+        items=FILTER_MATCH_ITEMS,
+        options=set(),
+        description="How the filter text is matched against camera names",
+    )
     use_filter_visible_only: bpy.props.BoolProperty(
         name="Visible Only",
         default=False,
@@ -134,6 +218,7 @@ class CAMERA_UL_cameras_popup(bpy.types.UIList):
         row = layout.row(align=True)
         row.prop(self, "filter_name", text="")
         row.prop(self, "use_filter_name_reverse", text="", icon='ARROW_LEFTRIGHT')
+        row.prop(self, "filter_match", text="")
 
         row = layout.row(align=True)
         row.prop(self, "use_filter_visible_only",    text="Visible", toggle=True, icon='HIDE_OFF')
@@ -144,13 +229,15 @@ class CAMERA_UL_cameras_popup(bpy.types.UIList):
         row.prop(self, "use_filter_sort_reverse", text="", icon='SORT_DESC')
 
     def filter_items(self, context, data, propname):
-        flt_flags, flt_neworder = filter_list(self, context)
+        flt_flags, flt_neworder = cached_filter_list(self, context, getattr(data, propname))
         return flt_flags, flt_neworder
 
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname):
 
-        obj = item
-        cam = item.data
+        obj = item.camera
+        if obj is None:
+            return
+        cam = obj.data
 
         # draw_item must handle the three layout types. Usually 'DEFAULT' and 'COMPACT' can share the same code.
         if self.layout_type in {'DEFAULT', 'COMPACT'}:
@@ -250,6 +337,13 @@ class CAMERA_UL_cameras_scene(bpy.types.UIList):
         options=set(),
         description="Invert the name filter",
     )
+    filter_match: bpy.props.EnumProperty(
+        name="Name Match",
+        default='CONTAINS',
+        items=FILTER_MATCH_ITEMS,
+        options=set(),
+        description="How the filter text is matched against camera names",
+    )
     use_filter_visible_only: bpy.props.BoolProperty(
         name="Visible Only",
         default=False,
@@ -272,6 +366,7 @@ class CAMERA_UL_cameras_scene(bpy.types.UIList):
         row = layout.row(align=True)
         row.prop(self, "filter_name", text="")
         row.prop(self, "use_filter_name_reverse", text="", icon='ARROW_LEFTRIGHT')
+        row.prop(self, "filter_match", text="")
 
         row = layout.row(align=True)
         row.prop(self, "use_filter_visible_only",    text="Visible", toggle=True, icon='HIDE_OFF')
@@ -282,13 +377,15 @@ class CAMERA_UL_cameras_scene(bpy.types.UIList):
         row.prop(self, "use_filter_sort_reverse", text="", icon='SORT_DESC')
 
     def filter_items(self, context, data, propname):
-        flt_flags, flt_neworder = filter_list(self, context)
+        flt_flags, flt_neworder = cached_filter_list(self, context, getattr(data, propname))
         return flt_flags, flt_neworder
 
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname):
 
-        obj = item
-        cam = item.data
+        obj = item.camera
+        if obj is None:
+            return
+        cam = obj.data
 
         # draw_item must handle the three layout types. Usually 'DEFAULT' and 'COMPACT' can share the same code.
         if self.layout_type in {'DEFAULT', 'COMPACT'}:
@@ -353,6 +450,8 @@ class UIListDropdownMenu(bpy.types.Menu):
         layout = self.layout
         layout.operator("cam_manager.select_all_cameras", text='Select All', icon='CHECKBOX_HLT').invert = False
         layout.operator("cam_manager.select_all_cameras", text='Select None', icon='CHECKBOX_DEHLT').invert = True
+        layout.separator()
+        layout.operator("cam_manager.compact_render_slots", icon='IMAGE_DATA')
 
 
 classes = (
@@ -375,3 +474,5 @@ def unregister():
     for cls in reversed(classes):
         if hasattr(cls, 'bl_rna'):
             unregister_class(cls)
+
+    _filter_cache.clear()
@@ -0,0 +1,122 @@
+import bpy
+
+from bpy.app.handlers import persistent
+
+
+class View3DCache:
+    """Where the VIEW_3D areas are, per screen, so finding a 3D viewport
+    doesn't walk every area of every screen of every workspace.
+
+    Areas are remembered by screen name and area index rather than by
+    reference: a Python reference to an area outlives the area when it is
+    closed or joined, an index into screen.areas can't. A screen whose area
+    count changed (split, join) is rescanned on its own. Switching a
+    window's screen or workspace or changing an editor type invalidates
+    everything, through the msgbus subscriptions in register().
+    """
+
+    def __init__(self):
+        self._screens = {}
+        self._first_screens = None
+
+    def invalidate(self):
+        self._screens.clear()
+        self._first_screens = None
+
+    def _scan(self, screen):
+        areas = screen.areas
+        entry = (len(areas), [i for i, area in enumerate(areas) if area.type == 'VIEW_3D'])
+        self._screens[screen.name] = entry
+        return entry
+
+    def areas(self, screen):
+        """VIEW_3D areas of screen. O(3D viewports) while cached."""
+        entry = self._screens.get(screen.name)
+        areas = screen.areas
+        if entry is None or entry[0] != len(areas):
+            entry = self._scan(screen)
+        result = [areas[i] for i in entry[1]]
+        if any(area.type != 'VIEW_3D' for area in result):
+            result = [areas[i] for i in self._scan(screen)[1]]
+        return result
+
+    def first(self):
+        """First VIEW_3D area over all screens in bpy.data.screens order, the
+        3D viewport the add-on has always retargeted, or None."""
+        if self._first_screens is None:
+            self._first_screens = [screen.name for screen in bpy.data.screens if self.areas(screen)]
+        for name in self._first_screens:
+            screen = bpy.data.screens.get(name)
+            if screen is not None:
+                areas = self.areas(screen)
+                if areas:
+                    return areas[0]
+        return None
+
+    def visible(self, window_manager=None):
+        """(window, area) of every VIEW_3D area shown in an open window."""
+        window_manager = window_manager or bpy.context.window_manager
+        return [(window, area)
+                for window in window_manager.windows
+                for area in self.areas(window.screen)]
+
+    def at(self, window, x, y):
+        """VIEW_3D area of window under window coordinates x, y, or None."""
+        for area in self.areas(window.screen):
+            if area.x <= x < area.x + area.width and area.y <= y < area.y + area.height:
+                return area
+        return None
+
+
+cache = View3DCache()
+
+
+def window_region(area):
+    """The main 'WINDOW' region of area, or None."""
+    for region in area.regions:
+        if region.type == 'WINDOW':
+            return region
+    return None
+
+
+def tag_redraw_view3d():
+    """Redraw every visible 3D viewport."""
+    for _window, area in cache.visible():
+        area.tag_redraw()
+
+
+# msgbus owner, see View3DCache.
+_msgbus_owner = object()
+
+_invalidating_properties = (
+    (bpy.types.Window, "screen"),
+    (bpy.types.Window, "workspace"),
+    (bpy.types.Area, "type"),
+    (bpy.types.Area, "ui_type"),
+)
+
+
+def _subscribe():
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    for key in _invalidating_properties:
+        bpy.msgbus.subscribe_rna(key=key, owner=_msgbus_owner, args=(), notify=cache.invalidate)
+
+
+@persistent
+def _on_load_post(*_args):
+    cache.invalidate()
+    # msgbus subscriptions are dropped when a new file is loaded.
+    _subscribe()
+
+
+def register():
+    if _on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_on_load_post)
+    _subscribe()
+
+
+def unregister():
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    if _on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_on_load_post)
+    cache.invalidate()